@@ -0,0 +1,56 @@
+# Custo de analytics.emit() no thread principal e comportamento com a fila cheia
+#
+#     python benchmarks/analytics_emit.py --events 200000
+#
+# Emite eventos como o jogo faz (com o gravador rodando numa pasta
+# temporária), mede o tempo por chamada e mostra quantos foram gravados,
+# amostrados e descartados. Uma rajada maior que a fila deve descartar em vez
+# de crescer a memória ou travar o loop.
+
+import argparse
+import gzip
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.analytics import analytics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de emitir eventos de aprendizagem")
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--frames", type=int, default=2000, help="quadros simulados (eventos por quadro = events / frames)")
+    args = parser.parse_args()
+
+    per_frame = max(1, args.events // args.frames)
+    with tempfile.TemporaryDirectory() as folder:
+        analytics.enabled = True
+        analytics.start(folder, aluno=1)
+        timings = []
+        for frame in range(args.frames):
+            start = time.perf_counter()
+            for i in range(per_frame):
+                analytics.emit("tentativa", desafio="python/variaveis", passou=i % 3 == 0, duracao_ms=i)
+            timings.append((time.perf_counter() - start) * 1e6 / per_frame)
+            time.sleep(0.0005)
+        analytics.close(timeout=30.0)
+
+        lines = 0
+        files = sorted(Path(folder).glob("*.ndjson.gz"))
+        for path in files:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines += sum(1 for _ in f)
+        size = sum(path.stat().st_size for path in files)
+
+    print(f"emit: mediana {statistics.median(timings):.2f} µs, máx {max(timings):.2f} µs por evento")
+    print(analytics.describe())
+    print(f"{lines} linhas em {len(files)} arquivos ({size / 1024:.0f} KB comprimidos)")
+
+
+if __name__ == "__main__":
+    main()
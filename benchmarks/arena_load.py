@@ -0,0 +1,87 @@
+# Carga na Arena: tempo de tick e banda por jogador com muitos jogadores
+#
+#     python benchmarks/arena_load.py --players 60 --duration 10
+#
+# Sobe o servidor da Arena num processo separado (porta livre), conecta
+# `--players` bots deste processo e, no fim, mostra o tempo de tick do
+# servidor (p50/p99/máx), a banda enviada por jogador e quanto os deltas
+# economizam em relação a mandar o snapshot completo em todo tick.
+# `--jitter-ms` atrasa os envios do servidor aleatoriamente para exercitar a
+# interpolação dos clientes. Antes de tudo confere que o código inicial do
+# desafio da corrida (ARENA_CHALLENGE) ainda falha nos testes: se já passar,
+# todo jogador termina a corrida sem digitar nada.
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.arena.bot import run_bots
+from src.config import ARENA_CHALLENGE
+from src.grading import check_tests
+from src.utils import content
+
+_ADDRESS = re.compile(r"Servidor em ([\d.]+):(\d+)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga no servidor da Arena")
+    parser.add_argument("--players", type=int, default=60)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--hz", type=int, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    challenge = content.challenge(ARENA_CHALLENGE)
+    if check_tests(challenge.get("tests", []), challenge["code"]) is None:
+        sys.exit(f"O código inicial de {ARENA_CHALLENGE} já passa nos testes da corrida")
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.arena.server", "--host", "127.0.0.1", "--port", "0",
+         "--hz", str(args.hz), "--duration", str(args.duration + 3.0),
+         "--jitter-ms", str(args.jitter_ms)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True, env=dict(os.environ, PYTHONUNBUFFERED="1")
+    )
+    address = None
+    for line in server.stdout:
+        match = _ADDRESS.search(line)
+        if match:
+            address = (match.group(1), int(match.group(2)))
+            break
+    if address is None:
+        sys.exit("Servidor da Arena não iniciou")
+
+    start = time.perf_counter()
+    bots = run_bots(address, args.players, args.duration)
+    elapsed = time.perf_counter() - start
+    received = [bot.client.bytes_received / elapsed for bot in bots]
+    connected = sum(bot.client.connected for bot in bots)
+    for bot in bots:
+        bot.close()
+
+    stats = None
+    for line in server.stdout:
+        if line.startswith("[Arena] Estatísticas "):
+            stats = json.loads(line.split(" ", 2)[2])
+    server.wait()
+    if stats is None:
+        sys.exit("Servidor não informou as estatísticas")
+
+    print(f"{connected}/{args.players} jogadores, {args.hz} ticks/s, {stats['ticks']} ticks "
+          f"({stats['atrasados']} atrasados)")
+    print(f"tick: p50 {stats['tick_p50_ms']:.3f} ms  p99 {stats['tick_p99_ms']:.3f} ms  "
+          f"máx {stats['tick_max_ms']:.3f} ms (orçamento {1000 / args.hz:.0f} ms)")
+    print(f"banda por jogador: {stats['bytes_jogador_s'] / 1024:.2f} KB/s enviados pelo servidor, "
+          f"{sum(received) / len(received) / 1024:.2f} KB/s recebidos em média")
+    print(f"deltas: {stats['delta_frac'] * 100:.0f}% do tamanho dos snapshots completos")
+
+
+if __name__ == "__main__":
+    main()
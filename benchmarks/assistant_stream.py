@@ -0,0 +1,85 @@
+# Latência da assistente contra o servidor local (stub_server)
+#
+#     python benchmarks/assistant_stream.py --questions 20
+#     python benchmarks/assistant_stream.py --first-delay 0.3 --delay 0.02
+#
+# Sobe o servidor local que imita o backend e faz `--questions` perguntas
+# diferentes, chamando poll() como o loop do jogo. Mostra a latência até o
+# primeiro token (p50/máx) e quanto dela é do cliente (descontado o atraso
+# simulado do servidor), o tempo até a resposta completa, a latência de uma
+# pergunta repetida (respondida pelo cache) e quanto demora para uma resposta
+# cortada no meio pelo servidor aparecer como erro.
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.assistant.client import AssistantClient, HttpAssistantBackend
+from src.assistant.stub_server import start_stub_server
+
+CONTEXT = {"module": "python", "challenge": "python/colheita-magica", "hint": "Use range()."}
+
+
+def wait_finished(client, request, timeout=10.0):
+    """Chama poll() a cada ~5 ms até a pergunta terminar; retorna o tempo em ms"""
+    start = time.perf_counter()
+    while not request.finished and time.perf_counter() - start < timeout:
+        client.poll()
+        time.sleep(0.005)
+    return (time.perf_counter() - request.started) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência do streaming da assistente")
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.005, help="atraso entre tokens (s)")
+    parser.add_argument("--first-delay", type=float, default=0.05,
+                        help="atraso do servidor até o primeiro token (s)")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(token_delay=args.delay, first_token_delay=args.first_delay)
+    broken, broken_url = start_stub_server(token_delay=args.delay, first_token_delay=args.first_delay,
+                                           cut_after=2)
+    try:
+        client = AssistantClient(HttpAssistantBackend(url, timeout=5))
+        first, total = [], []
+        for i in range(args.questions):
+            request = client.ask(f"Pergunta número {i} sobre o for", CONTEXT)
+            total.append(wait_finished(client, request))
+            if request.first_token_ms is not None:
+                first.append(request.first_token_ms)
+
+        # Pergunta repetida: a resposta vem do cache, sem thread nem rede
+        start = time.perf_counter()
+        client.ask("pergunta NÚMERO 0 sobre o for", CONTEXT)
+        client.poll()
+        cached = (time.perf_counter() - start) * 1000.0
+
+        failing = AssistantClient(HttpAssistantBackend(broken_url, timeout=5))
+        request = failing.ask("Pergunta que vai cair", CONTEXT)
+        cut = wait_finished(failing, request)
+    finally:
+        server.shutdown()
+        broken.shutdown()
+
+    if not first:
+        sys.exit("Nenhuma resposta do servidor local")
+    overhead = [ms - args.first_delay * 1000.0 for ms in first]
+    print(f"{len(first)} perguntas, servidor com {args.first_delay * 1000:.0f} ms até o primeiro token")
+    print(f"primeiro token: p50 {statistics.median(first):.1f} ms  máx {max(first):.1f} ms  "
+          f"(cliente: p50 {statistics.median(overhead):.1f} ms)")
+    print(f"resposta completa: p50 {statistics.median(total):.1f} ms")
+    print(f"pergunta repetida (cache): {cached:.2f} ms")
+    print(f"resposta cortada vira erro em {cut:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
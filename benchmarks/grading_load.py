@@ -0,0 +1,127 @@
+# Simula uma turma enviando código ao servidor de correção
+#
+#     python benchmarks/grading_load.py --students 120 --submissions 20
+#     python benchmarks/grading_load.py --server 192.168.0.10:8766
+#
+# Sem --server, sobe um GradingServer local (127.0.0.1, porta livre). Cada
+# aluno simulado abre a sua conexão e envia os desafios do pacote de
+# conteúdo, com um intervalo aleatório entre envios; alguns alunos "impacientes"
+# mandam rajadas sem esperar. No fim mostra a vazão e a latência (p50, p95,
+# p99, máx) medida no cliente, separada entre alunos normais e impacientes
+# para conferir que a fila justa não deixa as rajadas atrasarem os outros.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.grading.server import GradingServer
+from src.utils import content
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def student(address, name, challenges, submissions, think_ms, burst, latencies, errors):
+    """Um aluno: conexão própria e envios sequenciais (ou em rajada)"""
+    reader, writer = await asyncio.open_connection(*address)
+    sent = {}
+    try:
+        if burst:
+            # Manda tudo de uma vez; o servidor segura pela fila do aluno
+            for i in range(submissions):
+                challenge, code = random.choice(challenges)
+                sent[i] = time.perf_counter()
+                writer.write(json.dumps({"id": i, "aluno": name, "desafio": challenge,
+                                         "codigo": code}).encode("utf-8") + b"\n")
+                await writer.drain()
+            for _ in range(submissions):
+                response = json.loads(await reader.readline())
+                latencies.append((time.perf_counter() - sent[response["id"]]) * 1000.0)
+                errors.append("erro" in response)
+        else:
+            for i in range(submissions):
+                await asyncio.sleep(random.uniform(0, think_ms) / 1000.0)
+                challenge, code = random.choice(challenges)
+                start = time.perf_counter()
+                writer.write(json.dumps({"id": i, "aluno": name, "desafio": challenge,
+                                         "codigo": code}).encode("utf-8") + b"\n")
+                await writer.drain()
+                response = json.loads(await reader.readline())
+                latencies.append((time.perf_counter() - start) * 1000.0)
+                errors.append("erro" in response)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args):
+    server = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        address = (host, int(port))
+    else:
+        server = GradingServer("127.0.0.1", 0, args.workers)
+        await server.start()
+        address = ("127.0.0.1", server.port)
+
+    challenges = [(challenge_id, content.challenge(challenge_id)["code"])
+                  for module_id in content.modules()
+                  for challenge_id in content.challenge_ids(module_id)]
+
+    # Aquece os processos de correção (importação e primeiro desafio)
+    await asyncio.gather(*(student(address, f"aquecimento{i}", challenges, 1, 0, False, [], [])
+                           for i in range(args.workers)))
+
+    normal, impatient, errors = [], [], []
+    bursts = int(args.students * args.burst_fraction)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        student(address, f"aluno{i:03d}", challenges, args.submissions, args.think_ms,
+                i < bursts, impatient if i < bursts else normal, errors)
+        for i in range(args.students)
+    ))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.stop()
+
+    total = len(normal) + len(impatient)
+    print(f"{args.students} alunos ({bursts} em rajada), {total} envios em {elapsed:.2f} s: "
+          f"{total / elapsed:.0f} envios/s, {sum(errors)} erros")
+    for label, latencies in (("normais", normal), ("rajada", impatient)):
+        if not latencies:
+            continue
+        latencies.sort()
+        print(f"{label:<8} p50 {statistics.median(latencies):7.1f} ms  "
+              f"p95 {_percentile(latencies, 0.95):7.1f} ms  "
+              f"p99 {_percentile(latencies, 0.99):7.1f} ms  máx {latencies[-1]:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga no servidor de correção")
+    parser.add_argument("--server", default="", help="host:porta (vazio = servidor local)")
+    parser.add_argument("--students", type=int, default=120)
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--think-ms", type=float, default=200.0, help="intervalo máximo entre envios")
+    parser.add_argument("--burst-fraction", type=float, default=0.1, help="fração de alunos em rajada")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    args = parser.parse_args()
+
+    random.seed(1)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
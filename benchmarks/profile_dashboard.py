@@ -0,0 +1,65 @@
+# Mede o painel do aluno com um banco de perfis grande
+#
+#     python benchmarks/profile_dashboard.py --students 500 --attempts 300000
+#
+# Cria um profiles.db temporário, grava as tentativas pelo gravador em
+# segundo plano (como o jogo faz) e depois mede dashboard() de alunos
+# aleatórios. O painel lê só o resumo por desafio, então o tempo deve ficar
+# em poucos milissegundos qualquer que seja o número de tentativas.
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.profiles import ProfileStore
+
+MODULES = ("python", "javascript", "csharp", "php")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Painel de perfis com muitas tentativas")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--attempts", type=int, default=300000)
+    parser.add_argument("--challenges", type=int, default=10, help="desafios por módulo")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as folder:
+        store = ProfileStore(os.path.join(folder, "profiles.db"))
+        students = [store.student(f"aluno{i:04d}") for i in range(args.students)]
+        challenges = [(module, f"{module}/desafio{i:02d}") for module in MODULES
+                      for i in range(args.challenges)]
+
+        start = time.perf_counter()
+        for _ in range(args.attempts):
+            module, challenge = random.choice(challenges)
+            store.record_attempt(random.choice(students), module, challenge,
+                                 random.random() < 0.4, random.uniform(5000, 600000))
+        queued = time.perf_counter()
+        store.flush()
+        written = time.perf_counter()
+        print(f"{args.attempts} tentativas: enfileirar {(queued - start) * 1000:.0f} ms, "
+              f"gravar {(written - start) * 1000:.0f} ms")
+
+        timings = []
+        for _ in range(args.queries):
+            query = time.perf_counter()
+            store.dashboard(random.choice(students))
+            timings.append((time.perf_counter() - query) * 1000.0)
+        timings.sort()
+        print(f"painel: mediana {statistics.median(timings):.2f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms, máx {timings[-1]:.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Várias instâncias do jogo na mesma máquina: memória e tempo de carga das
+# imagens com e sem a memória compartilhada (CODEFRONTIER_SHARED_ASSETS)
+#
+#     python benchmarks/shared_assets.py --instances 6
+#
+# Cada instância é um processo que carrega todas as imagens de todos os
+# pacotes e fica aberta até as outras terminarem, como num laboratório. Para
+# cada modo mostra o tempo de carga e a memória privada (só daquele processo,
+# Private_Clean + Private_Dirty do /proc/self/smaps_rollup) da primeira
+# instância e a média das seguintes. Os modos são: decodificar sempre, cache
+# de pixels em disco, e memória compartilhada sem o cache em disco (a
+# primeira instância decodifica e publica, as outras só mapeiam). Só Linux.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def memory_kb():
+    """Memória do processo em KB: {"Rss", "Pss", "Private", "Shared"}"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "Rss": values.get("Rss", 0),
+        "Pss": values.get("Pss", 0),
+        "Private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+        "Shared": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+    }
+
+
+def child():
+    """Executado no processo filho: carrega tudo, mede e espera o fim do laboratório"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, str(ROOT))
+
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    from src.utils import assets
+
+    before = memory_kb()
+    start = time.perf_counter()
+    assets.load_all_assets()
+    for bundle in assets.bundles:
+        assets.acquire_bundle(bundle)
+    for name in list(assets.image_files):
+        assets.get_image(name)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    after = memory_kb()
+
+    shared = assets.pixel_cache.shared
+    print(json.dumps({
+        "load_ms": elapsed,
+        "private_mb": (after["Private"] - before["Private"]) / 1024.0,
+        "pss_mb": (after["Pss"] - before["Pss"]) / 1024.0,
+        "images": len(assets.images) + len(assets.scaled),
+        "mapped_mb": shared.mapped_bytes / (1024 * 1024) if shared else 0.0,
+    }), flush=True)
+    sys.stdin.readline()
+
+
+def start_child(env):
+    return subprocess.Popen([sys.executable, __file__, "--child"], env=env, cwd=ROOT,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+
+
+def read_result(process):
+    for line in process.stdout:
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError("instância terminou sem resultado")
+
+
+def run_lab(instances, env):
+    """A primeira instância sozinha, depois as outras ao mesmo tempo"""
+    first = start_child(env)
+    results = [read_result(first)]
+    others = [start_child(env) for _ in range(instances - 1)]
+    results += [read_result(process) for process in others]
+    for process in [first] + others:
+        process.stdin.close()
+        process.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória e carga com várias instâncias")
+    parser.add_argument("--instances", type=int, default=6)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("Este benchmark mede a memória pelo /proc (só Linux)")
+        sys.exit(1)
+
+    sys.path.insert(0, str(ROOT))
+    from src.utils.shared_pixels import clear
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        base = dict(os.environ, CODEFRONTIER_PIXEL_CACHE_DIR=cache_dir)
+        modes = [
+            ("decodifica", dict(base, CODEFRONTIER_PIXEL_CACHE="0", CODEFRONTIER_SHARED_ASSETS="0")),
+            ("cache disco", dict(base, CODEFRONTIER_PIXEL_CACHE="1", CODEFRONTIER_SHARED_ASSETS="0")),
+            ("compartilhada", dict(base, CODEFRONTIER_PIXEL_CACHE="0", CODEFRONTIER_SHARED_ASSETS="1")),
+        ]
+        # Preenche o cache em disco antes do modo que o usa
+        run_lab(1, modes[1][1])
+
+        print(f"{args.instances} instâncias")
+        print(f"{'modo':<14} {'1ª carga':>10} {'1ª privada':>11} {'outras carga':>13} "
+              f"{'outras privada':>15} {'mapeado':>9}")
+        try:
+            for label, env in modes:
+                results = run_lab(args.instances, env)
+                first, others = results[0], results[1:] or results
+                print(f"{label:<14} {first['load_ms']:>8.0f}ms {first['private_mb']:>9.1f}MB "
+                      f"{statistics.mean(r['load_ms'] for r in others):>11.0f}ms "
+                      f"{statistics.mean(r['private_mb'] for r in others):>13.1f}MB "
+                      f"{statistics.mean(r['mapped_mb'] for r in others):>7.1f}MB")
+        finally:
+            removed = clear(cache_dir)
+            print(f"{len(removed)} segmentos compartilhados apagados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Mede o índice de envios parecidos numa turma sintética
+#
+#     python benchmarks/similarity_index.py --submissions 3000 --copies 150
+#     python benchmarks/similarity_index.py --workers 1
+#
+# Gera envios para o desafio da Arena: cada aluno escreve um programa próprio
+# (sorteado de trechos comuns de Python) e alguns copiam o de um colega,
+# trocando nomes de variáveis, comentários e espaços. Mostra o tempo das
+# assinaturas em lote (um processo contra todos os núcleos), o tempo para
+# achar os pares pelo LSH, quantas comparações isso custou contra o todos
+# contra todos, e quantas cópias plantadas foram encontradas.
+
+import argparse
+import itertools
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.config import ARENA_CHALLENGE, SIMILARITY_THRESHOLD
+from src.grading.similarity import SimilarityIndex, compute_signatures, normalize_tokens, shingles
+from src.utils import content
+
+NAMES = ["total", "cesta", "fruta", "lista", "item", "contador", "valor", "resultado",
+         "colheita", "indice", "dados", "soma", "quantidade_extra", "temp", "saida"]
+
+STATEMENTS = [
+    "{a} = []",
+    "{a} = {n}",
+    "{a} = {b} + {n}",
+    "{a} = {b} * {c}",
+    "{a} += 1",
+    "for {a} in range({n}):\n        {b}.append({a})",
+    "for {a} in {b}:\n        print({a})",
+    "while {a} < {n}:\n        {a} += {m}",
+    "if {a} > {n}:\n        {b} = {a}\n    else:\n        {b} = {m}",
+    "{a} = [{b} * {n} for {b} in range({m})]",
+    "{a} = len({b})",
+    "print(\"{w}\", {a})",
+    "{a} = {{\"{w}\": {n}}}",
+    "{a} = sorted({b})",
+    "{a} = {b}[{n}:{m}]",
+    "if \"{w}\" in {a}:\n        return {b}",
+    "{a} = sum({b}) / max(1, len({b}))",
+    "try:\n        {a} = int({b})\n    except ValueError:\n        {a} = {n}",
+]
+
+WORDS = ["maçã", "pera", "uva", "banana", "colheita", "cesta", "pronto", "fim"]
+
+
+def write_program(rng, starter):
+    """Programa de um aluno: o código inicial com trechos próprios na função"""
+    body = []
+    for _ in range(rng.randint(6, 16)):
+        names = rng.sample(NAMES, 3)
+        body.append("    " + rng.choice(STATEMENTS).format(
+            a=names[0], b=names[1], c=names[2], n=rng.randint(0, 50),
+            m=rng.randint(1, 9), w=rng.choice(WORDS)))
+    marker = "    # Digite o código a partir daqui\n"
+    return starter.replace(marker, marker + "\n".join(body) + "\n", 1)
+
+
+def disguise(rng, code):
+    """Cópia disfarçada: nomes trocados, comentário novo e espaços diferentes"""
+    renamed = dict(zip(NAMES, rng.sample([f"{name}_{rng.randint(1, 9)}" for name in NAMES], len(NAMES))))
+    code = re.sub(r"\b(" + "|".join(NAMES) + r")\b", lambda m: renamed[m.group(1)], code)
+    lines = code.split("\n")
+    for _ in range(rng.randint(1, 3)):
+        lines.insert(rng.randrange(len(lines)), "    # " + rng.choice(WORDS))
+    code = "\n".join(lines).replace(" = ", "=").replace(", ", ",")
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desempenho do índice de envios parecidos")
+    parser.add_argument("--submissions", type=int, default=3000)
+    parser.add_argument("--copies", type=int, default=150, help="envios copiados de um colega")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument("--exact-sample", type=int, default=1500,
+                        help="envios na comparação exata todos contra todos")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    starter = content.challenge(ARENA_CHALLENGE)["code"]
+    originals = args.submissions - args.copies
+    codes = [write_program(rng, starter) for _ in range(originals)]
+    planted = set()
+    for i in range(args.copies):
+        source = rng.randrange(originals)
+        codes.append(disguise(rng, codes[source]))
+        planted.add((source, originals + i))
+    language = ARENA_CHALLENGE.split("/", 1)[0]
+
+    # Assinaturas: um processo contra todos os núcleos
+    index = SimilarityIndex(language, starter)
+    start = time.perf_counter()
+    compute_signatures(codes, language, index.shingle, index.boilerplate, index.params, workers=1)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    pairs = index.add_many(list(enumerate(codes)), workers=args.workers, threshold=args.threshold)
+    batch = time.perf_counter() - start
+    print(f"{len(codes)} envios: assinaturas em {single:.2f} s com 1 processo, "
+          f"{batch:.2f} s com {args.workers} (inserção incluída)")
+
+    # Pares pelo LSH e quantas comparações isso custou
+    start = time.perf_counter()
+    found = index.pairs(args.threshold)
+    elapsed = time.perf_counter() - start
+    compared = len({(a, b) for buckets in index._buckets for members in buckets.values()
+                    for a, b in itertools.combinations(members, 2)})
+    everything = len(index) * (len(index) - 1) // 2
+    print(f"pares pelo LSH em {elapsed * 1000:.0f} ms: {compared} comparações "
+          f"({compared / max(1, everything):.2%} do todos contra todos), {len(found)} pares")
+
+    # Consulta incremental de um envio novo
+    start = time.perf_counter()
+    for code in codes[:200]:
+        index.query(code, args.threshold)
+    print(f"consulta: {(time.perf_counter() - start) / 200 * 1000:.2f} ms por envio")
+
+    hits = {(min(a, b), max(a, b)) for a, b, _ in found}
+    recall = len(planted & hits) / max(1, len(planted))
+    print(f"cópias plantadas encontradas: {len(planted & hits)}/{len(planted)} ({recall:.0%}); "
+          f"inserção incremental achou {len(pairs)} pares")
+
+    # Referência: Jaccard exato todos contra todos numa amostra
+    sample = sorted(rng.sample(range(len(codes)), min(args.exact_sample, len(codes))))
+    sets = {i: shingles(normalize_tokens(codes[i], language)) - index.boilerplate for i in sample}
+    start = time.perf_counter()
+    exact = set()
+    for a, b in itertools.combinations(sample, 2):
+        union = len(sets[a] | sets[b])
+        if union and len(sets[a] & sets[b]) / union >= args.threshold:
+            exact.add((a, b))
+    exact_time = time.perf_counter() - start
+    sampled_hits = {pair for pair in hits if pair[0] in sets and pair[1] in sets}
+    print(f"exato em {len(sample)} envios: {exact_time:.2f} s, {len(exact)} pares; "
+          f"LSH achou {len(exact & sampled_hits)} deles e {len(sampled_hits - exact)} a mais")
+
+
+if __name__ == "__main__":
+    main()
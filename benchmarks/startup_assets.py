@@ -0,0 +1,109 @@
+# Compara a inicialização com assets soltos, com o assets.pack e com o cache de
+# pixels já preenchido (inicialização "quente")
+#
+#     python -m src.utils.asset_pack
+#     python benchmarks/startup_assets.py --runs 7
+#
+# Cada rodada é um processo novo que mede o carregamento dos assets, do índice
+# de conteúdo e do índice de dicas. A etapa "extração" simula o que o
+# executável onefile do PyInstaller faz a cada execução: copiar os dados
+# embutidos para uma pasta temporária (arquivos soltos x um único arquivo).
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def child():
+    """Executado no processo filho: mede a inicialização e imprime JSON"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, str(ROOT))
+
+    start = time.perf_counter()
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    imported = time.perf_counter()
+
+    from src.utils import assets, content
+    from src.assistant import create_assistant_client
+    assets.load_all_assets()
+    loaded = time.perf_counter()
+    content.modules()
+    create_assistant_client()
+    done = time.perf_counter()
+
+    print(json.dumps({
+        "pygame_ms": (imported - start) * 1000.0,
+        "assets_ms": (loaded - imported) * 1000.0,
+        "indices_ms": (done - loaded) * 1000.0,
+        "total_ms": (done - start) * 1000.0,
+        "images": len(assets.images),
+    }))
+
+
+def run_child(pack, cache_dir=""):
+    env = dict(os.environ, CODEFRONTIER_ASSET_PACK=pack,
+               CODEFRONTIER_PIXEL_CACHE="1" if cache_dir else "0",
+               CODEFRONTIER_PIXEL_CACHE_DIR=cache_dir)
+    output = subprocess.run(
+        [sys.executable, __file__, "--child"], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def extraction_ms(pack):
+    """Tempo para copiar os dados para uma pasta temporária"""
+    with tempfile.TemporaryDirectory() as target:
+        start = time.perf_counter()
+        if pack:
+            shutil.copy(pack, target)
+        else:
+            shutil.copytree(ROOT / "assets", Path(target) / "assets")
+        return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização dos assets")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pack", default=str(ROOT / "assets.pack"))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    if not Path(args.pack).exists():
+        print(f"Pacote não encontrado: {args.pack} (gere com python -m src.utils.asset_pack)")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Uma execução para preencher o cache de pixels
+        run_child(args.pack, cache_dir)
+
+        modes = [("soltos", "", ""), ("assets.pack", args.pack, ""),
+                 ("pack+cache", args.pack, cache_dir)]
+        print(f"{'modo':<12} {'extração':>10} {'assets':>10} {'índices':>10} {'total':>10} {'imagens':>8}")
+        for label, pack, cache in modes:
+            results = [run_child(pack, cache) for _ in range(args.runs)]
+            extract = statistics.median(extraction_ms(pack) for _ in range(args.runs))
+            median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+            print(f"{label:<12} {extract:>8.1f}ms {median['assets_ms']:>8.1f}ms "
+                  f"{median['indices_ms']:>8.1f}ms {median['total_ms'] + extract:>8.1f}ms "
+                  f"{int(median['images']):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Confere se a inicialização continua dentro do orçamento
+#
+#     python benchmarks/startup_budget.py --runs 5
+#
+# Roda python main.py --profile-startup em processos novos (com vídeo e áudio
+# "dummy"), tira a mediana de cada fase e compara com os limites em
+# startup_budget.json (ms). Sai com código 1 se alguma fase estourar, para
+# que regressões de inicialização quebrem o build.
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "startup_budget.json"
+
+_PHASE = re.compile(r"^\[Startup\] (.+?)\s+([\d.]+) ms$")
+
+
+def profile_once():
+    """Uma inicialização completa: {fase: ms}"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    output = subprocess.run(
+        [sys.executable, "main.py", "--profile-startup"], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True
+    ).stdout
+    phases = {}
+    for line in output.splitlines():
+        match = _PHASE.match(line.strip())
+        if match:
+            phases[match.group(1)] = float(match.group(2))
+    if "total" not in phases:
+        raise RuntimeError("Saída do --profile-startup sem o total:\n" + output)
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orçamento de inicialização")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", default=str(BUDGET_FILE))
+    args = parser.parse_args()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    # Uma execução para preencher o cache de pixels e o cache de disco do SO
+    profile_once()
+    results = [profile_once() for _ in range(args.runs)]
+
+    failed = []
+    print(f"{'fase':<16} {'mediana':>10} {'limite':>10}")
+    for phase in results[0]:
+        median = statistics.median(r.get(phase, 0.0) for r in results)
+        limit = budget.get(phase)
+        status = ""
+        if limit is not None and median > limit:
+            status = "  ESTOUROU"
+            failed.append(phase)
+        limit_text = f"{limit:>8.1f}ms" if limit is not None else f"{'-':>10}"
+        print(f"{phase:<16} {median:>8.1f}ms {limit_text}{status}")
+
+    if failed:
+        print(f"Fora do orçamento: {', '.join(failed)}")
+        sys.exit(1)
+    print("Inicialização dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
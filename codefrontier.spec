@@ -9,23 +9,33 @@ block_cipher = None
 # Diretório raiz do projeto
 ROOT_DIR = Path(SPECPATH)
 
-# Coletar todos os arquivos de assets
+# Assets: um único assets.pack (gerado com "python -m src.utils.asset_pack"),
+# lido com mmap sem extrair arquivo por arquivo. Sem o pacote, cai para os
+# arquivos soltos de assets/.
 assets_data = []
 assets_path = ROOT_DIR / 'assets'
+assets_pack = ROOT_DIR / 'assets.pack'
 
-for root, dirs, files in os.walk(assets_path):
-    for file in files:
-        src = os.path.join(root, file)
-        # Caminho relativo a partir do diretório do projeto
-        rel_path = os.path.relpath(root, ROOT_DIR)
-        assets_data.append((src, rel_path))
+if assets_pack.exists():
+    assets_data.append((str(assets_pack), '.'))
+else:
+    for root, dirs, files in os.walk(assets_path):
+        for file in files:
+            src = os.path.join(root, file)
+            # Caminho relativo a partir do diretório do projeto
+            rel_path = os.path.relpath(root, ROOT_DIR)
+            assets_data.append((src, rel_path))
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
     datas=assets_data,
-    hiddenimports=['pygame', 'pygame.mixer', 'pygame.font'],
+    # Cenas importadas sob demanda pelo SceneRegistry (importlib)
+    hiddenimports=['pygame', 'pygame.mixer', 'pygame.font',
+                   'src.scenes.main_menu', 'src.scenes.village_hub',
+                   'src.scenes.challenge_scene', 'src.scenes.lesson_scene',
+                   'src.scenes.arena_scene'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,46 +1,119 @@
 # CodeFrontier - Jogo Educacional de Programação
 # Arquivo principal do jogo
 
+import time
+_STARTED = time.perf_counter()
+
 import pygame
+import sqlite3
 import sys
-from src.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, Colors
-from src.utils import assets
-from src.scenes import MainMenuScene, VillageHubScene, ChallengeScene, LessonScene
+from src.config import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, JOB_FRAME_MARGIN_MS,
+                        SIMULATION_HZ, MAX_UPDATE_STEPS, FIXED_TIMESTEP,
+                        SCENE_CACHE_SIZE, SCENE_PREWARM, HOT_RELOAD, STUDENT, GRADING_SERVER,
+                        Colors)
+from src.utils import (analytics, assets, audio, jobs, metrics, AssetStreamer, AssetWatcher, StartupProfile,
+                       FixedTimestep, SaveStore, ProfileStore, PRIORITY_IDLE)
+from src.utils.save import default_save_dir
+from src.ui import PerformanceOverlay
+from src.assistant import create_assistant_client
+from src.grading import create_grading_client
+from src.scenes import LoadingScene, SceneCache, SceneRegistry
+
+# Fases da inicialização (impressas com --profile-startup)
+startup = StartupProfile(_STARTED)
+startup.mark("imports")
 
 class Game:
     """Classe principal do jogo CodeFrontier"""
     
-    def __init__(self):
+    def __init__(self, profile_startup=False, student=""):
+        # Com profile_startup, imprime as fases e sai ao desenhar a cena inicial
+        self.profile_startup = profile_startup
+        
         # Inicializar Pygame
         pygame.init()
+        startup.mark("pygame.init")
         pygame.mixer.init()
+        audio.init()
+        startup.mark("mixer")
         
         # Configurar tela
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
+        startup.mark("janela")
+        
+        # Repetição de teclas ao segurar (editor de código e chat)
+        pygame.key.set_repeat(400, 35)
         
-        # Clock para controle de FPS
+        # Clock para controle de FPS e passo fixo da simulação
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(SIMULATION_HZ, MAX_UPDATE_STEPS, FIXED_TIMESTEP)
         
         # Estado do jogo
         self.running = True
         self.current_scene = None
         
-        # Dados do jogador
-        self.player_data = {
+        # Aluno identificado: tentativas no banco de perfis e save separado
+        self.student = student
+        self.profiles = None
+        self.student_id = None
+        save_dir = None
+        if student:
+            try:
+                self.profiles = ProfileStore()
+                self.student_id = self.profiles.student(student)
+                save_dir = default_save_dir() / "alunos" / str(self.student_id)
+            except (sqlite3.Error, OSError) as e:
+                # Banco travado, somente leitura ou corrompido: joga sem perfis
+                print(f"[Game] Perfis de alunos indisponíveis: {e}")
+                if self.profiles is not None:
+                    self.profiles.close()
+                self.profiles = None
+                self.student_id = None
+            print(f"[Game] Aluno: {student}")
+        analytics.start(aluno=self.student_id)
+        
+        # Dados do jogador (salvos em disco por eventos, sem travar o loop)
+        self.save = SaveStore({
             "health": 5,
             "max_health": 5,
             "xp": 0,
             "level": 1,
             "completed_modules": [],
             "current_module": None
-        }
+        }, save_dir)
+        self.player_data = self.save.data
+        startup.mark("progresso")
+        
+        # Assistente CinthIA (respostas em threads de fundo)
+        self.assistant = create_assistant_client()
+        # Correção pelo servidor da turma (None = corrige aqui mesmo)
+        self.grader = create_grading_client(GRADING_SERVER, student)
+        startup.mark("assistente")
+        
+        # Overlay de desempenho (F3)
+        self.perf_overlay = PerformanceOverlay()
         
         # Carregar assets
         self._load_assets()
+        startup.mark("assets")
+        
+        # Assets das cenas carregados em segundo plano (tela de carregamento)
+        self.loader = AssetStreamer(assets)
+        self.loading_scene = LoadingScene(self)
+        self.pending_scene = None
+        self.pending_job = None
+        
+        # Modo de desenvolvimento: recarrega imagens e sons alterados no disco
+        self.asset_watcher = None
+        if HOT_RELOAD:
+            self.asset_watcher = AssetWatcher(assets)
+            if not self.asset_watcher.start():
+                self.asset_watcher = None
         
         # Inicializar cenas
         self._init_scenes()
+        startup.mark("cenas")
         
     def _load_assets(self):
         """Carrega todos os assets do jogo"""
@@ -50,30 +123,102 @@ class Game:
         
     def _init_scenes(self):
         """Inicializa as cenas do jogo"""
-        self.scenes = {
-            "menu": MainMenuScene(self),
-            "village": VillageHubScene(self),
-            "challenge": ChallengeScene(self),
-            "lesson": LessonScene(self)
-        }
+        # Cenas sem parâmetros: importadas e construídas na primeira visita
+        self.scenes = SceneRegistry(self, ("menu", "village", "lesson", "arena"))
+        
+        # Desafios reaproveitados por módulo
+        self.scene_cache = SceneCache({
+            "challenge": lambda module_id="csharp": self.scenes.create("challenge", module_id=module_id)
+        }, SCENE_CACHE_SIZE)
+        self._warm_surface = None
+        self._warm_job = None
         
         # Começar no menu principal
-        self.current_scene = self.scenes["menu"]
-        self.current_scene.on_enter()
+        self.change_scene("menu")
         
     def change_scene(self, scene_name, **kwargs):
         """Muda para uma nova cena"""
-        if self.current_scene:
-            self.current_scene.on_exit()
+        if self.pending_scene:
+            self._cancel_loading()
+        elif self.current_scene:
+            self._exit_scene(self.current_scene)
+        self.current_scene = None
             
         if scene_name == "challenge":
-            # Criar nova cena de desafio com parâmetros
+            # Cena de desafio do módulo (reaproveitada pelo SceneCache)
             module_id = kwargs.get("module_id", "csharp")
-            self.scenes["challenge"] = ChallengeScene(self, module_id)
+            scene = self.scene_cache.get("challenge", module_id=module_id)
+        else:
+            scene = self.scenes.get(scene_name)
+        if scene:
+            self._load_scene(scene)
+            
+    def _load_scene(self, scene):
+        """Adquire os pacotes da cena; se faltar algo, mostra a tela de carregamento"""
+        for bundle in scene.BUNDLES:
+            assets.acquire_bundle(bundle, load=False)
+        job = self.loader.load_bundles(scene.BUNDLES)
+        if job.done:
+            self._enter_scene(scene)
+        else:
+            self.pending_scene = scene
+            self.pending_job = job
+            self.loading_scene.start(job)
+            self.current_scene = self.loading_scene
+            
+    def _update_loading(self):
+        """Entra na cena pendente quando os assets dela terminam de chegar"""
+        if self.pending_scene and self.pending_job.done:
+            scene = self.pending_scene
+            self.pending_scene = None
+            self.pending_job = None
+            self._enter_scene(scene)
+            
+    def _cancel_loading(self):
+        """Desiste da cena que estava carregando e solta os pacotes dela"""
+        self.loader.cancel(self.pending_job)
+        for bundle in self.pending_scene.BUNDLES:
+            assets.release_bundle(bundle)
+        self.pending_scene = None
+        self.pending_job = None
             
-        self.current_scene = self.scenes.get(scene_name)
-        if self.current_scene:
-            self.current_scene.on_enter()
+    def _run_jobs(self, frame_start):
+        """Continuações dos jobs na folga que resta até o próximo quadro"""
+        slack_ms = 1000.0 / FPS - (time.perf_counter() - frame_start) * 1000.0
+        jobs.run(max(slack_ms - JOB_FRAME_MARGIN_MS, 0.0))
+            
+    def _prewarm(self):
+        """Agenda a construção de uma cena provável a seguir quando não há outro trabalho"""
+        if not SCENE_PREWARM or self.pending_scene or self.loader.busy or jobs.pending:
+            return
+        if self._warm_job is not None and not (self._warm_job.done or self._warm_job.cancelled):
+            return
+        for name, params in self.current_scene.prewarm_targets():
+            if (name, params) not in self.scene_cache:
+                # Uma por vez; cancelada se a cena atual sair antes
+                self._warm_job = jobs.call_soon(self._warm_scene, name, params,
+                                                priority=PRIORITY_IDLE, owner=self.current_scene)
+                return
+                
+    def _warm_scene(self, name, params):
+        if self._warm_surface is None:
+            self._warm_surface = pygame.Surface(self.screen.get_size())
+        if self.scene_cache.warm(name, params, self._warm_surface):
+            print(f"[Game] Cena pré-construída: {name} {params}")
+            
+    def _enter_scene(self, scene):
+        """Ativa a cena (com os assets dos pacotes dela já carregados)"""
+        self.current_scene = scene
+        analytics.emit("cena", cena=type(scene).__name__)
+        audio.play_music(scene.MUSIC)
+        scene.on_enter()
+        
+    def _exit_scene(self, scene):
+        """Desativa a cena e solta os pacotes dela (descarregados após a carência)"""
+        scene.on_exit()
+        jobs.cancel_owner(scene)
+        for bundle in scene.BUNDLES:
+            assets.release_bundle(bundle)
             
     def run(self):
         """Loop principal do jogo"""
@@ -83,6 +228,8 @@ class Game:
         while self.running:
             # Calcular delta time
             dt = self.clock.tick(FPS) / 1000.0
+            frame_start = time.perf_counter()
+            metrics.frame(dt)
             
             # Processar eventos
             for event in pygame.event.get():
@@ -90,8 +237,14 @@ class Game:
                     self.running = False
                     
                 if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        self.perf_overlay.toggle()
+                    if event.key == pygame.K_F4:
+                        print(assets.describe())
+                        print(audio.describe())
+                        print(analytics.describe())
                     if event.key == pygame.K_ESCAPE:
-                        if self.current_scene != self.scenes["menu"]:
+                        if (self.pending_scene or self.current_scene) != self.scenes["menu"]:
                             self.change_scene("menu")
                         else:
                             self.running = False
@@ -100,11 +253,19 @@ class Game:
                 if self.current_scene:
                     self.current_scene.handle_event(event)
                     
-            # Atualizar cena atual
-            if self.current_scene:
-                self.current_scene.update(dt)
+            # Assets carregados em segundo plano e alterados no disco
+            self._update_loading()
+            if self.asset_watcher:
+                self.asset_watcher.update()
+            audio.update(dt)
+            
+            # Atualizar cena atual em passos fixos
+            for _ in range(self.timestep.advance(dt)):
+                if not self.current_scene:
+                    break
+                self.current_scene.update(self.timestep.dt)
                 
-                # Verificar mudança de cena
+                # Verificar mudança de cena (descarta os passos restantes do quadro)
                 if self.current_scene.next_scene:
                     next_scene = self.current_scene.next_scene
                     self.current_scene.next_scene = None
@@ -115,28 +276,69 @@ class Game:
                         self.change_scene(next_scene, module_id=module_id)
                     else:
                         self.change_scene(next_scene)
+                    break
                         
+            # Descarregar assets que ficaram sem uso
+            assets.collect()
+                
             # Desenhar
             if self.current_scene:
-                self.current_scene.draw(self.screen)
+                self.current_scene.draw(self.screen, self.timestep.alpha)
+            self.perf_overlay.update(dt)
+            self.perf_overlay.draw(pygame.display.get_surface())
+            
+            # Quadros ociosos pré-constroem as próximas cenas
+            if self.current_scene:
+                self._prewarm()
                 
             # Atualizar display
             pygame.display.flip()
             
+            # Trabalho em segundo plano que termina no thread principal
+            self._run_jobs(frame_start)
+            
+            if self.profile_startup:
+                self._profile_frame()
+            
         # Finalizar
         self._quit()
         
+    def _profile_frame(self):
+        """Marca o primeiro quadro e o da cena inicial; depois imprime e sai"""
+        if len(startup.phases) and startup.phases[-1][0] == "cenas":
+            startup.mark("primeiro quadro")
+        if not self.pending_scene and self.current_scene is not self.loading_scene:
+            startup.mark("cena inicial")
+            print(startup.report())
+            self.running = False
+            
     def _quit(self):
         """Finaliza o jogo"""
         print("Encerrando CodeFrontier...")
+        jobs.shutdown()
+        self.save.close()
+        analytics.close()
+        if self.grader:
+            self.grader.close()
+        if self.profiles:
+            self.profiles.close()
+        if self.asset_watcher:
+            self.asset_watcher.stop()
         pygame.mixer.quit()
         pygame.quit()
         sys.exit()
 
 
+def _student_from_args():
+    """Nome depois de --aluno (ou o de CODEFRONTIER_STUDENT)"""
+    if "--aluno" in sys.argv[1:-1]:
+        return sys.argv[sys.argv.index("--aluno") + 1]
+    return STUDENT
+
+
 def main():
     """Função principal"""
-    game = Game()
+    game = Game(profile_startup="--profile-startup" in sys.argv, student=_student_from_args())
     game.run()
 
 
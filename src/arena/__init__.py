@@ -0,0 +1,2 @@
+# Arena package
+from .client import ArenaClient
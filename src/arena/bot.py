@@ -0,0 +1,92 @@
+# Bots da Arena: jogadores sem janela para testar o servidor e a interpolação
+#
+#     python -m src.arena.bot --bots 10 --server 127.0.0.1:8767
+#
+# Cada bot "digita" a uma velocidade aleatória, passa nos testes do desafio
+# um a um em momentos aleatórios e termina a corrida; depois recomeça.
+
+import argparse
+import random
+import socket
+import time
+
+from src.config import ARENA_PORT
+from .client import ArenaClient
+
+
+class ArenaBot:
+    """Um jogador simulado sobre um ArenaClient"""
+
+    def __init__(self, address, name, total_tests=2, rng=None):
+        self.client = ArenaClient(address, name)
+        self.total_tests = total_tests
+        self.rng = rng or random.Random()
+        self._restart(time.perf_counter())
+
+    def _restart(self, now):
+        self.started = now
+        self.chars = 0.0
+        self.tests = 0
+        self.speed = self.rng.uniform(3.0, 12.0)          # caracteres por segundo
+        self.next_test = now + self.rng.uniform(2.0, 8.0)
+        self.finished_ms = 0
+
+    def step(self, dt, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.finished_ms:
+            if now - self.started > self.finished_ms / 1000.0 + 3.0:
+                self._restart(now)
+        else:
+            self.chars += self.speed * dt
+            if now >= self.next_test:
+                self.tests += 1
+                self.next_test = now + self.rng.uniform(2.0, 8.0)
+                if self.tests >= self.total_tests:
+                    self.finished_ms = int((now - self.started) * 1000)
+        self.client.set_progress(self.tests, int(self.chars), self.finished_ms)
+        self.client.update(now)
+
+    def close(self):
+        self.client.close()
+
+
+def run_bots(address, count, duration, rate=60.0, seed=1, total_tests=2):
+    """Roda `count` bots no mesmo processo por `duration` segundos; retorna os bots"""
+    rng = random.Random(seed)
+    bots = [ArenaBot(address, f"Bot {i + 1}", total_tests, random.Random(rng.random()))
+            for i in range(count)]
+    interval = 1.0 / rate
+    start = last = time.perf_counter()
+    while True:
+        now = time.perf_counter()
+        if duration and now - start >= duration:
+            break
+        for bot in bots:
+            bot.step(now - last, now)
+        last = now
+        time.sleep(max(0.0, interval - (time.perf_counter() - now)))
+    return bots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bots da Arena")
+    parser.add_argument("--server", default=f"127.0.0.1:{ARENA_PORT}")
+    parser.add_argument("--bots", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=0.0, help="0 = até Ctrl+C")
+    parser.add_argument("--tests", type=int, default=2, help="testes do desafio da corrida")
+    args = parser.parse_args()
+
+    host, _, port = args.server.rpartition(":")
+    address = (socket.gethostbyname(host or "127.0.0.1"), int(port))
+    bots = []
+    try:
+        bots = run_bots(address, args.bots, args.duration, total_tests=args.tests)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for bot in bots:
+            bot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Cliente da Arena usado pela cena e pelo bot
+#
+# Socket UDP não bloqueante: update() é chamado uma vez por quadro, lê todos
+# os pacotes que chegaram e manda o progresso do jogador (que também confirma
+# o último snapshot recebido) no ritmo dos ticks do servidor.
+#
+# Os snapshots chegam com intervalos irregulares (jitter). Para o desenho
+# andar liso, positions() mostra os outros jogadores ARENA_INTERP_TICKS ticks
+# no passado, interpolando entre os dois snapshots em volta desse instante.
+#
+# Sem boas-vindas do servidor em ARENA_TIMEOUT segundos (servidor fora do ar
+# ou inalcançável), o cliente desiste de entrar e marca timed_out.
+
+import socket
+import time
+from collections import OrderedDict, deque
+
+from src.config import ARENA_INTERP_TICKS, ARENA_TIMEOUT
+from . import protocol
+
+# Snapshots guardados como base para os deltas e para a interpolação
+HISTORY_TICKS = 64
+JOIN_RETRY = 0.5
+
+
+class ArenaClient:
+    """Conexão com o servidor da Arena e estado interpolado dos jogadores"""
+
+    def __init__(self, address, name, timeout=ARENA_TIMEOUT):
+        self.address = address
+        self.name = name
+        self.timeout = timeout
+        self.timed_out = False
+        self.player_id = None
+        self.challenge_id = None
+        self.tick_hz = None
+        self.full = False
+        self.names = {}
+        self.latest_tick = 0
+        self.state = protocol.EMPTY_STATE
+        self.bytes_received = 0
+        self.packets_received = 0
+        self._history = OrderedDict()     # tick -> {id: estado}
+        self._timeline = deque(maxlen=HISTORY_TICKS)   # (tick, estado) em ordem
+        self._offset = None               # relógio local - relógio do servidor (s)
+        self._last_send = 0.0
+        self._joining_since = None        # primeiro JOIN enviado
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.connect(address)
+
+    @property
+    def connected(self):
+        return self.player_id is not None
+
+    def set_progress(self, tests, chars, finished_ms=0):
+        self.state = (tests, chars, finished_ms)
+
+    def update(self, now=None):
+        """Lê os pacotes pendentes e manda o progresso (chamado a cada quadro)"""
+        now = time.perf_counter() if now is None else now
+        while True:
+            try:
+                data = self._socket.recv(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionRefusedError:
+                # Servidor ainda não subiu (ou caiu): tenta de novo no próximo envio
+                break
+            self.bytes_received += len(data)
+            self.packets_received += 1
+            self._receive(data, now)
+
+        if self.full or self.timed_out:
+            return
+        if not self.connected:
+            if self._joining_since is None:
+                self._joining_since = now
+            elif now - self._joining_since >= self.timeout:
+                self.timed_out = True
+                return
+            if now - self._last_send >= JOIN_RETRY:
+                self._send(protocol.encode_join(self.name), now)
+        elif now - self._last_send >= 1.0 / self.tick_hz:
+            self._send(protocol.encode_input(self.latest_tick, self.state), now)
+
+    def close(self):
+        if self.connected:
+            self._send(protocol.LEAVE, time.perf_counter())
+        self._socket.close()
+
+    def _send(self, packet, now):
+        self._last_send = now
+        try:
+            self._socket.send(packet)
+        except OSError:
+            pass
+
+    def _receive(self, data, now):
+        kind = data[:1]
+        if kind == protocol.WELCOME:
+            if not self.connected:
+                self.player_id, self.tick_hz, self.challenge_id = protocol.decode_welcome(data)
+        elif kind == protocol.FULL:
+            self.full = True
+        elif kind == protocol.SNAPSHOT and self.connected:
+            tick, baseline_tick, changes, names, removed = protocol.decode_snapshot(data)
+            if tick <= self.latest_tick:
+                return   # atrasado ou repetido
+            if baseline_tick:
+                baseline = self._history.get(baseline_tick)
+                if baseline is None:
+                    return   # base já descartada; o servidor manda completo quando perceber
+            else:
+                baseline = {}
+            state = protocol.apply_snapshot(baseline, changes, removed)
+            self.names.update(names)
+            for player_id in removed:
+                self.names.pop(player_id, None)
+            self.latest_tick = tick
+            self._history[tick] = state
+            while len(self._history) > HISTORY_TICKS:
+                self._history.popitem(last=False)
+            self._timeline.append((tick, state))
+
+            # Estimativa do relógio do servidor: desce na hora (pacote mais
+            # rápido) e sobe devagar, então o jitter não faz o desenho pular
+            offset = now - tick / self.tick_hz
+            if self._offset is None or offset < self._offset:
+                self._offset = offset
+            else:
+                self._offset += (offset - self._offset) * 0.02
+
+    def players(self):
+        """Último estado recebido: {id: (testes, caracteres, fim_ms)}"""
+        return self._timeline[-1][1] if self._timeline else {}
+
+    def positions(self, now=None):
+        """Estado interpolado para o desenho: {id: (testes, caracteres, fim_ms)} em float"""
+        if not self._timeline:
+            return {}
+        now = time.perf_counter() if now is None else now
+        render_tick = (now - self._offset) * self.tick_hz - ARENA_INTERP_TICKS
+
+        older, newer = self._timeline[0], self._timeline[-1]
+        if render_tick >= newer[0]:
+            older = newer
+        elif render_tick > older[0]:
+            for sample in self._timeline:
+                if sample[0] > render_tick:
+                    newer = sample
+                    break
+                older = sample
+        else:
+            newer = older
+        if newer is older:
+            return {player_id: tuple(map(float, state)) for player_id, state in older[1].items()}
+
+        fraction = (render_tick - older[0]) / (newer[0] - older[0])
+        result = {}
+        for player_id, state in newer[1].items():
+            previous = older[1].get(player_id, state)
+            result[player_id] = (
+                previous[0] + (state[0] - previous[0]) * fraction,
+                previous[1] + (state[1] - previous[1]) * fraction,
+                float(state[2]),
+            )
+        return result
@@ -0,0 +1,132 @@
+# Protocolo binário da Arena (UDP)
+#
+# Cliente -> servidor
+#   J <nome>                               entrar (repetido até o W chegar)
+#   I tick(I) testes(B) chars(H) fim(I)    progresso + último snapshot recebido
+#   L                                      sair
+# Servidor -> cliente
+#   W id(H) hz(H) <desafio>                boas-vindas
+#   F                                      Arena cheia
+#   S tick(I) base(I) n(H) r(H) ...        snapshot
+#
+# O snapshot é um delta contra o último snapshot que o cliente confirmou
+# (`base`, 0 = completo): só vão os jogadores que mudaram, e de cada um só os
+# campos que mudaram (máscara de bits), mais os ids que saíram. Se um pacote
+# se perde, o próximo continua relativo ao último confirmado, então nada
+# precisa ser reenviado.
+#
+# Estado de um jogador: (testes que passaram, caracteres no editor, tempo de
+# conclusão em ms; 0 = ainda correndo).
+
+import struct
+
+JOIN = b"J"
+INPUT = b"I"
+LEAVE = b"L"
+WELCOME = b"W"
+FULL = b"F"
+SNAPSHOT = b"S"
+
+EMPTY_STATE = (0, 0, 0)
+MAX_NAME_BYTES = 24
+
+# Campos do estado: (bit da máscara, formato)
+FIELDS = ((0x01, struct.Struct("!B")), (0x02, struct.Struct("!H")), (0x04, struct.Struct("!I")))
+MASK_NAME = 0x80
+
+_INPUT = struct.Struct("!IBHI")
+_WELCOME = struct.Struct("!HH")
+_HEADER = struct.Struct("!IIHH")
+_ENTRY = struct.Struct("!HB")
+_ID = struct.Struct("!H")
+_NAME_LEN = struct.Struct("!B")
+
+
+def encode_join(name):
+    return JOIN + name.encode("utf-8")[:MAX_NAME_BYTES]
+
+
+def encode_input(ack_tick, state):
+    tests, chars, finished_ms = state
+    return INPUT + _INPUT.pack(ack_tick, min(tests, 255), min(chars, 65535), finished_ms)
+
+
+def decode_input(data):
+    """(tick confirmado, estado) de um pacote I"""
+    ack_tick, tests, chars, finished_ms = _INPUT.unpack_from(data, 1)
+    return ack_tick, (tests, chars, finished_ms)
+
+
+def encode_welcome(player_id, tick_hz, challenge_id):
+    return WELCOME + _WELCOME.pack(player_id, tick_hz) + challenge_id.encode("utf-8")
+
+
+def decode_welcome(data):
+    player_id, tick_hz = _WELCOME.unpack_from(data, 1)
+    return player_id, tick_hz, data[1 + _WELCOME.size:].decode("utf-8")
+
+
+def encode_snapshot(tick, baseline_tick, baseline, current, names):
+    """Snapshot `current` ({id: estado}) como delta contra `baseline` (None = completo)"""
+    baseline = baseline or {}
+    entries = []
+    for player_id, state in current.items():
+        previous = baseline.get(player_id)
+        mask = 0
+        if previous is None:
+            mask = MASK_NAME
+            previous = EMPTY_STATE
+        for (bit, _), value, old in zip(FIELDS, state, previous):
+            if value != old:
+                mask |= bit
+        if not mask:
+            continue
+        parts = [_ENTRY.pack(player_id, mask)]
+        for (bit, field), value in zip(FIELDS, state):
+            if mask & bit:
+                parts.append(field.pack(value))
+        if mask & MASK_NAME:
+            name = names.get(player_id, "").encode("utf-8")[:MAX_NAME_BYTES]
+            parts.append(_NAME_LEN.pack(len(name)) + name)
+        entries.append(b"".join(parts))
+    removed = [player_id for player_id in baseline if player_id not in current]
+    return b"".join([SNAPSHOT, _HEADER.pack(tick, baseline_tick, len(entries), len(removed)),
+                     *entries, *(_ID.pack(player_id) for player_id in removed)])
+
+
+def decode_snapshot(data):
+    """(tick, base, mudanças {id: (máscara, valores)}, nomes novos, ids removidos)"""
+    tick, baseline_tick, changed, removed = _HEADER.unpack_from(data, 1)
+    offset = 1 + _HEADER.size
+    changes = {}
+    names = {}
+    for _ in range(changed):
+        player_id, mask = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+        values = []
+        for bit, field in FIELDS:
+            if mask & bit:
+                values.append(field.unpack_from(data, offset)[0])
+                offset += field.size
+            else:
+                values.append(None)
+        if mask & MASK_NAME:
+            length = _NAME_LEN.unpack_from(data, offset)[0]
+            offset += _NAME_LEN.size
+            names[player_id] = data[offset:offset + length].decode("utf-8", "replace")
+            offset += length
+        changes[player_id] = (mask, values)
+    gone = [_ID.unpack_from(data, offset + i * _ID.size)[0] for i in range(removed)]
+    return tick, baseline_tick, changes, names, gone
+
+
+def apply_snapshot(baseline, changes, removed):
+    """Estado completo a partir do snapshot base e de um delta decodificado"""
+    state = dict(baseline)
+    for player_id in removed:
+        state.pop(player_id, None)
+    for player_id, (mask, values) in changes.items():
+        previous = EMPTY_STATE if mask & MASK_NAME else state.get(player_id, EMPTY_STATE)
+        state[player_id] = tuple(old if value is None else value
+                                 for old, value in zip(previous, values))
+    return state
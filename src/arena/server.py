@@ -0,0 +1,248 @@
+# Servidor da Arena: corrida em tempo real no mesmo desafio
+#
+#     python -m src.arena.server --port 8767
+#     CODEFRONTIER_ARENA_SERVER=192.168.0.10:8767 python main.py
+#
+# Sem CODEFRONTIER_ARENA_SERVER, o jogo sobe um servidor local num thread ao
+# entrar na Arena (start_local_server).
+#
+# A cada tick (ARENA_TICK_HZ) o servidor guarda o estado de todos os
+# jogadores no histórico e manda para cada um o delta contra o último tick
+# que aquele cliente confirmou. Jogador sem mandar nada por ARENA_TIMEOUT
+# segundos sai da corrida.
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.config import ARENA_PORT, ARENA_TICK_HZ, ARENA_TIMEOUT, ARENA_MAX_PLAYERS, ARENA_CHALLENGE
+from . import protocol
+
+# Ticks guardados para servir de base aos deltas (clientes mais atrasados recebem completo)
+HISTORY_TICKS = 64
+
+
+class _Player:
+    def __init__(self, player_id, name, address, now):
+        self.id = player_id
+        self.name = name
+        self.address = address
+        self.state = protocol.EMPTY_STATE
+        self.acked = 0
+        self.last_seen = now
+
+
+class _ArenaProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, address):
+        self.server.datagram(data, address)
+
+
+class ArenaServer:
+    """Jogadores por endereço UDP, tick fixo e snapshots em delta"""
+
+    def __init__(self, host="0.0.0.0", port=ARENA_PORT, tick_hz=ARENA_TICK_HZ,
+                 challenge_id=ARENA_CHALLENGE, timeout=ARENA_TIMEOUT, jitter_ms=0.0):
+        self.host = host
+        self.port = port
+        self.tick_hz = tick_hz
+        self.challenge_id = challenge_id
+        self.timeout = timeout
+        self.jitter_ms = jitter_ms     # atraso aleatório nos envios (testar a interpolação)
+        self.tick = 0
+        self.players = {}              # endereço -> _Player
+        self.names = {}                # id -> nome
+        self._history = OrderedDict()  # tick -> {id: estado}
+        self._next_id = 0
+        self._transport = None
+        self._ticker = None
+
+        # Estatísticas: tempo de tick, bytes enviados e o que custaria sem delta
+        self.tick_ms = deque(maxlen=4096)
+        self.late_ticks = 0
+        self.bytes_sent = 0
+        self.full_bytes = 0
+        self.player_seconds = 0.0
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ArenaProtocol(self), local_addr=(self.host, self.port)
+        )
+        self.port = self._transport.get_extra_info("sockname")[1]
+        self._ticker = asyncio.create_task(self._run_ticks())
+        print(f"[Arena] Servidor em {self.host}:{self.port}, {self.tick_hz} ticks/s, desafio {self.challenge_id}")
+
+    def stop(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self._transport is not None:
+            self._transport.close()
+
+    # ------------------------------------------------------------------
+    # Pacotes
+    # ------------------------------------------------------------------
+    def datagram(self, data, address):
+        if not data:
+            return
+        kind = data[:1]
+        player = self.players.get(address)
+        now = time.monotonic()
+        if kind == protocol.JOIN:
+            if player is None:
+                if len(self.players) >= ARENA_MAX_PLAYERS:
+                    self._transport.sendto(protocol.FULL, address)
+                    return
+                self._next_id = self._next_id % 65535 + 1
+                name = data[1:].decode("utf-8", "replace").strip() or f"Jogador {self._next_id}"
+                player = _Player(self._next_id, name, address, now)
+                self.players[address] = player
+                self.names[player.id] = name
+                print(f"[Arena] {name} entrou ({len(self.players)} jogadores)")
+            # Repetido se o W se perdeu
+            self._transport.sendto(protocol.encode_welcome(player.id, self.tick_hz, self.challenge_id), address)
+        elif player is None:
+            return
+        elif kind == protocol.INPUT and len(data) >= 12:
+            ack_tick, state = protocol.decode_input(data)
+            player.state = state
+            # Só avança: um pacote atrasado não faz o delta voltar para uma base antiga
+            player.acked = max(player.acked, ack_tick)
+            player.last_seen = now
+        elif kind == protocol.LEAVE:
+            self._remove(player)
+
+    def _remove(self, player):
+        self.players.pop(player.address, None)
+        self.names.pop(player.id, None)
+        print(f"[Arena] {player.name} saiu ({len(self.players)} jogadores)")
+
+    # ------------------------------------------------------------------
+    # Ticks
+    # ------------------------------------------------------------------
+    async def _run_ticks(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_hz
+        next_tick = loop.time()
+        while True:
+            self._tick()
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Atrasou mais de um tick: recomeça a contagem em vez de disparar vários seguidos
+                self.late_ticks += 1
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _tick(self):
+        start = time.perf_counter()
+        self.tick += 1
+        now = time.monotonic()
+        for player in [p for p in self.players.values() if now - p.last_seen > self.timeout]:
+            self._remove(player)
+
+        current = {player.id: player.state for player in self.players.values()}
+        self._history[self.tick] = current
+        while len(self._history) > HISTORY_TICKS:
+            self._history.popitem(last=False)
+
+        if self.players:
+            self.full_bytes += len(protocol.encode_snapshot(self.tick, 0, None, current, self.names)) * len(self.players)
+        for player in self.players.values():
+            baseline = self._history.get(player.acked)
+            packet = protocol.encode_snapshot(self.tick, player.acked if baseline is not None else 0,
+                                              baseline, current, self.names)
+            self._send(packet, player.address)
+        self.player_seconds += len(self.players) / self.tick_hz
+        self.tick_ms.append((time.perf_counter() - start) * 1000.0)
+
+    def _send(self, packet, address):
+        self.bytes_sent += len(packet)
+        if self.jitter_ms:
+            asyncio.get_running_loop().call_later(random.uniform(0, self.jitter_ms) / 1000.0,
+                                                  self._transport.sendto, packet, address)
+        else:
+            self._transport.sendto(packet, address)
+
+    def stats(self):
+        """Tempo de tick e banda por jogador desde o início"""
+        ticks = sorted(self.tick_ms)
+        per_player = self.bytes_sent / self.player_seconds if self.player_seconds else 0.0
+        return {
+            "ticks": self.tick,
+            "atrasados": self.late_ticks,
+            "tick_p50_ms": round(statistics.median(ticks), 3) if ticks else 0.0,
+            "tick_p99_ms": round(ticks[min(len(ticks) - 1, int(len(ticks) * 0.99))], 3) if ticks else 0.0,
+            "tick_max_ms": round(ticks[-1], 3) if ticks else 0.0,
+            "bytes_jogador_s": round(per_player, 1),
+            "delta_frac": round(self.bytes_sent / self.full_bytes, 3) if self.full_bytes else 1.0,
+        }
+
+
+def start_local_server(host="127.0.0.1", port=0, **options):
+    """Inicia um servidor num thread de fundo com loop próprio; retorna (server, (host, porta))
+
+    Se o servidor não subir (porta ocupada, por exemplo) o erro é levantado aqui.
+    """
+    server = ArenaServer(host, port, **options)
+    started = threading.Event()
+    errors = []
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(server.start())
+        except Exception as e:
+            errors.append(e)
+            loop.close()
+            return
+        finally:
+            started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="arena-server", daemon=True).start()
+    started.wait()
+    if errors:
+        raise errors[0]
+    return server, (host, server.port)
+
+
+async def _serve(args):
+    server = ArenaServer(args.host, args.port, args.hz, args.challenge, jitter_ms=args.jitter_ms)
+    await server.start()
+    try:
+        if args.duration:
+            await asyncio.sleep(args.duration)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        server.stop()
+        print("[Arena] Estatísticas " + json.dumps(server.stats()), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor da Arena")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=ARENA_PORT)
+    parser.add_argument("--hz", type=int, default=ARENA_TICK_HZ)
+    parser.add_argument("--challenge", default=ARENA_CHALLENGE)
+    parser.add_argument("--duration", type=float, default=0.0, help="encerra depois de N segundos")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="atraso aleatório nos envios")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# Assistant package
+from .client import (
+    AssistantClient,
+    HttpAssistantBackend,
+    OfflineAssistantBackend,
+    create_assistant_client,
+    normalize_question
+)
@@ -0,0 +1,218 @@
+# Cliente assíncrono da assistente CinthIA
+#
+# As perguntas são respondidas em threads de fundo e os pedaços da resposta
+# (tokens) chegam ao jogo por uma fila. A cena consome a fila uma vez por
+# quadro com poll(), então o loop principal nunca espera pela assistente.
+
+import json
+import queue
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from src.config import ASSISTANT_URL, ASSISTANT_TIMEOUT
+from src.utils import metrics
+from src.utils.asset_manager import get_resource_path, resource_buffer
+from .hint_index import HintIndex
+
+
+def normalize_question(text):
+    """Normaliza a pergunta para o cache (minúsculas, sem acentos e pontuação)"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", text))
+
+
+class OfflineAssistantBackend:
+    """Backend local sem rede: responde com a dica e o objetivo do desafio"""
+
+    def stream(self, question, context, cancel_event):
+        reply = (
+            f"Boa pergunta! {context.get('hint', '')} "
+            f"Lembre-se do objetivo: {context.get('objective', '')}"
+        )
+        for word in reply.split(" "):
+            if cancel_event.is_set():
+                return
+            yield word + " "
+
+
+class HttpAssistantBackend:
+    """Backend HTTP que recebe a resposta em streaming (JSON por linha)
+
+    Protocolo: POST com {"question", "context"}; a resposta é uma sequência
+    de linhas {"token": "..."} terminada por {"done": true}.
+    """
+
+    def __init__(self, url, timeout=ASSISTANT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def stream(self, question, context, cancel_event):
+        # Importado na primeira pergunta: urllib.request (e http, email, ...)
+        # pesa na inicialização e o jogo pode nem usar a assistente
+        import urllib.request
+
+        body = json.dumps({"question": question, "context": context}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            while not cancel_event.is_set():
+                line = response.readline()
+                if not line:
+                    # Conexão fechada antes do {"done": true}: resposta cortada
+                    raise ConnectionError("resposta interrompida pelo servidor")
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line.decode("utf-8"))
+                if data.get("done"):
+                    return
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                yield data.get("token", "")
+
+
+class AssistantRequest:
+    """Pergunta em andamento"""
+
+    def __init__(self, question, context, cache_key):
+        self.question = question
+        self.context = context
+        self.cache_key = cache_key
+        self.cancel_event = threading.Event()
+        self.started = time.perf_counter()
+        self.first_token_ms = None
+        self.text = ""
+        self.finished = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class AssistantClient:
+    """Faz perguntas à assistente sem bloquear o loop do jogo
+
+    poll() devolve eventos (request, tipo, dado), em que tipo é "token"
+    (pedaço novo da resposta), "done" (texto completo) ou "error".
+    """
+
+    CACHE_SIZE = 128
+
+    def __init__(self, backend, hint_index=None):
+        self.backend = backend
+        self.hint_index = hint_index
+        self.current = None
+        self._events = queue.Queue()
+        self._cache = OrderedDict()
+
+    def ask(self, question, context):
+        """Envia uma pergunta (cancela a anterior, se ainda estiver em andamento)"""
+        self.cancel()
+
+        cache_key = (normalize_question(question), context.get("module"), context.get("challenge"))
+        request = AssistantRequest(question, context, cache_key)
+        self.current = request
+
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            # Resposta já conhecida: entregue no próximo poll, sem thread
+            self._cache.move_to_end(cache_key)
+            self._events.put((request, "token", cached))
+            self._events.put((request, "done", cached))
+            return request
+
+        # Dúvidas comuns são respondidas pelo índice local, sem rede
+        if self.hint_index is not None:
+            with metrics.timer("dicas.busca_ms"):
+                local = self.hint_index.answer(question, context.get("module"))
+            if local is not None:
+                self._events.put((request, "token", local))
+                self._events.put((request, "done", None))
+                return request
+
+        thread = threading.Thread(target=self._run, args=(request,), daemon=True)
+        thread.start()
+        return request
+
+    def cancel(self):
+        """Cancela a pergunta em andamento"""
+        if self.current is not None and not self.current.finished:
+            self.current.cancel_event.set()
+        self.current = None
+
+    def poll(self):
+        """Retorna os eventos que chegaram desde a última chamada (não bloqueia)"""
+        events = []
+        while True:
+            try:
+                request, kind, data = self._events.get_nowait()
+            except queue.Empty:
+                return events
+            if request.cancelled:
+                continue
+
+            if kind == "token":
+                if request.first_token_ms is None:
+                    request.first_token_ms = (time.perf_counter() - request.started) * 1000.0
+                    metrics.record("assistente.primeiro_token_ms", request.first_token_ms)
+                request.text += data
+            elif kind == "done":
+                request.finished = True
+                self._store(request.cache_key, request.text)
+                metrics.record("assistente.resposta_ms", (time.perf_counter() - request.started) * 1000.0)
+            else:
+                request.finished = True
+            events.append((request, kind, data))
+
+    def _run(self, request):
+        """Executa a pergunta numa thread de fundo"""
+        try:
+            for token in self.backend.stream(request.question, request.context, request.cancel_event):
+                if request.cancelled:
+                    return
+                self._events.put((request, "token", token))
+            if not request.cancelled:
+                self._events.put((request, "done", None))
+        except Exception as e:  # URLError, HTTPException (IncompleteRead), JSON inválido...
+            # O thread não pode morrer calado: a cena espera "done" ou "error"
+            print(f"[Assistente] Erro ao consultar o backend: {e}")
+            self._events.put((request, "error", str(e)))
+
+    def _store(self, key, text):
+        if not text:
+            return
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+
+def open_hint_index():
+    """Abre o índice local de dicas gerado no build (None se não existir)"""
+    buffer = resource_buffer("assets/data/hints.idx")
+    if buffer is not None:
+        return HintIndex(buffer)
+
+    path = get_resource_path("assets/data/hints.idx")
+    if not path.exists():
+        print(f"[Assistente] Índice de dicas não encontrado: {path}")
+        return None
+    try:
+        return HintIndex(str(path))
+    except (OSError, ValueError) as e:
+        print(f"[Assistente] Erro ao abrir índice de dicas: {e}")
+        return None
+
+
+def create_assistant_client():
+    """Cria o cliente com o backend configurado (HTTP ou offline)"""
+    hint_index = open_hint_index()
+    if ASSISTANT_URL:
+        print(f"[Assistente] Usando backend HTTP: {ASSISTANT_URL}")
+        return AssistantClient(HttpAssistantBackend(ASSISTANT_URL), hint_index)
+    return AssistantClient(OfflineAssistantBackend(), hint_index)
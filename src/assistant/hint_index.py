@@ -0,0 +1,275 @@
+# Índice invertido local (BM25) para responder dúvidas sem a assistente
+#
+# O índice é gerado uma vez, na etapa de build do conteúdo:
+#     python -m src.assistant.hint_index
+# e gravado num arquivo binário que o jogo abre com mmap. A busca lê só os
+# termos da pergunta (busca binária na tabela de termos) e as listas de
+# postings deles, então responde em bem menos de 1 ms no thread principal.
+#
+# Formato (little endian):
+#   cabeçalho  _HEADER
+#   metadados  JSON (módulos e tipos de documento)
+#   termos     n_terms x _TERM, ordenados pelos bytes do termo
+#   postings   (doc_id, tf) x df de cada termo
+#   docs       n_docs x _DOC
+#   textos     UTF-8 (termos e textos dos documentos)
+
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import unicodedata
+
+MAGIC = b"CFHX"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIfIIIII")
+_TERM = struct.Struct("<IHHI")       # offset do termo, tamanho, df, offset dos postings
+_POSTING = struct.Struct("<HH")      # doc_id, tf
+_DOC = struct.Struct("<HBBII")       # tamanho (tokens), módulo, tipo, offset do texto, tamanho
+
+# Parâmetros do BM25
+K1 = 1.2
+B = 0.75
+
+# Pontuação mínima para responder localmente (abaixo disso vai para a assistente)
+MIN_SCORE = 2.0
+
+# Peso por tipo de documento (dicas e objetivos respondem melhor às dúvidas)
+KIND_WEIGHTS = {"dica": 1.3, "objetivo": 1.2}
+
+_STOPWORDS = frozenset("""
+a o e é de da do das dos que como para com um uma uns umas em no na nos nas
+os as se por pra pro eu meu minha voce voces isso esse essa este esta isto
+qual quais onde quando porque ser sao ter tem nao sim me te lhe mais muito
+ja ao aos faco faz fazer sobre entao tipo algum alguma aqui ali pelo pela
+""".split())
+
+
+def _strip_accents(text):
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize_text(text):
+    """Quebra o texto em termos normalizados (minúsculas, sem acento, sem plural)"""
+    terms = []
+    for word in re.findall(r"[A-Za-zÀ-ÿ0-9_]+", text):
+        # Identificadores: colher_frutas -> colher, frutas; SpawnMango -> spawn, mango
+        parts = re.findall(r"[A-ZÀ-Ý]?[a-zß-ÿ0-9]+|[A-ZÀ-Ý]+(?![a-zß-ÿ])", word.replace("_", " "))
+        candidates = [word] if len(parts) <= 1 else [word] + parts
+        for candidate in candidates:
+            term = _strip_accents(candidate.lower())
+            if len(term) > 3 and term.endswith("s"):
+                term = term[:-1]
+            if len(term) > 1 and term not in _STOPWORDS:
+                terms.append(term)
+    return terms
+
+
+class HintIndex:
+    """Leitor do índice mapeado em memória
+
+    `source` é o caminho do arquivo ou um buffer já mapeado (entrada do
+    assets.pack).
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (str, bytes, os.PathLike)):
+            self._file = open(source, "rb")
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._file = None
+            self._data = source
+        (magic, version, _flags, self.n_docs, self.n_terms, self.avgdl,
+         meta_off, meta_len, self._terms_off, self._docs_off,
+         self._strings_off) = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Índice de dicas inválido")
+        meta = json.loads(bytes(self._data[meta_off:meta_off + meta_len]).decode("utf-8"))
+        self.modules = meta["modules"]
+        self.kinds = meta["kinds"]
+
+    def close(self):
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+
+    def search(self, question, module=None, limit=3):
+        """Retorna até `limit` tuplas (pontuação, texto, tipo) mais relevantes
+
+        Documentos de outros módulos são ignorados; documentos gerais
+        (sem módulo) valem para qualquer módulo.
+        """
+        scores = {}
+        for term in set(tokenize_text(question)):
+            found = self._find_term(term)
+            if found is None:
+                continue
+            df, postings_off = found
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            for i in range(df):
+                doc_id, tf = _POSTING.unpack_from(self._data, postings_off + i * _POSTING.size)
+                doc_len = _DOC.unpack_from(self._data, self._docs_off + doc_id * _DOC.size)[0]
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_len / self.avgdl))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+        candidates = []
+        for doc_id, score in scores.items():
+            _, module_idx, kind_idx, text_off, text_len = _DOC.unpack_from(
+                self._data, self._docs_off + doc_id * _DOC.size
+            )
+            doc_module = self.modules[module_idx]
+            if module and doc_module and doc_module != module:
+                continue
+            kind = self.kinds[kind_idx]
+            candidates.append((score * KIND_WEIGHTS.get(kind, 1.0), kind, text_off, text_len))
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        results = []
+        for score, kind, text_off, text_len in candidates[:limit]:
+            start = self._strings_off + text_off
+            results.append((score, bytes(self._data[start:start + text_len]).decode("utf-8"), kind))
+        return results
+
+    def answer(self, question, module=None):
+        """Texto da melhor resposta local, ou None se nada for relevante o bastante"""
+        results = self.search(question, module, limit=1)
+        if results and results[0][0] >= MIN_SCORE:
+            return results[0][1]
+        return None
+
+    def _find_term(self, term):
+        """Busca binária na tabela de termos; retorna (df, offset dos postings)"""
+        key = term.encode("utf-8")
+        data = self._data
+        low, high = 0, self.n_terms
+        while low < high:
+            middle = (low + high) // 2
+            term_off, term_len, df, postings_off = _TERM.unpack_from(
+                data, self._terms_off + middle * _TERM.size
+            )
+            start = self._strings_off + term_off
+            candidate = bytes(data[start:start + term_len])
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return df, postings_off
+        return None
+
+
+def build_index(documents, path):
+    """Grava o índice
+
+    Args:
+        documents: lista de dicts com "text" (resposta exibida), "module"
+            ("" = geral), "kind" e opcionalmente "keywords" (texto extra
+            indexado, mas não exibido).
+        path: arquivo de saída.
+    """
+    modules = sorted({doc["module"] for doc in documents})
+    kinds = sorted({doc["kind"] for doc in documents})
+
+    strings = bytearray()
+    doc_entries = []
+    postings_by_term = {}
+    total_length = 0
+    for doc_id, doc in enumerate(documents):
+        terms = tokenize_text(doc["text"] + " " + doc.get("keywords", ""))
+        total_length += len(terms)
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings_by_term.setdefault(term, []).append((doc_id, min(tf, 0xFFFF)))
+
+        text = doc["text"].encode("utf-8")
+        doc_entries.append((min(len(terms), 0xFFFF), modules.index(doc["module"]),
+                            kinds.index(doc["kind"]), len(strings), len(text)))
+        strings += text
+
+    meta = json.dumps({"modules": modules, "kinds": kinds}).encode("utf-8")
+    sorted_terms = sorted(postings_by_term, key=lambda term: term.encode("utf-8"))
+
+    meta_off = _HEADER.size
+    terms_off = meta_off + len(meta)
+    postings_off = terms_off + len(sorted_terms) * _TERM.size
+
+    term_table = bytearray()
+    postings = bytearray()
+    for term in sorted_terms:
+        encoded = term.encode("utf-8")
+        entries = postings_by_term[term]
+        term_table += _TERM.pack(len(strings), len(encoded), len(entries),
+                                 postings_off + len(postings))
+        strings += encoded
+        for doc_id, tf in entries:
+            postings += _POSTING.pack(doc_id, tf)
+
+    docs_off = postings_off + len(postings)
+    strings_off = docs_off + len(doc_entries) * _DOC.size
+    avgdl = total_length / max(1, len(documents))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(documents), len(sorted_terms), avgdl,
+                             meta_off, len(meta), terms_off, docs_off, strings_off))
+        f.write(meta)
+        f.write(term_table)
+        f.write(postings)
+        for entry in doc_entries:
+            f.write(_DOC.pack(*entry))
+        f.write(strings)
+    return len(documents), len(sorted_terms)
+
+
+def collect_documents():
+    """Reúne o conteúdo dos pacotes (assets/content) que vira documento do índice"""
+    from src.utils.content import ContentLibrary
+
+    library = ContentLibrary()
+    documents = []
+    for module_id, module in library.modules().items():
+        lessons = [lesson["title"] for lesson in library.lessons(module_id)]
+        documents.append({"module": module_id, "kind": "licao",
+                          "text": f"{module['name']}: {module['description']} "
+                                  f"Lições: {', '.join(lessons)}.",
+                          "keywords": "lição lições aula conteúdo aprender"})
+
+        for challenge_id in library.challenge_ids(module_id):
+            challenge = library.challenge(challenge_id)
+            title = challenge["title"]
+            documents.append({"module": module_id, "kind": "dica", "text": challenge["hint"],
+                              "keywords": f"{title} dica ajuda travado"})
+            documents.append({"module": module_id, "kind": "objetivo",
+                              "text": f"O objetivo é: {challenge['objective']}.",
+                              "keywords": f"{title} objetivo missão tarefa fazer"})
+
+            # Código de exemplo, um bloco (separado por linha em branco) por documento
+            for block in re.split(r"\n\s*\n", challenge["code"]):
+                block = block.strip("\n")
+                if block.strip():
+                    documents.append({"module": module_id, "kind": "codigo",
+                                      "text": f"Veja este trecho do exemplo:\n{block}",
+                                      "keywords": "exemplo código sintaxe"})
+    return documents
+
+
+def main():
+    import argparse
+    from src.utils.asset_manager import get_resource_path
+
+    parser = argparse.ArgumentParser(description="Gera o índice local de dicas")
+    parser.add_argument("--output", default=str(get_resource_path("assets/data/hints.idx")))
+    args = parser.parse_args()
+
+    documents = collect_documents()
+    n_docs, n_terms = build_index(documents, args.output)
+    print(f"[HintIndex] {n_docs} documentos, {n_terms} termos -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
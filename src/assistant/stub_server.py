@@ -0,0 +1,105 @@
+# Servidor HTTP local que imita o backend da assistente
+#
+# Útil para testar o streaming sem acesso à internet:
+#     python -m src.assistant.stub_server --port 8765 --delay 0.05
+#     CODEFRONTIER_ASSISTANT_URL=http://127.0.0.1:8765/ python main.py
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAssistantHandler(BaseHTTPRequestHandler):
+    """Responde cada pergunta palavra por palavra, em JSON por linha"""
+
+    # HTTP/1.0: o fim da resposta é o fechamento da conexão
+    protocol_version = "HTTP/1.0"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error(400, "JSON inválido")
+            return
+
+        context = payload.get("context", {})
+        reply = (
+            f"Você perguntou: \"{payload.get('question', '')}\". "
+            f"{context.get('hint', 'Tente dividir o problema em partes menores.')}"
+        )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        time.sleep(self.server.first_token_delay)
+        try:
+            for i, word in enumerate(reply.split(" ")):
+                if self.server.cut_after is not None and i >= self.server.cut_after:
+                    # Simula a conexão caindo no meio da resposta (sem "done")
+                    return
+                self._send_line({"token": word + " "})
+                time.sleep(self.server.token_delay)
+            self._send_line({"done": True})
+        except (BrokenPipeError, ConnectionResetError):
+            # O cliente cancelou a pergunta
+            pass
+
+    def _send_line(self, data):
+        self.wfile.write(json.dumps(data).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _make_server(host, port, token_delay, first_token_delay, verbose, cut_after):
+    """Servidor configurado (os handlers leem as opções no próprio servidor)"""
+    server = ThreadingHTTPServer((host, port), StubAssistantHandler)
+    server.daemon_threads = True
+    server.token_delay = token_delay
+    server.first_token_delay = first_token_delay
+    server.verbose = verbose
+    server.cut_after = cut_after
+    return server
+
+
+def start_stub_server(host="127.0.0.1", port=0, token_delay=0.03,
+                      first_token_delay=0.2, verbose=False, cut_after=None):
+    """Inicia o servidor numa thread de fundo
+
+    Com `cut_after`, a resposta é cortada depois desse número de tokens.
+
+    Returns:
+        (server, url): chame server.shutdown() para encerrar.
+    """
+    server = _make_server(host, port, token_delay, first_token_delay, verbose, cut_after)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local da assistente CinthIA")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.03, help="Atraso entre tokens (s)")
+    parser.add_argument("--first-delay", type=float, default=0.2, help="Atraso até o primeiro token (s)")
+    args = parser.parse_args()
+
+    server = _make_server(args.host, args.port, args.delay, args.first_delay, verbose=True, cut_after=None)
+    print(f"[Assistente] Servidor local em http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 # Configurações globais do jogo CodeFrontier
 
+import os
 import pygame
 
 # Configurações da tela
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+# Quadros por segundo desenhados (ex.: 30 em máquinas fracas); a lógica sempre
+# avança em passos fixos de 1/SIMULATION_HZ, independente do FPS
+FPS = int(os.environ.get("CODEFRONTIER_FPS", "60"))
+SIMULATION_HZ = 60
+FIXED_TIMESTEP = os.environ.get("CODEFRONTIER_FIXED_TIMESTEP", "1") != "0"
+# Máximo de passos simulados num quadro (o atraso além disso é descartado)
+MAX_UPDATE_STEPS = 5
 TITLE = "CodeFrontier - Aprenda Programação"
 
 # Cores do tema
@@ -40,6 +47,9 @@ class Colors:
     CODE_YELLOW = (220, 220, 170)
     CODE_PINK = (206, 145, 120)
     CODE_PURPLE = (197, 134, 192)
+    CODE_COMMENT = (106, 153, 85)
+    CODE_NUMBER = (181, 206, 168)
+    CODE_VARIABLE = (156, 220, 254)
     
     # Cores de texto
     TEXT_LIGHT = (240, 240, 240)
@@ -60,65 +70,101 @@ class GameState:
     SETTINGS = "settings"
     CREDITS = "credits"
 
-# Módulos de programação
-MODULES = {
-    "csharp": {
-        "name": "Colhendo com C#",
-        "description": "Aprenda os fundamentos do C# enquanto colhe frutas no pomar!",
-        "color": Colors.CSHARP_GREEN,
-        "icon": "csharp_icon",
-        "lessons": ["Variáveis", "Funções", "Classes", "Loops"]
-    },
-    "python": {
-        "name": "Loops Mágicos com Python",
-        "description": "Domine loops e magia com Python!",
-        "color": Colors.PYTHON_PURPLE,
-        "icon": "python_icon",
-        "lessons": ["For Loops", "While Loops", "List Comprehension", "Funções"]
-    },
-    "php": {
-        "name": "Desafios Arcanos com PHP",
-        "description": "Enfrente desafios arcanos usando PHP!",
-        "color": Colors.PHP_YELLOW,
-        "icon": "php_icon",
-        "lessons": ["Arrays", "Strings", "Funções", "OOP"]
-    },
-    "javascript": {
-        "name": "Aprimorando Recursos com JavaScript",
-        "description": "Aprimore suas habilidades com JavaScript!",
-        "color": Colors.JS_ORANGE,
-        "icon": "js_icon",
-        "lessons": ["DOM", "Eventos", "Promises", "Fetch API"]
-    }
-}
+# Assistente CinthIA (sem URL usa o backend offline)
+ASSISTANT_URL = os.environ.get("CODEFRONTIER_ASSISTANT_URL", "")
+ASSISTANT_TIMEOUT = 15
 
-# Áreas do vilarejo
-VILLAGE_AREAS = {
-    "training": {
-        "name": "Treinamento",
-        "description": "Pratique suas habilidades de programação",
-        "position": (200, 150)
-    },
-    "potions": {
-        "name": "Poções",
-        "description": "Crie soluções mágicas de código",
-        "position": (900, 150)
-    },
-    "arena": {
-        "name": "Arena",
-        "description": "Desafie outros programadores",
-        "position": (200, 500)
-    },
-    "greenhouse": {
-        "name": "Estufa",
-        "description": "Cultive seus projetos",
-        "position": (900, 500)
-    }
-}
+# Pacote único de assets (vazio = arquivos soltos; o executável usa o assets.pack embutido)
+ASSET_PACK = os.environ.get("CODEFRONTIER_ASSET_PACK", "")
+
+# Cache de imagens já decodificadas (pasta vazia = cache do usuário; "0" desliga)
+PIXEL_CACHE = os.environ.get("CODEFRONTIER_PIXEL_CACHE", "1") != "0"
+PIXEL_CACHE_DIR = os.environ.get("CODEFRONTIER_PIXEL_CACHE_DIR", "")
+# Imagens decodificadas em memória compartilhada entre instâncias na mesma
+# máquina (laboratórios com vários jogos abertos); desligado por padrão
+SHARED_ASSETS = os.environ.get("CODEFRONTIER_SHARED_ASSETS", "0") != "0"
+
+# Segundos que um asset sem referências fica em memória antes de ser descarregado
+ASSET_UNLOAD_GRACE = 10.0
+
+# Agendador de trabalho: threads e milissegundos reservados antes do próximo
+# quadro (as continuações no thread principal usam só o resto da folga)
+JOB_WORKERS = 2
+JOB_FRAME_MARGIN_MS = 2.0
+
+# Recarregar assets alterados no disco sem reiniciar (desenvolvimento, "1" liga)
+HOT_RELOAD = os.environ.get("CODEFRONTIER_HOT_RELOAD", "0") == "1"
+HOT_RELOAD_INTERVAL = 0.25
+
+# Áudio: canais fixos por categoria, cache de efeitos decodificados e música
+AUDIO_CHANNELS = {"voice": 1, "ui": 2, "typing": 1, "sfx": 4}
+SFX_CACHE_BYTES = 8 * 1024 * 1024
+MUSIC_FADE_MS = 800
+MUSIC_VOLUME = 0.6
+
+# Cenas com parâmetros (desafios por módulo) mantidas para reaproveitar
+SCENE_CACHE_SIZE = 6
+
+# Construir em quadros ociosos as cenas prováveis a seguir ("0" desliga)
+SCENE_PREWARM = os.environ.get("CODEFRONTIER_SCENE_PREWARM", "1") != "0"
+
+# Progresso salvo (pasta vazia = pasta de dados do usuário) e eventos no
+# journal antes de compactar num snapshot
+SAVE_DIR = os.environ.get("CODEFRONTIER_SAVE_DIR", "")
+SAVE_COMPACT_EVENTS = 256
+
+# Perfis de alunos (máquinas compartilhadas): com um nome em
+# CODEFRONTIER_STUDENT (ou --aluno NOME), o progresso é separado por aluno e
+# as tentativas vão para o banco SQLite (vazio = profiles.db ao lado do save)
+STUDENT = os.environ.get("CODEFRONTIER_STUDENT", "")
+PROFILE_DB = os.environ.get("CODEFRONTIER_PROFILE_DB", "")
+
+# Eventos de aprendizagem ("0" desliga): fila limitada, amostragem de 1 em N
+# quando passa da fração SAMPLE_AT, arquivos .ndjson.gz que trocam por tamanho
+ANALYTICS = os.environ.get("CODEFRONTIER_ANALYTICS", "1") != "0"
+ANALYTICS_DIR = os.environ.get("CODEFRONTIER_ANALYTICS_DIR", "")
+ANALYTICS_QUEUE = 4096
+ANALYTICS_SAMPLE_AT = 0.75
+ANALYTICS_SAMPLE_EVERY = 4
+ANALYTICS_FLUSH_INTERVAL = 1.0
+ANALYTICS_FILE_BYTES = 1024 * 1024
+ANALYTICS_MAX_FILES = 20
+
+# Servidor de correção da turma: endereço "host:porta" no jogo dos alunos
+# (vazio = correção local) e parâmetros do servidor na máquina do professor
+GRADING_SERVER = os.environ.get("CODEFRONTIER_GRADING_SERVER", "")
+GRADING_PORT = 8766
+GRADING_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+GRADING_CLIENT_QUEUE = 4         # envios aguardando por aluno antes de parar de ler
+GRADING_TIMEOUT = 5.0
+GRADING_MAX_LINE = 64 * 1024
+# Arquivo JSONL onde o servidor grava os envios (vazio = não grava), lido
+# pela busca de envios parecidos
+GRADING_SUBMISSIONS = os.environ.get("CODEFRONTIER_GRADING_SUBMISSIONS", "")
+
+# Envios parecidos (python -m src.grading.similarity): assinatura MinHash com
+# SIMILARITY_PERMUTATIONS números em SIMILARITY_BANDS faixas do LSH. 20 faixas
+# de 6 linhas acham ~92% dos pares com similaridade 0.7 e quase todos acima
+# de 0.8, e poucos abaixo de 0.4 chegam a ser comparados
+SIMILARITY_PERMUTATIONS = 120
+SIMILARITY_BANDS = 20
+SIMILARITY_SHINGLE = 5            # tokens por janela
+SIMILARITY_THRESHOLD = 0.8
+
+# Arena (corrida em tempo real): servidor "host:porta" (vazio = servidor local
+# iniciado pelo jogo), ticks por segundo e atraso da interpolação em ticks
+ARENA_SERVER = os.environ.get("CODEFRONTIER_ARENA_SERVER", "")
+ARENA_PORT = 8767
+ARENA_TICK_HZ = 20
+ARENA_INTERP_TICKS = 2
+ARENA_TIMEOUT = 5.0
+ARENA_MAX_PLAYERS = 64
+ARENA_CHALLENGE = "python/colheita-magica"
 
 # Configurações do jogador
 PLAYER_START_HEALTH = 5
 PLAYER_MAX_HEALTH = 5
+CHALLENGE_XP = 100
 
 # Configurações de fonte
 FONT_SIZES = {
@@ -128,3 +174,18 @@ FONT_SIZES = {
     "title": 48,
     "huge": 64
 }
+
+# Cores do realce de sintaxe por tipo de token (ver src/utils/lexer.py)
+SYNTAX_COLORS = {
+    "text": Colors.TEXT_LIGHT,
+    "keyword": Colors.CODE_BLUE,
+    "control": Colors.CODE_PURPLE,
+    "type": Colors.CODE_GREEN,
+    "function": Colors.CODE_YELLOW,
+    "string": Colors.CODE_PINK,
+    "comment": Colors.CODE_COMMENT,
+    "number": Colors.CODE_NUMBER,
+    "variable": Colors.CODE_VARIABLE,
+    "decorator": Colors.CODE_YELLOW,
+    "tag": Colors.CODE_BLUE
+}
@@ -0,0 +1,3 @@
+# Grading package
+from .checks import check_tests, passed_tests, grade_submission
+from .client import GradingClient, create_grading_client
@@ -0,0 +1,37 @@
+# Correção de um desafio: os testes do pacote de conteúdo aplicados ao código
+#
+# Usado pelo ChallengeScene (correção local) e pelos processos do servidor de
+# correção da turma, então as duas formas dão sempre o mesmo resultado.
+
+import re
+import time
+
+
+def check_tests(tests, code):
+    """Retorna a mensagem do primeiro teste que falhou (None se todos passaram)"""
+    for test in tests:
+        if test["type"] == "regex":
+            passed = re.search(test["pattern"], code) is not None
+        elif test["type"] == "not_contains":
+            passed = test["pattern"] not in code
+        else:
+            passed = test["pattern"] in code
+        if not passed:
+            return test["message"]
+    return None
+
+
+def passed_tests(tests, code):
+    """Quantos testes o código já passa (progresso na Arena)"""
+    return sum(1 for test in tests if check_tests([test], code) is None)
+
+
+def grade_submission(challenge_id, code):
+    """Executado num processo de correção: (falha ou None, ms de correção)"""
+    # Importado aqui: o processo pai do servidor não precisa do conteúdo
+    from src.utils import content
+
+    start = time.perf_counter()
+    tests = content.challenge(challenge_id).get("tests", [])
+    failure = check_tests(tests, code)
+    return failure, (time.perf_counter() - start) * 1000.0
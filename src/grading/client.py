@@ -0,0 +1,108 @@
+# Cliente do servidor de correção usado pelo jogo dos alunos
+#
+# submit() só enfileira o envio; um thread de fundo mantém a conexão com o
+# servidor, manda o código e espera a resposta. A cena consome os resultados
+# com poll() uma vez por quadro, como faz com a assistente, então o loop do
+# jogo nunca espera pela rede.
+
+import json
+import queue
+import socket
+import threading
+import time
+
+from src.config import GRADING_TIMEOUT
+from src.utils import metrics
+
+# Espera além do tempo de correção do servidor (fila da turma + rede)
+NETWORK_MARGIN = 10.0
+
+
+class GradingRequest:
+    """Envio em andamento"""
+
+    def __init__(self, request_id, challenge_id, code):
+        self.id = request_id
+        self.challenge_id = challenge_id
+        self.code = code
+        self.started = time.perf_counter()
+
+
+class GradingClient:
+    """Envia o código para o servidor da turma sem bloquear o loop do jogo
+
+    poll() devolve (request, resposta, erro): resposta é o dicionário do
+    servidor ({"passou", "falha", ...}). Com erro, resposta é None se a
+    conexão falhou, ou o dicionário do servidor se ele recusou a correção
+    (ex.: tempo esgotado); só no primeiro caso faz sentido corrigir localmente.
+    """
+
+    def __init__(self, address, student=""):
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self.student = student or socket.gethostname()
+        self._next_id = 0
+        self._outgoing = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="grading-client", daemon=True)
+        self._thread.start()
+
+    def submit(self, challenge_id, code):
+        self._next_id += 1
+        request = GradingRequest(self._next_id, challenge_id, code)
+        self._outgoing.put(request)
+        return request
+
+    def poll(self):
+        """Resultados que chegaram desde a última chamada (não bloqueia)"""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def close(self):
+        self._outgoing.put(None)
+
+    def _run(self):
+        """Thread de fundo: uma conexão reaproveitada entre os envios"""
+        connection = None
+        stream = None
+        while True:
+            request = self._outgoing.get()
+            if request is None:
+                break
+            line = json.dumps({"id": request.id, "aluno": self.student,
+                               "desafio": request.challenge_id, "codigo": request.code},
+                              ensure_ascii=False).encode("utf-8") + b"\n"
+            try:
+                if connection is None:
+                    connection = socket.create_connection(self.address, timeout=GRADING_TIMEOUT + NETWORK_MARGIN)
+                    stream = connection.makefile("rb")
+                connection.sendall(line)
+                response = json.loads(stream.readline() or b"null")
+                if response is None:
+                    raise ConnectionError("servidor fechou a conexão")
+            except (OSError, ValueError) as e:
+                print(f"[Grading] Erro ao enviar para {self.address[0]}:{self.address[1]}: {e}")
+                if connection is not None:
+                    connection.close()
+                connection = None
+                self._results.put((request, None, str(e)))
+                continue
+            metrics.record("correcao.resposta_ms", (time.perf_counter() - request.started) * 1000.0)
+            if "erro" in response:
+                self._results.put((request, response, response["erro"]))
+            else:
+                self._results.put((request, response, None))
+        if connection is not None:
+            connection.close()
+
+
+def create_grading_client(address, student=""):
+    """Cliente do servidor configurado (None para correção local)"""
+    if not address:
+        return None
+    print(f"[Grading] Correção pelo servidor da turma: {address}")
+    return GradingClient(address, student)
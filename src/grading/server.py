@@ -0,0 +1,304 @@
+# Servidor de correção da turma (roda na máquina do professor)
+#
+#     python -m src.grading.server --port 8766 --workers 4
+#     CODEFRONTIER_GRADING_SERVER=192.168.0.10:8766 python main.py
+#
+# Protocolo: JSON por linha numa conexão TCP persistente por aluno.
+#   envio:    {"id": 1, "aluno": "Ana", "desafio": "python/...", "codigo": "..."}
+#   resposta: {"id": 1, "passou": true, "falha": null, "correcao_ms": 0.2, "total_ms": 3.1}
+#             {"id": 1, "erro": "..."} quando o envio não pôde ser corrigido
+#
+# A correção roda num pool de processos (um travamento ou regex patológica
+# não derruba o servidor). Cada conexão tem a sua fila de no máximo
+# GRADING_CLIENT_QUEUE envios; cheia, o servidor para de ler aquela conexão
+# e o TCP segura o aluno (backpressure). O despachante atende as filas em
+# rodízio, um envio por aluno por vez: o aluno só volta ao rodízio depois que
+# a resposta do envio anterior foi escrita. Assim um aluno enviando em rajada
+# não atrasa os outros e as respostas saem na ordem dos envios.
+#
+# Com --submissions (ou CODEFRONTIER_GRADING_SUBMISSIONS) cada envio recebido
+# é gravado numa linha JSON do arquivo, para `python -m src.grading.similarity`.
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config import (GRADING_PORT, GRADING_WORKERS, GRADING_CLIENT_QUEUE, GRADING_TIMEOUT,
+                        GRADING_MAX_LINE, GRADING_SUBMISSIONS)
+from .checks import grade_submission
+
+# Memória máxima de um processo de correção (só onde o módulo resource existe)
+WORKER_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+def _limit_worker():
+    """Inicializador dos processos de correção"""
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (WORKER_MEMORY_BYTES, WORKER_MEMORY_BYTES))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class _Client:
+    """Uma conexão de aluno e a sua fila de envios"""
+
+    def __init__(self, writer, max_pending):
+        self.writer = writer
+        self.max_pending = max_pending
+        self.pending = deque()       # (recebido_em, envio)
+        self.space = asyncio.Event()
+        self.space.set()
+        self.scheduled = False       # no rodízio do despachante ou com um envio em correção
+        self.closed = False
+        self.handler = asyncio.current_task()
+
+    def push(self, received, submission):
+        self.pending.append((received, submission))
+        if len(self.pending) >= self.max_pending:
+            self.space.clear()
+
+
+class GradingServer:
+    """Recebe envios por TCP e corrige num pool de processos com fila justa"""
+
+    def __init__(self, host="0.0.0.0", port=GRADING_PORT, workers=GRADING_WORKERS,
+                 client_queue=GRADING_CLIENT_QUEUE, timeout=GRADING_TIMEOUT,
+                 submissions_path=GRADING_SUBMISSIONS):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.client_queue = client_queue
+        self.timeout = timeout
+        self.submissions_path = submissions_path
+        self.graded = 0
+        self.errors = 0
+        self.connections = 0
+        self._pool = None
+        self._server = None
+        self._dispatcher = None
+        self._ready = deque()          # clientes com envios, na ordem do rodízio
+        self._has_work = None
+        self._slots = None
+        self._tasks = set()            # correções em andamento (referência para o GC)
+        self._clients = set()
+        self._log = None
+
+    async def start(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_limit_worker)
+        self._has_work = asyncio.Event()
+        # Só `workers` correções em andamento: o resto espera nas filas por aluno
+        self._slots = asyncio.Semaphore(self.workers)
+        self._server = await asyncio.start_server(self._serve, self.host, self.port,
+                                                  limit=GRADING_MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        if self.submissions_path:
+            # Linha a linha: o arquivo fica legível mesmo com o servidor no ar
+            self._log = open(self.submissions_path, "a", encoding="utf-8", buffering=1)
+        print(f"[Grading] Servidor em {self.host}:{self.port} com {self.workers} processos")
+
+    async def stop(self):
+        self._server.close()
+        # Fecha as conexões e espera cada leitor sair sozinho (EOF)
+        handlers = []
+        for client in list(self._clients):
+            client.closed = True
+            client.space.set()
+            client.writer.close()
+            handlers.append(client.handler)
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._dispatcher.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._log is not None:
+            self._log.close()
+        print(f"[Grading] {self.graded} corrigidos, {self.errors} erros, {self.connections} conexões")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ------------------------------------------------------------------
+    # Conexões
+    # ------------------------------------------------------------------
+    async def _serve(self, reader, writer):
+        client = _Client(writer, self.client_queue)
+        self._clients.add(client)
+        self.connections += 1
+        try:
+            while True:
+                # Fila do aluno cheia: não lê mais nada até abrir espaço
+                await client.space.wait()
+                if client.closed:
+                    break
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self._reply(client, {"erro": "envio maior que o limite"})
+                    break
+                if not line:
+                    break
+                submission = _parse(line)
+                if submission is None:
+                    await self._reply(client, {"erro": "envio inválido"})
+                    continue
+                client.push(time.perf_counter(), submission)
+                if self._log is not None:
+                    self._log.write(json.dumps({"aluno": submission.get("aluno"),
+                                                "desafio": submission["desafio"],
+                                                "codigo": submission["codigo"],
+                                                "em": round(time.time(), 3)},
+                                               ensure_ascii=False) + "\n")
+                if not client.scheduled:
+                    client.scheduled = True
+                    self._ready.append(client)
+                    self._has_work.set()
+        except ConnectionError:
+            pass
+        finally:
+            client.closed = True
+            self._clients.discard(client)
+            writer.close()
+
+    async def _reply(self, client, response):
+        if client.closed:
+            return
+        client.writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        try:
+            await client.writer.drain()
+        except ConnectionError:
+            client.closed = True
+
+    # ------------------------------------------------------------------
+    # Despacho e correção
+    # ------------------------------------------------------------------
+    async def _dispatch(self):
+        """Rodízio entre os alunos com envios, limitado pelos processos livres"""
+        while True:
+            await self._slots.acquire()
+            while not self._ready:
+                self._has_work.clear()
+                await self._has_work.wait()
+            client = self._ready.popleft()
+            received, submission = client.pending.popleft()
+            client.space.set()
+            if client.closed:
+                client.scheduled = False
+                self._slots.release()
+                continue
+            # O aluno fica fora do rodízio até a resposta sair (_grade)
+            task = asyncio.create_task(self._grade(client, received, submission))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _recycle_pool(self, pool):
+        """Troca um pool travado ou quebrado por um novo (uma vez por pool)"""
+        if self._pool is not pool:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_limit_worker)
+        _terminate_pool(pool)
+        print("[Grading] Pool de correção reiniciado")
+
+    async def _grade(self, client, received, submission):
+        loop = asyncio.get_running_loop()
+        response = {"id": submission.get("id")}
+        try:
+            # Duas tentativas: um envio que estava no pool reiniciado por causa
+            # de outro aluno é corrigido de novo no pool novo
+            for attempt in range(2):
+                pool = self._pool
+                try:
+                    failure, grading_ms = await asyncio.wait_for(
+                        loop.run_in_executor(pool, grade_submission,
+                                             submission["desafio"], submission["codigo"]),
+                        self.timeout
+                    )
+                except BrokenProcessPool:
+                    if attempt == 0 and self._pool is not pool:
+                        continue
+                    raise
+                response.update(passou=failure is None, falha=failure, correcao_ms=round(grading_ms, 3))
+                self.graded += 1
+                break
+        except asyncio.TimeoutError:
+            # O processo continuaria preso na correção; com `workers` travados o
+            # pool pararia de vez. Troca o pool e encerra os processos antigos.
+            response["erro"] = "tempo de correção esgotado"
+            self.errors += 1
+            self._recycle_pool(pool)
+        except BrokenProcessPool:
+            response["erro"] = "processo de correção caiu"
+            self.errors += 1
+            self._recycle_pool(pool)
+        except Exception as e:
+            # Erro levantado no processo (desafio desconhecido, regex inválida, memória)
+            response["erro"] = f"{type(e).__name__}: {e}"
+            self.errors += 1
+        finally:
+            self._slots.release()
+        response["total_ms"] = round((time.perf_counter() - received) * 1000.0, 3)
+        try:
+            await self._reply(client, response)
+        finally:
+            self._reschedule(client)
+
+    def _reschedule(self, client):
+        """Depois da resposta: o próximo envio do aluno volta para o fim do rodízio"""
+        if client.pending and not client.closed:
+            self._ready.append(client)
+            self._has_work.set()
+        else:
+            client.scheduled = False
+
+
+def _terminate_pool(pool):
+    """Encerra na hora os processos de um pool descartado"""
+    # ProcessPoolExecutor não expõe os processos; _processes é o dicionário interno
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse(line):
+    """Envio de uma linha do protocolo (None se não for válido)"""
+    try:
+        submission = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(submission, dict):
+        return None
+    if not isinstance(submission.get("desafio"), str) or not isinstance(submission.get("codigo"), str):
+        return None
+    return submission
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de correção da turma")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=GRADING_PORT)
+    parser.add_argument("--workers", type=int, default=GRADING_WORKERS)
+    parser.add_argument("--submissions", default=GRADING_SUBMISSIONS,
+                        help="grava os envios neste arquivo JSONL")
+    args = parser.parse_args()
+
+    server = GradingServer(args.host, args.port, args.workers, submissions_path=args.submissions)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    # Os processos de correção não precisam de janela nem de som
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    main()
@@ -0,0 +1,278 @@
+# Envios parecidos: índice MinHash/LSH para achar soluções copiadas na turma
+#
+#     python -m src.grading.similarity envios.jsonl
+#     python -m src.grading.similarity envios.jsonl --threshold 0.7 --workers 8
+#
+# O arquivo é o gravado por `python -m src.grading.server --submissions
+# envios.jsonl` (uma linha JSON por envio, com "aluno", "desafio" e "codigo").
+#
+# Cada envio vira a sequência de tokens do analisador léxico da linguagem com
+# os nomes trocados por marcadores (renomear variáveis não disfarça a cópia) e
+# sem comentários. As janelas de SIMILARITY_SHINGLE tokens (shingles) que já
+# estão no código inicial do desafio são descartadas: sobra só o que o aluno
+# escreveu. A assinatura MinHash resume esse conjunto em
+# SIMILARITY_PERMUTATIONS números, e a fração de posições iguais entre duas
+# assinaturas estima a similaridade de Jaccard entre os conjuntos.
+#
+# O LSH divide a assinatura em SIMILARITY_BANDS faixas; envios com alguma faixa
+# idêntica caem no mesmo balde. Só os pares que dividem balde são comparados,
+# então achar os parecidos com um envio não percorre a turma inteira.
+
+import argparse
+import json
+import os
+import random
+import re
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.config import (SIMILARITY_PERMUTATIONS, SIMILARITY_BANDS, SIMILARITY_SHINGLE,
+                        SIMILARITY_THRESHOLD)
+from src.utils.lexer import tokenize
+
+# Primo de Mersenne usado nas permutações (a * x + b) % _PRIME
+_PRIME = (1 << 61) - 1
+
+# Palavras e símbolos dentro de um span (o analisador une tokens vizinhos do mesmo tipo)
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+# Marcadores que substituem o texto de cada tipo de token
+_MARKERS = {
+    "text": "V",        # identificadores (os símbolos ficam como estão)
+    "variable": "V",
+    "function": "F",
+    "string": "S",
+    "number": "N",
+    "decorator": "D",
+}
+_KEEP = ("keyword", "control", "type", "tag")
+
+
+def normalize_tokens(code, language):
+    """Tokens do código com nomes, textos e números trocados por marcadores"""
+    tokens = []
+    for line, spans in zip(code.split("\n"), tokenize(code, language)):
+        for start, end, kind in spans:
+            if kind == "comment":
+                continue
+            text = line[start:end]
+            if kind in ("string", "number", "decorator"):
+                if text.strip():
+                    tokens.append(_MARKERS[kind])
+                continue
+            marker = _MARKERS.get(kind)
+            for piece in _PIECE.findall(text):
+                if kind in _KEEP or not (piece[0].isalpha() or piece[0] == "_"):
+                    tokens.append(piece)
+                else:
+                    tokens.append(marker or piece)
+    return tokens
+
+
+def shingles(tokens, size=SIMILARITY_SHINGLE):
+    """Conjunto de hashes (32 bits) das janelas de `size` tokens"""
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+            for i in range(len(tokens) - size + 1)}
+
+
+def permutations(count=SIMILARITY_PERMUTATIONS, seed=1):
+    """Coeficientes (a, b) das permutações; a mesma semente dá assinaturas comparáveis"""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(count)]
+
+
+def minhash(hashes, params):
+    """Assinatura MinHash de um conjunto de hashes (None se o conjunto for vazio)"""
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in params)
+
+
+def _signature(code, language, size, boilerplate, params):
+    """Assinatura de um envio (também é o trabalho dos processos do modo em lote)"""
+    return minhash(shingles(normalize_tokens(code, language), size) - boilerplate, params)
+
+
+class SimilarityIndex:
+    """Índice LSH das assinaturas MinHash dos envios de um desafio"""
+
+    def __init__(self, language, starter_code="", permutations_count=SIMILARITY_PERMUTATIONS,
+                 bands=SIMILARITY_BANDS, shingle=SIMILARITY_SHINGLE, seed=1):
+        if permutations_count % bands:
+            raise ValueError("SIMILARITY_PERMUTATIONS precisa ser múltiplo de SIMILARITY_BANDS")
+        self.language = language
+        self.shingle = shingle
+        self.bands = bands
+        self.rows = permutations_count // bands
+        self.params = permutations(permutations_count, seed)
+        # Shingles do código inicial não contam: todo envio começa com eles
+        self.boilerplate = frozenset(shingles(normalize_tokens(starter_code, language), shingle))
+        self.signatures = {}                  # id -> assinatura
+        self.skipped = 0                      # envios sem nada além do código inicial
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, code):
+        return _signature(code, self.language, self.shingle, self.boilerplate, self.params)
+
+    def add(self, submission_id, code):
+        """Insere um envio; retorna os parecidos que já estavam no índice"""
+        return self.add_signature(submission_id, self.signature(code))
+
+    def add_signature(self, submission_id, signature, threshold=SIMILARITY_THRESHOLD):
+        if signature is None:
+            self.skipped += 1
+            return []
+        if submission_id in self.signatures:
+            raise ValueError(f"envio repetido no índice: {submission_id}")
+        matches = self.query_signature(signature, threshold)
+        self.signatures[submission_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band][key].append(submission_id)
+        return matches
+
+    def add_many(self, submissions, workers=None, threshold=SIMILARITY_THRESHOLD):
+        """Modo em lote: assinaturas em todos os núcleos, inserção em ordem
+
+        Args:
+            submissions: lista de (id, código)
+        Returns:
+            Lista de pares (id_a, id_b, similaridade) entre os envios inseridos
+            e os que já estavam no índice.
+        """
+        signatures = compute_signatures([code for _, code in submissions], self.language,
+                                        self.shingle, self.boilerplate, self.params, workers)
+        pairs = []
+        for (submission_id, _), signature in zip(submissions, signatures):
+            for other, similarity in self.add_signature(submission_id, signature, threshold):
+                pairs.append((other, submission_id, similarity))
+        return pairs
+
+    def query(self, code, threshold=SIMILARITY_THRESHOLD):
+        """Envios do índice parecidos com o código: [(id, similaridade)], mais parecido primeiro"""
+        signature = self.signature(code)
+        return [] if signature is None else self.query_signature(signature, threshold)
+
+    def query_signature(self, signature, threshold=SIMILARITY_THRESHOLD):
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        matches = []
+        for candidate in candidates:
+            similarity = self.similarity(signature, self.signatures[candidate])
+            if similarity >= threshold:
+                matches.append((candidate, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def pairs(self, threshold=SIMILARITY_THRESHOLD):
+        """Todos os pares parecidos, comparando só quem divide algum balde"""
+        seen = set()
+        result = []
+        for buckets in self._buckets:
+            for members in buckets.values():
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if (a, b) in seen:
+                            continue
+                        seen.add((a, b))
+                        similarity = self.similarity(self.signatures[a], self.signatures[b])
+                        if similarity >= threshold:
+                            result.append((a, b, similarity))
+        result.sort(key=lambda pair: -pair[2])
+        return result
+
+    @staticmethod
+    def similarity(a, b):
+        """Estimativa da similaridade de Jaccard pela fração de posições iguais"""
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[i:i + rows] for i in range(0, len(signature), rows)]
+
+
+def compute_signatures(codes, language, shingle, boilerplate, params, workers=None):
+    """Assinaturas de vários envios em paralelo (workers=1 roda no próprio processo)"""
+    job = partial(_signature, language=language, size=shingle, boilerplate=boilerplate, params=params)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(codes) < 2 * workers:
+        return [job(code) for code in codes]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(job, codes, chunksize=max(1, len(codes) // (workers * 4))))
+
+
+def index_class(submissions, workers=None, threshold=SIMILARITY_THRESHOLD):
+    """Agrupa os envios por desafio e indexa cada grupo em lote
+
+    Args:
+        submissions: dicts com "aluno", "desafio" e "codigo" (formato do servidor)
+    Returns:
+        {desafio: (índice, pares parecidos entre alunos diferentes)}
+    """
+    # Importado aqui: quem só usa o índice não precisa do pacote de conteúdo
+    from src.utils import content
+
+    by_challenge = defaultdict(list)
+    for number, submission in enumerate(submissions):
+        by_challenge[submission["desafio"]].append((number, submission))
+
+    result = {}
+    for challenge_id, group in by_challenge.items():
+        try:
+            starter = content.challenge(challenge_id)["code"]
+        except (KeyError, OSError, ValueError):
+            starter = ""
+        index = SimilarityIndex(challenge_id.split("/", 1)[0], starter)
+        pairs = index.add_many([(number, submission["codigo"]) for number, submission in group],
+                               workers, threshold)
+        students = dict(group)
+        # Reenvios do mesmo aluno não são cópia
+        pairs = [(a, b, similarity) for a, b, similarity in pairs
+                 if students[a].get("aluno") != students[b].get("aluno")]
+        result[challenge_id] = (index, [(students[a], students[b], similarity)
+                                        for a, b, similarity in pairs])
+    return result
+
+
+def _read_submissions(path):
+    submissions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                submission = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(submission, dict) and "desafio" in submission and "codigo" in submission:
+                submissions.append(submission)
+    return submissions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envios parecidos entre alunos")
+    parser.add_argument("path", help="envios.jsonl gravado pelo servidor de correção")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument("--workers", type=int, default=0, help="processos (0 = todos os núcleos)")
+    args = parser.parse_args()
+
+    submissions = _read_submissions(args.path)
+    print(f"[Similarity] {len(submissions)} envios")
+    for challenge_id, (index, pairs) in sorted(index_class(submissions, args.workers or None,
+                                                           args.threshold).items()):
+        print(f"\n{challenge_id}: {len(index)} envios indexados, "
+              f"{index.skipped} iguais ao código inicial, {len(pairs)} pares parecidos")
+        for a, b, similarity in pairs:
+            print(f"  {similarity:5.0%}  {a.get('aluno', '?')}  ~  {b.get('aluno', '?')}")
+
+
+if __name__ == "__main__":
+    # Os processos não precisam de janela nem de som
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    main()
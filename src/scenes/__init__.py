@@ -1,6 +1,14 @@
 # Scenes package
+#
+# As classes das cenas são importadas só quando usadas (ver registry.py)
 from .base_scene import Scene
-from .main_menu import MainMenuScene
-from .village_hub import VillageHubScene
-from .challenge_scene import ChallengeScene
-from .lesson_scene import LessonScene
+from .loading_scene import LoadingScene
+from .scene_cache import SceneCache
+from .registry import SceneRegistry, SCENES, scene_class
+
+
+def __getattr__(name):
+    for scene_name, (_, class_name) in SCENES.items():
+        if class_name == name:
+            return scene_class(scene_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
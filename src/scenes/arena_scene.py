@@ -0,0 +1,200 @@
+# Cena da Arena: corrida em tempo real no mesmo desafio
+
+import socket
+import time
+import pygame
+from .base_scene import Scene
+from src.config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT, ARENA_SERVER
+from src.ui import Button, CodeEditor
+from src.utils import analytics, assets, content
+from src.grading import check_tests, passed_tests
+from src.arena import ArenaClient
+
+# Servidor iniciado pelo jogo quando não há CODEFRONTIER_ARENA_SERVER (um por sessão)
+_local_server = None
+# Endereço de CODEFRONTIER_ARENA_SERVER já resolvido (o DNS só é consultado uma vez)
+_remote_address = None
+
+# Pistas desenhadas (os primeiros colocados e o próprio jogador)
+MAX_LANES = 10
+
+
+def _server_address():
+    """(ip, porta) do servidor da Arena; levanta OSError se não houver servidor"""
+    global _local_server, _remote_address
+    if ARENA_SERVER:
+        if _remote_address is None:
+            host, _, port = ARENA_SERVER.rpartition(":")
+            _remote_address = (socket.gethostbyname(host or "127.0.0.1"), int(port))
+        return _remote_address
+    if _local_server is None:
+        from src.arena.server import start_local_server
+        _local_server = start_local_server()
+    return _local_server[1]
+
+
+class ArenaScene(Scene):
+    """Jogadores escrevem o mesmo desafio; a pista mostra o progresso de cada um"""
+
+    MUSIC = "challenge_theme"
+
+    def __init__(self, game):
+        super().__init__(game)
+
+        # Pista à esquerda, editor à direita
+        self.track_area = pygame.Rect(30, 100, SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT - 200)
+        self.code_editor = CodeEditor(
+            SCREEN_WIDTH // 2 + 20, 80,
+            SCREEN_WIDTH // 2 - 40, SCREEN_HEIGHT - 220
+        )
+        self.code_editor.set_code("")
+        self.back_button = Button(20, 20, 140, 40, "VOLTAR", font_size="small")
+        self.run_button = Button(
+            SCREEN_WIDTH // 2 + 30, SCREEN_HEIGHT - 120,
+            220, 45, "EXECUTAR", Colors.GREEN, (80, 220, 80), font_size="small"
+        )
+
+        self.client = None
+        self.challenge_id = None
+        self.challenge_data = None
+        self.tests = 0
+        self.started = 0.0
+        self.finished_ms = 0
+        self.message = ""
+
+    def on_enter(self):
+        """Conecta ao servidor da Arena (o desafio chega nas boas-vindas)"""
+        name = self.game.student or socket.gethostname()
+        self.challenge_id = None
+        self.challenge_data = None
+        self.tests = 0
+        self.finished_ms = 0
+        try:
+            self.client = ArenaClient(_server_address(), name)
+        except (OSError, ValueError) as e:
+            print(f"[Arena] Servidor indisponível: {e}")
+            self.client = None
+            self.message = "Não foi possível conectar à Arena."
+            return
+        self.message = "Conectando à Arena..."
+
+    def on_exit(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def handle_event(self, event):
+        """Processa eventos"""
+        self.code_editor.handle_event(event)
+
+        if self.back_button.is_clicked(event):
+            self.next_scene = "village"
+
+        if self.run_button.is_clicked(event) and self.challenge_data and not self.finished_ms:
+            self._run_code()
+
+    def _run_code(self):
+        """Conta os testes que passam; todos passando termina a corrida"""
+        tests = self.challenge_data.get("tests", [])
+        code = self.code_editor.get_code()
+        self.tests = passed_tests(tests, code)
+        failure = check_tests(tests, code)
+        if failure is None:
+            self.finished_ms = int((time.perf_counter() - self.started) * 1000)
+            self.message = f"Concluído em {self.finished_ms / 1000:.1f} s!"
+        else:
+            self.message = f"{self.tests}/{len(tests)} testes. {failure}"
+        analytics.emit("arena", desafio=self.challenge_id, testes=self.tests,
+                       concluido_ms=self.finished_ms)
+
+    def update(self, dt):
+        """Atualiza a cena"""
+        mouse_pos = pygame.mouse.get_pos()
+        mouse_pressed = pygame.mouse.get_pressed()
+        self.back_button.update(mouse_pos, mouse_pressed)
+        self.run_button.update(mouse_pos, mouse_pressed)
+        self.code_editor.update(dt)
+
+        if self.client is None:
+            return
+        if self.client.timed_out:
+            print(f"[Arena] Sem resposta do servidor em {self.client.address}")
+            self.message = "Não foi possível conectar à Arena."
+            self.client.close()
+            self.client = None
+            return
+        if self.client.full:
+            self.message = "A Arena está cheia. Tente mais tarde!"
+        elif self.client.connected and self.challenge_data is None:
+            # Boas-vindas recebidas: o servidor escolheu o desafio da corrida
+            self.challenge_id = self.client.challenge_id
+            try:
+                self.challenge_data = content.challenge(self.challenge_id)
+            except KeyError:
+                # Servidor com conteúdo diferente deste jogo
+                print(f"[Arena] Desafio desconhecido: {self.challenge_id}")
+                self.message = "Esta versão do jogo não tem o desafio da Arena."
+                self.client.close()
+                self.client = None
+                return
+            self.code_editor.set_code(self.challenge_data["code"], language=self.challenge_id.split("/", 1)[0])
+            self.started = time.perf_counter()
+            self.message = self.challenge_data["objective"]
+        self.client.set_progress(self.tests, len(self.code_editor.get_code()), self.finished_ms)
+        self.client.update()
+
+    def draw(self, screen, alpha=1.0):
+        """Desenha a cena"""
+        screen.fill(Colors.SPACE_DARK)
+
+        font = assets.get_font("medium")
+        small = assets.get_font("small")
+        title = assets.get_font("large").render("ARENA", True, Colors.GOLD)
+        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 4, 45)))
+
+        self._draw_track(screen, small)
+
+        # Editor e resultado
+        self.code_editor.draw(screen, font)
+        self.run_button.draw(screen, font)
+        self.back_button.draw(screen, font)
+        if self.message:
+            text = small.render(self.message[:70], True, Colors.TEXT_LIGHT)
+            screen.blit(text, (SCREEN_WIDTH // 2 + 270, SCREEN_HEIGHT - 108))
+
+    def _draw_track(self, screen, font):
+        """Uma pista por jogador, com a posição interpolada entre os snapshots"""
+        pygame.draw.rect(screen, Colors.SPACE_PURPLE, self.track_area, border_radius=10)
+        if self.client is None or not self.client.connected:
+            return
+        total = max(1, len(self.challenge_data.get("tests", []))) if self.challenge_data else 1
+        positions = self.client.positions()
+
+        # Quem terminou primeiro, depois quem está mais adiantado
+        def rank(item):
+            tests, chars, finished_ms = item[1]
+            return (0, finished_ms) if finished_ms else (1, -tests, -chars)
+        ordered = sorted(positions.items(), key=rank)
+        lanes = ordered[:MAX_LANES]
+        own = self.client.player_id
+        if own in positions and all(player_id != own for player_id, _ in lanes):
+            lanes[-1] = (own, positions[own])
+
+        lane_height = self.track_area.height // MAX_LANES
+        start_x = self.track_area.x + 150
+        finish_x = self.track_area.right - 30
+        pygame.draw.line(screen, Colors.GOLD, (finish_x, self.track_area.y + 8),
+                         (finish_x, self.track_area.bottom - 8), 3)
+        for index, (player_id, (tests, chars, finished_ms)) in enumerate(lanes):
+            y = self.track_area.y + index * lane_height + lane_height // 2
+            color = Colors.GOLD if player_id == own else Colors.TEXT_LIGHT
+            name = font.render(self.client.names.get(player_id, "?")[:14], True, color)
+            screen.blit(name, (self.track_area.x + 12, y - name.get_height() // 2))
+            pygame.draw.line(screen, (70, 50, 95), (start_x, y), (finish_x, y), 2)
+
+            progress = 1.0 if finished_ms else min(tests, total) / total
+            x = start_x + int((finish_x - start_x) * progress)
+            pygame.draw.circle(screen, Colors.GREEN if finished_ms else color, (x, y), 10)
+            if finished_ms:
+                time_text = font.render(f"{finished_ms / 1000:.1f}s", True, Colors.GREEN)
+                screen.blit(time_text, (finish_x - time_text.get_width() - 16, y - 22))
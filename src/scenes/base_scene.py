@@ -6,6 +6,12 @@ from abc import ABC, abstractmethod
 class Scene(ABC):
     """Classe base abstrata para todas as cenas"""
     
+    # Pacotes de assets (assets/data/bundles.json) mantidos enquanto a cena está ativa
+    BUNDLES = ()
+    
+    # Música (assets/sounds/music/<nome>) tocada enquanto a cena está ativa
+    MUSIC = None
+    
     def __init__(self, game):
         self.game = game
         self.next_scene = None
@@ -21,8 +27,12 @@ class Scene(ABC):
         pass
         
     @abstractmethod
-    def draw(self, screen):
-        """Desenha a cena na tela"""
+    def draw(self, screen, alpha=1.0):
+        """Desenha a cena na tela
+        
+        `alpha` (0 a 1) é a fração do passo de simulação já decorrida desde o
+        último update(), para interpolar animações (ver utils/timing.py).
+        """
         pass
         
     def on_enter(self):
@@ -32,3 +42,19 @@ class Scene(ABC):
     def on_exit(self):
         """Chamado quando a cena é desativada"""
         pass
+        
+    def reset(self):
+        """Chamado quando uma instância guardada no SceneCache é reaproveitada"""
+        pass
+        
+    def prewarm_targets(self):
+        """Cenas prováveis a seguir, construídas em quadros ociosos: [(nome, parâmetros)]"""
+        return ()
+        
+    def warm(self, surface):
+        """Pré-aquece caches de desenho numa superfície fora da tela
+        
+        Roda antes de os pacotes da cena estarem carregados, então não deve
+        pedir imagens dos pacotes.
+        """
+        pass
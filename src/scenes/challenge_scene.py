@@ -1,14 +1,21 @@
 # Cena de desafio/fase de programação
 
+import time
 import pygame
 from .base_scene import Scene
-from src.config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT
+from src.config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT, CHALLENGE_XP
 from src.ui import Button, CodeEditor, ChatBox, HealthBar
-from src.utils import assets
+from src.utils import analytics, assets, content, AnimatedValue
+from src.grading import check_tests
 
 class ChallengeScene(Scene):
     """Cena de desafio de programação com editor de código"""
     
+    BUNDLES = ("challenge",)
+    MUSIC = "challenge_theme"
+    
+    GREETING = "Caso esteja com dúvida em alguma coisa ou travado em alguma parte do código, basta me perguntar!"
+    
     def __init__(self, game, module_id="csharp"):
         super().__init__(game)
         self.module_id = module_id
@@ -23,16 +30,17 @@ class ChallengeScene(Scene):
             SCREEN_WIDTH // 2 - 40, SCREEN_HEIGHT // 2 - 50
         )
         
-        # Código de exemplo baseado nas imagens
-        example_code = self._get_example_code(module_id)
-        self.code_editor.set_code(example_code)
+        # Desafio carregado do pacote de conteúdo do módulo
+        self.challenge_id = content.first_challenge(module_id)
+        self.challenge_data = content.challenge(self.challenge_id)
+        self.code_editor.set_code(self.challenge_data["code"], language=module_id)
         
         # Chat box para assistente IA
         self.chat_box = ChatBox(
             SCREEN_WIDTH // 2 + 20, SCREEN_HEIGHT - 180,
             SCREEN_WIDTH // 2 - 40, 160
         )
-        self.chat_box.add_message("Caso esteja com dúvida em alguma coisa ou travado em alguma parte do código, basta me perguntar!")
+        self.chat_box.add_message(self.GREETING)
         
         # Barra de vida
         self.health_bar = HealthBar(SCREEN_WIDTH - 200, 20, 5)
@@ -49,106 +57,29 @@ class ChallengeScene(Scene):
         )
         
         # Estado do desafio
-        self.challenge_data = self._get_challenge_data(module_id)
         self.player_input = ""
         self.show_result = False
         self.result_correct = False
+        self.started = time.perf_counter()
         
-        # Animação da cena visual
+        # Animação da cena visual (animation_time é o valor interpolado do desenho)
+        self.animation_clock = AnimatedValue()
         self.animation_time = 0
         self.fruits_collected = 0
         
-    def _get_example_code(self, module_id):
-        """Retorna código de exemplo baseado no módulo"""
-        codes = {
-            "csharp": """using x.y;
-using x.y.z;
-
-private class GetMangos : MonoBehaviour {
-
-    private void SpawnMango(5);
-    
-    // Digite o código a partir daqui
-    
-    private void Awake() {
-        // ...
-    }
-}""",
-            "python": """# Loops Mágicos com Python
-
-def colher_frutas(quantidade):
-    frutas = []
-    
-    # Digite o código a partir daqui
-    for i in range(quantidade):
-        frutas.append(f"fruta_{i}")
-    
-    return frutas
-
-# Teste sua função
-resultado = colher_frutas(5)
-print(resultado)""",
-            "php": """<?php
-// Desafios Arcanos com PHP
-
-class Mago {
-    private $poder;
-    private $mana;
-    
-    // Digite o código a partir daqui
-    
-    public function lancarFeitico($nome) {
-        // ...
-    }
-}
-?>""",
-            "javascript": """import x from 'y';
-import z from 'y';
-
-// Aprimorando Recursos com JavaScript
-
-class ForjaDeItens {
-    constructor() {
-        this.recursos = [];
-    }
-    
-    // Digite o código a partir daqui
-    
-    criarItem(nome, materiais) {
-        // ...
-    }
-}"""
-        }
-        return codes.get(module_id, codes["csharp"])
-        
-    def _get_challenge_data(self, module_id):
-        """Retorna dados do desafio"""
-        challenges = {
-            "csharp": {
-                "title": "Ajude Kayan a cuidar do pomar e coletar seus frutos",
-                "hint": "Obs: Lembre-se que estudamos recentemente o que função X e Y faziam...",
-                "objective": "Chame a função SpawnMango dentro do método Awake"
-            },
-            "python": {
-                "title": "Complete o loop mágico para colher todas as frutas",
-                "hint": "Use um loop for com range() para iterar sobre a quantidade",
-                "objective": "Complete a função colher_frutas"
-            },
-            "php": {
-                "title": "Implemente o método lancarFeitico do Mago",
-                "hint": "O método deve verificar se há mana suficiente",
-                "objective": "Complete a classe Mago"
-            },
-            "javascript": {
-                "title": "Crie o sistema de forja de itens",
-                "hint": "Use arrays para armazenar os materiais necessários",
-                "objective": "Implemente o método criarItem"
-            }
-        }
-        return challenges.get(module_id, challenges["csharp"])
+        # Pergunta em andamento para a assistente e a mensagem que recebe a resposta
+        self.assistant_request = None
+        self.assistant_message = None
+        
+        # Envio em andamento para o servidor de correção da turma
+        self.grading_request = None
+        self.grading_message = None
         
     def handle_event(self, event):
         """Processa eventos"""
+        self.code_editor.handle_event(event)
+        self.chat_box.handle_event(event)
+        
         if self.back_button.is_clicked(event):
             self.next_scene = "menu"
             
@@ -156,6 +87,7 @@ class ForjaDeItens {
             self._run_code()
             
         if self.hint_button.is_clicked(event):
+            analytics.emit("dica", desafio=self.challenge_id)
             self.chat_box.add_message(self.challenge_data["hint"])
             
         # Input de texto no chat
@@ -163,10 +95,8 @@ class ForjaDeItens {
             if self.chat_box.is_active:
                 if event.key == pygame.K_RETURN:
                     if self.chat_box.input_text:
-                        self.chat_box.add_message(self.chat_box.input_text, is_ai=False)
+                        self._ask_assistant(self.chat_box.input_text)
                         self.chat_box.input_text = ""
-                        # Resposta da IA (placeholder)
-                        self.chat_box.add_message("Boa pergunta! Vou te ajudar com isso...")
                 elif event.key == pygame.K_BACKSPACE:
                     self.chat_box.input_text = self.chat_box.input_text[:-1]
                 else:
@@ -175,31 +105,148 @@ class ForjaDeItens {
         if event.type == pygame.MOUSEBUTTONDOWN:
             self.chat_box.is_active = self.chat_box.input_rect.collidepoint(event.pos)
             
+    def _ask_assistant(self, question):
+        """Envia a pergunta para a assistente; a resposta chega em update()"""
+        analytics.emit("pergunta", desafio=self.challenge_id, pergunta=question)
+        self.chat_box.add_message(question, is_ai=False)
+        self.assistant_message = self.chat_box.add_message("CinthIA está digitando...")
+        self.assistant_request = self.game.assistant.ask(question, {
+            "module": self.module_id,
+            "challenge": self.challenge_data["title"],
+            "objective": self.challenge_data["objective"],
+            "hint": self.challenge_data["hint"],
+            "code": self.code_editor.get_code()
+        })
+        
+    def _update_assistant(self):
+        """Aplica na mensagem do chat os pedaços de resposta que já chegaram"""
+        for request, kind, data in self.game.assistant.poll():
+            if request is not self.assistant_request:
+                continue
+            if kind == "token":
+                self.chat_box.update_message(self.assistant_message, request.text)
+            elif kind == "error":
+                self.chat_box.update_message(
+                    self.assistant_message,
+                    "Desculpe, não consegui responder agora. Tente novamente!"
+                )
+            if kind != "token":
+                self.assistant_request = None
+                
+    def on_enter(self):
+        """Começa a contar o tempo da tentativa"""
+        self.started = time.perf_counter()
+        
+    def on_exit(self):
+        """Cancela a pergunta em andamento ao sair da cena"""
+        if self.assistant_request is not None:
+            self.game.assistant.cancel()
+            self.chat_box.update_message(self.assistant_message, "(pergunta cancelada)")
+            self.assistant_request = None
+            
+    def reset(self):
+        """Recomeça o desafio reaproveitando editor, chat e caches já construídos"""
+        if self.code_editor.get_code() != self.challenge_data["code"]:
+            self.code_editor.set_code(self.challenge_data["code"])
+        self.code_editor.is_active = False
+        self.chat_box.clear()
+        self.chat_box.add_message(self.GREETING)
+        self.player_input = ""
+        self.show_result = False
+        self.result_correct = False
+        self.animation_clock.reset()
+        self.fruits_collected = 0
+        self.assistant_request = None
+        self.assistant_message = None
+        self.grading_request = None
+        self.grading_message = None
+        self.next_scene = None
+        
+    def warm(self, surface):
+        """Renderiza editor, botões e chat uma vez (sem o fundo do pacote)"""
+        font = assets.get_font("medium")
+        self.code_editor.draw(surface, font)
+        self.run_button.draw(surface, font)
+        self.hint_button.draw(surface, font)
+        self.chat_box.draw(surface, font)
+            
     def update(self, dt):
         """Atualiza a cena"""
+        self._update_assistant()
+        self._update_grading()
+        
         mouse_pos = pygame.mouse.get_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
         self.back_button.update(mouse_pos, mouse_pressed)
         self.run_button.update(mouse_pos, mouse_pressed)
         self.hint_button.update(mouse_pos, mouse_pressed)
+        self.code_editor.update(dt)
         
-        self.animation_time += dt
+        self.animation_clock.advance(dt)
         
     def _run_code(self):
-        """Simula execução do código"""
+        """Confere o código com os testes do desafio (no servidor da turma, se houver)"""
+        code = self.code_editor.get_code()
+        if self.game.grader is None:
+            self._finish_attempt(check_tests(self.challenge_data.get("tests", []), code))
+        elif self.grading_request is None:
+            self.grading_request = self.game.grader.submit(self.challenge_id, code)
+            self.grading_message = self.chat_box.add_message("Enviando o código para correção...")
+            
+    def _update_grading(self):
+        """Recebe o resultado do servidor de correção (chamado a cada quadro)"""
+        if self.game.grader is None:
+            return
+        for request, response, error in self.game.grader.poll():
+            if request is not self.grading_request:
+                continue
+            self.grading_request = None
+            if error is None:
+                self.chat_box.update_message(self.grading_message, "Código corrigido pelo servidor da turma.")
+                self._finish_attempt(response["falha"])
+            elif response is not None:
+                # O servidor recebeu e recusou (ex.: tempo esgotado): corrigir aqui
+                # repetiria o mesmo código problemático no thread do jogo
+                self.chat_box.update_message(self.grading_message, f"O servidor não corrigiu o código: {error}")
+            else:
+                # Servidor fora do ar: corrige aqui mesmo para o aluno não ficar parado
+                self.chat_box.update_message(self.grading_message, "Servidor de correção indisponível; corrigindo aqui.")
+                self._finish_attempt(check_tests(self.challenge_data.get("tests", []), request.code))
+            
+    def _finish_attempt(self, failure):
+        """Mostra e registra o resultado de uma tentativa"""
         self.show_result = True
-        self.result_correct = True  # Placeholder - sempre sucesso por enquanto
-        self.fruits_collected = 5
-        self.chat_box.add_message("🎉 Parabéns! Código executado com sucesso!")
-        
-    def draw(self, screen):
+        self.result_correct = failure is None
+        duration_ms = (time.perf_counter() - self.started) * 1000.0
+        analytics.emit("tentativa", desafio=self.challenge_id, passou=self.result_correct,
+                       duracao_ms=round(duration_ms), falha=failure)
+        if self.game.profiles:
+            self.game.profiles.record_attempt(self.game.student_id, self.module_id, self.challenge_id,
+                                              self.result_correct, duration_ms)
+        if self.result_correct:
+            self.fruits_collected = 5
+            self.chat_box.add_message("🎉 Parabéns! Código executado com sucesso!")
+            self._save_progress()
+        else:
+            self.chat_box.add_message(f"Quase lá! {failure}")
+            
+    def _save_progress(self):
+        """Registra o módulo concluído (XP só na primeira vez)"""
+        save = self.game.save
+        if self.module_id not in save.data["completed_modules"]:
+            save.append("completed_modules", self.module_id)
+            save.add("xp", CHALLENGE_XP)
+        save.set("current_module", self.module_id)
+
+    def draw(self, screen, alpha=1.0):
         """Desenha a cena"""
+        self.animation_time = self.animation_clock.at(alpha)
+        
         # Fundo da tela inteira
-        bg = assets.get_image("challenge_bg")
+        bg = assets.get_image("challenge_bg", (SCREEN_WIDTH, SCREEN_HEIGHT))
         if bg:
-            bg_scaled = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(bg_scaled, (0, 0))
+            screen.blit(bg, (0, 0))
         else:
             screen.fill((135, 206, 235))  # Fallback: céu azul
         
@@ -287,11 +334,10 @@ class ForjaDeItens {
         char1_y = SCREEN_HEIGHT - 180
         bounce = math.sin(self.animation_time * 3) * 5
         
-        kayan = assets.get_image("npc_kayan")
+        # Aumentado para 120x120
+        kayan = assets.get_image("npc_kayan", (120, 120))
         if kayan:
-            # Aumentado para 120x120
-            kayan_scaled = pygame.transform.scale(kayan, (120, 120))
-            screen.blit(kayan_scaled, (char1_x, char1_y + bounce))
+            screen.blit(kayan, (char1_x, char1_y + bounce))
         else:
             # Fallback (Corpo Vermelho)
             pygame.draw.rect(screen, (200, 50, 50), (char1_x, char1_y + bounce, 50, 70))
@@ -3,17 +3,13 @@
 import pygame
 from .base_scene import Scene
 from src.config import SCREEN_WIDTH, SCREEN_HEIGHT, Colors
-from src.utils import assets
+from src.utils import assets, content
 from src.ui import Button
 
 class LessonScene(Scene):
     """Cena estática que exibe a imagem de lição do módulo selecionado"""
     
-    # Mapeamento de módulos para imagens de lição
-    LESSON_IMAGES = {
-        "python": "lesson",
-        "csharp": "lesson_plants"
-    }
+    BUNDLES = ("lesson",)
     
     def __init__(self, game):
         super().__init__(game)
@@ -37,7 +33,8 @@ class LessonScene(Scene):
         menu_scene = self.game.scenes.get("menu")
         if menu_scene and hasattr(menu_scene, 'selected_module'):
             module = menu_scene.selected_module
-            self.lesson_image_key = self.LESSON_IMAGES.get(module, "lesson")
+            module_data = content.module(module) or {}
+            self.lesson_image_key = module_data.get("lesson_image", "lesson")
         
         pygame.display.set_mode(self.lesson_size)
         
@@ -63,7 +60,7 @@ class LessonScene(Scene):
         mouse_pressed = pygame.mouse.get_pressed()
         self.back_button.update(mouse_pos, mouse_pressed)
         
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         """Desenha a imagem de lição"""
         # Pegar a surface atual (pode ter mudado de tamanho)
         current_screen = pygame.display.get_surface()
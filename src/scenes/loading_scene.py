@@ -0,0 +1,43 @@
+# Tela de carregamento exibida enquanto os assets da próxima cena chegam
+
+import pygame
+from .base_scene import Scene
+from src.config import Colors
+from src.utils import assets
+
+class LoadingScene(Scene):
+    """Mostra o progresso do LoadJob da cena que está sendo aberta"""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.job = None
+        self.elapsed = 0
+
+    def start(self, job):
+        self.job = job
+        self.elapsed = 0
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        self.elapsed += dt
+
+    def draw(self, screen, alpha=1.0):
+        screen.fill(Colors.SPACE_DARK)
+        width, height = screen.get_size()
+
+        font = assets.get_font("medium")
+        dots = "." * (int(self.elapsed * 3) % 3 + 1)
+        text = font.render(f"Carregando{dots}", True, Colors.TEXT_LIGHT)
+        screen.blit(text, (width // 2 - 90, height // 2 - 50))
+
+        # Barra de progresso
+        bar = pygame.Rect(width // 2 - 200, height // 2, 400, 16)
+        progress = self.job.progress if self.job else 0
+        pygame.draw.rect(screen, Colors.SPACE_PURPLE, bar, border_radius=8)
+        if progress > 0:
+            filled = bar.copy()
+            filled.width = max(16, int(bar.width * progress))
+            pygame.draw.rect(screen, Colors.GOLD, filled, border_radius=8)
+        pygame.draw.rect(screen, Colors.TEXT_LIGHT, bar, 2, border_radius=8)
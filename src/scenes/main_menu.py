@@ -4,13 +4,22 @@ import pygame
 import math
 import random
 from .base_scene import Scene
-from src.config import Colors, MODULES, SCREEN_WIDTH, SCREEN_HEIGHT
+from src.config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT
 from src.ui import Button, ModuleCard, HealthBar
-from src.utils import assets
+from src.utils import assets, content, AnimatedValue
+
+
+def _icon_name(card):
+    """Imagem do ícone do módulo (campo "icon" do index.json de conteúdo)"""
+    return card.module_data.get("icon") or f"{card.module_id}_icon"
+
 
 class MainMenuScene(Scene):
     """Cena do menu principal com seleção de módulos"""
     
+    BUNDLES = ("menu",)
+    MUSIC = "menu_theme"
+    
     def __init__(self, game):
         super().__init__(game)
         
@@ -45,10 +54,10 @@ class MainMenuScene(Scene):
             (1080, 520)   # JavaScript - Canto inferior direito
         ]
         
-        for i, (module_id, module_data) in enumerate(MODULES.items()):
+        for i, (module_id, module_data) in enumerate(content.modules().items()):
             x, y = positions[i]
-            icon = assets.get_image(f"{module_id}_icon")
-            card = ModuleCard(x, y, module_id, module_data, icon)
+            # Ícones são buscados em on_enter, com os pacotes já carregados
+            card = ModuleCard(x, y, module_id, module_data)
             self.module_cards.append(card)
             
         # Sistema de vida
@@ -59,26 +68,23 @@ class MainMenuScene(Scene):
         self.show_module_select = False
         
         # Animação do portal
-        self.portal_pulse = 0
+        self.portal_clock = AnimatedValue()
+        self.portal_pulse = 0   # Fase interpolada usada no desenho
         self.portal_frames = []
         self.portal_frame_index = 0
         self.portal_anim_timer = 0.0
         self.portal_anim_fps = 10
         
+        # Quadros do portal e ícones são derivados de imagens: refazer no hot reload
+        assets.reload_listeners.append(self._on_asset_reloaded)
+        
     def handle_event(self, event):
         """Processa eventos"""
         # Verificar cliques nos botões
         if self.buttons["next_phase"].is_clicked(event):
             # Escolher um módulo aleatório
-            modules = list(MODULES.keys())
-            random_module = random.choice(modules)
-            self.selected_module = random_module
-            
-            # Python e C# vão para lesson, outros para challenge
-            if random_module in ["python", "csharp"]:
-                self.next_scene = "lesson"
-            else:
-                self.next_scene = "challenge"
+            modules = list(content.modules().keys())
+            self._open_module(random.choice(modules))
         
         if self.buttons["quit"].is_clicked(event):
             pygame.event.post(pygame.event.Event(pygame.QUIT))
@@ -86,13 +92,35 @@ class MainMenuScene(Scene):
         # Verificar cliques nos cards de módulo (sempre disponíveis)
         for card in self.module_cards:
             if card.is_clicked(event):
-                self.selected_module = card.module_id
-                # Python e C# vão para a tela de lição
-                if card.module_id in ["python", "csharp"]:
-                    self.next_scene = "lesson"
-                else:
-                    self.next_scene = "challenge"
+                self._open_module(card.module_id)
                     
+    def on_enter(self):
+        """Busca os ícones dos módulos na primeira vez que o menu aparece"""
+        for card in self.module_cards:
+            if card.icon is None:
+                card.icon = assets.get_image(_icon_name(card))
+                
+    def _on_asset_reloaded(self, name):
+        """Troca as superfícies derivadas de uma imagem recarregada"""
+        if name == "portal_animated":
+            self.portal_frames = []
+            self.portal_frame_index = 0
+        for card in self.module_cards:
+            if name == _icon_name(card):
+                card.icon = assets.get_image(name)
+                
+    def prewarm_targets(self):
+        """Desafios de todos os módulos, para abrir qualquer um sem reconstruir a cena"""
+        return [("challenge", {"module_id": module_id}) for module_id in content.modules()]
+        
+    def _open_module(self, module_id):
+        """Abre a lição do módulo (se o pacote tiver imagem de lição) ou o desafio"""
+        self.selected_module = module_id
+        if content.module(module_id).get("lesson_image"):
+            self.next_scene = "lesson"
+        else:
+            self.next_scene = "challenge"
+            
     def update(self, dt):
         """Atualiza a cena"""
         mouse_pos = pygame.mouse.get_pos()
@@ -107,7 +135,7 @@ class MainMenuScene(Scene):
             card.update(mouse_pos, dt)
             
         # Animação do portal
-        self.portal_pulse = (self.portal_pulse + dt * 2) % (2 * math.pi)
+        self.portal_clock.advance(dt * 2)
         self._update_portal_animation(dt)
 
     def _update_portal_animation(self, dt):
@@ -128,11 +156,14 @@ class MainMenuScene(Scene):
 
         self.portal_anim_timer += dt
         if self.portal_anim_timer >= 1.0 / self.portal_anim_fps:
-            self.portal_anim_timer = 0.0
+            # Guarda a sobra para a troca de quadro não atrasar aos poucos
+            self.portal_anim_timer -= 1.0 / self.portal_anim_fps
             self.portal_frame_index = (self.portal_frame_index + 1) % len(self.portal_frames)
         
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         """Desenha a cena"""
+        self.portal_pulse = self.portal_clock.at(alpha)
+        
         # Fundo espacial
         bg = assets.get_image("space_bg")
         if bg:
@@ -147,18 +178,16 @@ class MainMenuScene(Scene):
         self._draw_portal(screen)
         
         # Desenhar plataforma embaixo do personagem
-        platform = assets.get_image("platform")
+        # Proporção original 177x123, escalada 1.5x
+        platform = assets.get_image("platform", (265, 185))
         if platform:
-            # Proporção original 177x123, escalar 1.5x
-            platform_scaled = pygame.transform.scale(platform, (265, 185))
-            screen.blit(platform_scaled, (SCREEN_WIDTH//2 - 132, SCREEN_HEIGHT//2 + 20))
+            screen.blit(platform, (SCREEN_WIDTH//2 - 132, SCREEN_HEIGHT//2 + 20))
         
         # Desenhar personagem
-        player = assets.get_image("player")
+        # Aumentado 1.5x (de 128 para 192)
+        player = assets.get_image("player", (192, 192))
         if player:
-            # Aumentado 1.5x (de 128 para 192)
-            player_scaled = pygame.transform.scale(player, (192, 192))
-            screen.blit(player_scaled, (SCREEN_WIDTH//2 - 96, SCREEN_HEIGHT//2 - 80))
+            screen.blit(player, (SCREEN_WIDTH//2 - 96, SCREEN_HEIGHT//2 - 80))
             
         # Desenhar pet (pequeno cachorro/gato ao lado)
         self._draw_pet(screen)
@@ -166,7 +195,7 @@ class MainMenuScene(Scene):
         # Desenhar cards dos módulos
         font = assets.get_font("medium")
         for card in self.module_cards:
-            card.draw(screen, font)
+            card.draw(screen, font, alpha)
             
         # Desenhar barra de vida
         heart_full = assets.get_image("heart_full")
@@ -270,12 +299,11 @@ class MainMenuScene(Scene):
         rotation_angle = math.sin(self.portal_pulse * 0.5) * 5  # ±5 graus
         
         # Tentar carregar imagem do pet
-        pet_img = assets.get_image("pet")
+        # Aumentado 1.5x (de 64 para 96 pixels)
+        pet_img = assets.get_image("pet", (96, 96))
         if pet_img:
-            # Aumentado 1.5x (de 64 para 96 pixels)
-            pet_scaled = pygame.transform.scale(pet_img, (96, 96))
             # Aplicar rotação
-            pet_rotated = pygame.transform.rotate(pet_scaled, rotation_angle)
+            pet_rotated = pygame.transform.rotate(pet_img, rotation_angle)
             pet_rect = pet_rotated.get_rect(center=(pet_x + 48, pet_y + 48))
             screen.blit(pet_rotated, pet_rect)
             return
@@ -0,0 +1,58 @@
+# Registro de cenas com construção sob demanda
+#
+# Cada cena é registrada pelo módulo e nome da classe. O módulo só é importado
+# e a cena só é construída na primeira vez que ela é pedida, então abrir o
+# jogo não paga o custo das cenas que o jogador ainda não visitou.
+
+import importlib
+
+# Cenas do jogo: nome -> (módulo dentro de src.scenes, classe)
+SCENES = {
+    "menu": (".main_menu", "MainMenuScene"),
+    "village": (".village_hub", "VillageHubScene"),
+    "challenge": (".challenge_scene", "ChallengeScene"),
+    "lesson": (".lesson_scene", "LessonScene"),
+    "arena": (".arena_scene", "ArenaScene"),
+}
+
+
+def scene_class(name):
+    """Importa (se preciso) e retorna a classe de uma cena registrada"""
+    module_name, class_name = SCENES[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+class SceneRegistry:
+    """Cenas sem parâmetros, criadas na primeira vez que são pedidas"""
+
+    def __init__(self, game, names=None):
+        self.game = game
+        self.names = list(names if names is not None else SCENES)
+        self._scenes = {}
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __getitem__(self, name):
+        scene = self.get(name)
+        if scene is None:
+            raise KeyError(name)
+        return scene
+
+    def get(self, name, default=None):
+        if name not in self.names:
+            return default
+        scene = self._scenes.get(name)
+        if scene is None:
+            scene = self.create(name)
+            self._scenes[name] = scene
+        return scene
+
+    def create(self, name, **params):
+        """Constrói uma instância nova da cena (usado também pelo SceneCache)"""
+        return scene_class(name)(self.game, **params)
+
+    def loaded(self):
+        """Nomes das cenas já construídas"""
+        return list(self._scenes)
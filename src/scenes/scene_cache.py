@@ -0,0 +1,59 @@
+# Cache de instâncias de cenas com parâmetros (ex.: um desafio por módulo)
+#
+# Construir uma ChallengeScene recria o editor, o chat e os botões e joga fora
+# os caches já aquecidos (linhas renderizadas, tokens do lexer, mensagens). O
+# cache guarda as últimas cenas usadas por nome + parâmetros e chama reset()
+# ao reaproveitar uma delas. warm() constrói cenas em quadros ociosos, sem
+# nunca descartar as que já estão guardadas.
+
+from collections import OrderedDict
+
+
+class SceneCache:
+    """Instâncias de cenas reaproveitadas, com descarte LRU"""
+
+    def __init__(self, factories, capacity):
+        self.factories = factories      # nome -> função(**parâmetros) que cria a cena
+        self.capacity = capacity
+        self._scenes = OrderedDict()    # (nome, parâmetros) -> cena
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return _key(*key) in self._scenes
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def get(self, name, **params):
+        """Cena pronta para entrar: reaproveitada (com reset()) ou construída"""
+        key = _key(name, params)
+        scene = self._scenes.get(key)
+        if scene is not None:
+            self._scenes.move_to_end(key)
+            scene.reset()
+            self.hits += 1
+            return scene
+
+        self.misses += 1
+        scene = self.factories[name](**params)
+        self._scenes[key] = scene
+        while len(self._scenes) > self.capacity:
+            self._scenes.popitem(last=False)
+        return scene
+
+    def warm(self, name, params, surface):
+        """Constrói e pré-aquece a cena se couber no cache; retorna se construiu"""
+        key = _key(name, params)
+        if key in self._scenes or len(self._scenes) >= self.capacity:
+            return False
+        scene = self.factories[name](**params)
+        scene.warm(surface)
+        # Entra como a menos recente: não empurra para fora as cenas já usadas
+        self._scenes[key] = scene
+        self._scenes.move_to_end(key, last=False)
+        return True
+
+
+def _key(name, params):
+    return (name, tuple(sorted(params.items())))
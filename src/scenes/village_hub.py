@@ -3,13 +3,16 @@
 import pygame
 import math
 from .base_scene import Scene
-from src.config import Colors, VILLAGE_AREAS, SCREEN_WIDTH, SCREEN_HEIGHT
+from src.config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT
 from src.ui import Button, VillageArea
-from src.utils import assets
+from src.utils import assets, content, AnimatedValue
 
 class VillageHubScene(Scene):
     """Cena do hub do vilarejo com diferentes áreas"""
     
+    BUNDLES = ("village",)
+    MUSIC = "village_theme"
+    
     def __init__(self, game):
         super().__init__(game)
         
@@ -22,7 +25,7 @@ class VillageHubScene(Scene):
             "greenhouse": (1000, 520)
         }
         
-        for area_id, area_data in VILLAGE_AREAS.items():
+        for area_id, area_data in content.areas().items():
             x, y = area_positions.get(area_id, area_data["position"])
             area = VillageArea(x, y, area_id, area_data)
             self.areas.append(area)
@@ -33,7 +36,8 @@ class VillageHubScene(Scene):
         # Personagem do jogador no centro
         self.player_x = SCREEN_WIDTH // 2
         self.player_y = SCREEN_HEIGHT // 2
-        self.player_animation = 0
+        self.player_clock = AnimatedValue()
+        self.player_animation = 0   # Fase interpolada usada no desenho
         
         # Dica/tooltip atual
         self.current_tooltip = None
@@ -47,6 +51,8 @@ class VillageHubScene(Scene):
             if area.is_clicked(event):
                 if area.area_id == "training":
                     self.next_scene = "challenge"
+                elif area.area_id == "arena":
+                    self.next_scene = "arena"
                 else:
                     # Por enquanto, mostrar mensagem de "em breve"
                     self.current_tooltip = f"{area.area_data['name']} - Em breve!"
@@ -62,7 +68,7 @@ class VillageHubScene(Scene):
             area.update(mouse_pos, dt)
             
         # Animação do personagem
-        self.player_animation = (self.player_animation + dt * 2) % (2 * math.pi)
+        self.player_clock.advance(dt * 2)
         
         # Limpar tooltip se não estiver sobre nenhuma área
         hovering = any(area.is_hovered for area in self.areas)
@@ -73,8 +79,10 @@ class VillageHubScene(Scene):
                 if area.is_hovered:
                     self.current_tooltip = area.area_data["description"]
                     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         """Desenha a cena"""
+        self.player_animation = self.player_clock.at(alpha)
+        
         # Fundo do vilarejo
         bg = assets.get_image("village_bg")
         if bg:
@@ -86,7 +94,7 @@ class VillageHubScene(Scene):
         font = assets.get_font("medium")
         for area in self.areas:
             self._draw_area_building(screen, area)
-            area.draw(screen, font)
+            area.draw(screen, font, alpha)
             
         # Desenhar personagem no centro
         self._draw_player(screen)
@@ -135,13 +143,12 @@ class VillageHubScene(Scene):
         x, y = area.x, area.y
         
         # Tentar carregar a imagem da locação
-        location_img = assets.get_image(area.area_id)
+        # Tamanho apropriado (dobrado), pré-escalado no build
+        location_img = assets.get_image(area.area_id, (360, 240))
         if location_img:
-            # Escalar para tamanho apropriado (dobrado)
-            img_scaled = pygame.transform.scale(location_img, (360, 240))
             # Centralizar na posição
-            img_rect = img_scaled.get_rect(center=(x, y - 30))
-            screen.blit(img_scaled, img_rect)
+            img_rect = location_img.get_rect(center=(x, y - 30))
+            screen.blit(location_img, img_rect)
             return
         
         # Fallback: Desenhar formas simples se não tiver imagem
@@ -197,12 +204,11 @@ class VillageHubScene(Scene):
                           (self.player_x - 35, platform_y + 5, 70, 20))
         
         # Personagem
-        player_img = assets.get_image("player")
+        player_img = assets.get_image("player", (80, 80))
         if player_img:
             # Pequena animação de flutuação
             offset_y = int(math.sin(self.player_animation) * 3)
-            player_scaled = pygame.transform.scale(player_img, (80, 80))
-            screen.blit(player_scaled, (self.player_x - 40, self.player_y - 50 + offset_y))
+            screen.blit(player_img, (self.player_x - 40, self.player_y - 50 + offset_y))
         else:
             # Placeholder
             pygame.draw.circle(screen, (255, 200, 180), 
@@ -5,5 +5,7 @@ from .components import (
     HealthBar, 
     ChatBox, 
     CodeEditor,
-    VillageArea
+    VillageArea,
+    PerformanceOverlay
 )
+from .highlighter import SyntaxHighlighter
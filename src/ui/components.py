@@ -1,8 +1,11 @@
 # Componentes de UI do jogo
 
 import pygame
+from collections import deque
 from src.config import Colors, FONT_SIZES
-from src.utils import assets
+from src.utils import assets, audio, metrics, AnimatedValue
+from src.utils.text_buffer import TextBuffer
+from .highlighter import SyntaxHighlighter, LineSurfacePool
 
 class Button:
     """Botão clicável com estilo RPG"""
@@ -61,7 +64,10 @@ class Button:
     def is_clicked(self, event):
         """Verifica se o botão foi clicado"""
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-            return self.rect.collidepoint(event.pos) and self.enabled
+            clicked = self.rect.collidepoint(event.pos) and self.enabled
+            if clicked:
+                audio.play("click", "ui")
+            return clicked
         return False
 
 
@@ -80,15 +86,17 @@ class ModuleCard:
         self.rect = pygame.Rect(x - self.width//2, y - 80, 
                                 self.width, self.height)
         self.is_hovered = False
-        self.pulse = 0
+        self.pulse_clock = AnimatedValue()
+        self.pulse = 0   # Fase interpolada usada no desenho
         
     def update(self, mouse_pos, dt):
         """Atualiza o card"""
         self.is_hovered = self.rect.collidepoint(mouse_pos)
-        self.pulse = (self.pulse + dt * 3) % (2 * 3.14159)
+        self.pulse_clock.advance(dt * 3)
         
-    def draw(self, screen, font):
+    def draw(self, screen, font, alpha=1.0):
         """Desenha o card na tela"""
+        self.pulse = self.pulse_clock.at(alpha)
         import math
         import random
         
@@ -235,25 +243,227 @@ class HealthBar:
                 screen.blit(heart_empty, (x, self.y))
 
 
+class _ChatMessage:
+    """Mensagem do chat já quebrada em linhas (e renderizada)"""
+    
+    __slots__ = ("text", "is_ai", "lines", "height", "surface")
+    
+    def __init__(self, text, is_ai, lines, height):
+        self.text = text
+        self.is_ai = is_ai
+        self.lines = lines
+        self.height = height
+        self.surface = None
+
+
+class ChatTranscript:
+    """Histórico do chat num buffer circular de capacidade fixa
+    
+    Guarda, para cada mensagem, a posição vertical acumulada do fim dela
+    (em pixels, contada desde a primeira mensagem já adicionada). Assim dá
+    para achar por busca binária quais mensagens aparecem na janela visível.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._bottoms = [0] * capacity
+        self._start = 0   # Posição física da mensagem mais antiga
+        self.count = 0
+        
+    def __len__(self):
+        return self.count
+        
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        return self._items[(self._start + index) % self.capacity]
+        
+    def append(self, message):
+        """Adiciona uma mensagem; retorna a mais antiga descartada (ou None)"""
+        previous_bottom = self.bottom(self.count - 1) if self.count else 0
+        evicted = None
+        if self.count == self.capacity:
+            evicted = self._items[self._start]
+            self._start = (self._start + 1) % self.capacity
+            self.count -= 1
+        slot = (self._start + self.count) % self.capacity
+        self._items[slot] = message
+        self._bottoms[slot] = previous_bottom + message.height
+        self.count += 1
+        return evicted
+        
+    def bottom(self, index):
+        """Posição acumulada do fim da mensagem"""
+        return self._bottoms[(self._start + index) % self.capacity]
+        
+    def top(self, index):
+        return self.bottom(index) - self[index].height
+        
+    @property
+    def content_top(self):
+        return self.top(0) if self.count else 0
+        
+    @property
+    def content_bottom(self):
+        return self.bottom(self.count - 1) if self.count else 0
+        
+    def index_of(self, message):
+        """Índice da mensagem (procura a partir das mais novas)"""
+        for index in range(self.count - 1, -1, -1):
+            if self[index] is message:
+                return index
+        return -1
+        
+    def resize(self, index, height):
+        """Muda a altura de uma mensagem e desloca as seguintes"""
+        delta = height - self[index].height
+        self[index].height = height
+        for i in range(index, self.count):
+            self._bottoms[(self._start + i) % self.capacity] += delta
+        
+    def first_visible(self, y):
+        """Índice da primeira mensagem cujo fim fica abaixo da posição y"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.bottom(middle) <= y:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
 class ChatBox:
     """Caixa de chat para o assistente IA"""
     
+    HISTORY_SIZE = 2000          # Mensagens guardadas no histórico
+    SURFACE_BUDGET = 8 * 1024 * 1024  # Bytes de superfícies renderizadas mantidas
+    LINE_HEIGHT = 18
+    MESSAGE_SPACING = 4
+    SCROLL_STEP = 3 * 18
+    
     def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
-        self.messages = []
+        self.messages = ChatTranscript(self.HISTORY_SIZE)
         self.input_text = ""
         self.input_rect = pygame.Rect(x + 10, y + height - 40, width - 100, 30)
         self.is_active = False
+        # Área das mensagens (acima do campo de input, sem o ícone do assistente)
+        self.messages_rect = pygame.Rect(x + 10, y + 8, width - 80, height - 56)
+        # Distância (em pixels) rolada para cima a partir da última mensagem
+        self.scroll_offset = 0
+        # Mensagens com superfície renderizada, da mais antiga para a mais nova
+        self._rendered = deque()
+        self._surface_bytes = 0
+        self._fonts = None
+        self._input_cache = (None, None)
+        self._assistant_cache = (None, None)
+        
+    def _get_fonts(self):
+        """Fontes do chat (usar fonte do sistema que suporte acentos)"""
+        if self._fonts is None:
+            self._fonts = {
+                "message": pygame.font.SysFont("arial", 14),
+                "label": pygame.font.SysFont("arial", 12, bold=True)
+            }
+        return self._fonts
         
     def add_message(self, text, is_ai=True):
-        """Adiciona uma mensagem ao chat"""
-        self.messages.append({"text": text, "is_ai": is_ai})
-        # Manter apenas as últimas 5 mensagens
-        if len(self.messages) > 5:
-            self.messages.pop(0)
+        """Adiciona uma mensagem ao chat (quebra e renderiza uma única vez)"""
+        lines = self._wrap(text)
+        height = len(lines) * self.LINE_HEIGHT + self.MESSAGE_SPACING
+        message = _ChatMessage(text, is_ai, lines, height)
+        self._render(message)
+        
+        evicted = self.messages.append(message)
+        if evicted is not None and evicted.surface is not None:
+            self._surface_bytes -= _surface_bytes(evicted.surface)
+            evicted.surface = None
+        while self._rendered and self._rendered[0].surface is None:
+            self._rendered.popleft()
+            
+        # Se o jogador rolou para cima, mantém a mesma parte visível
+        if self.scroll_offset:
+            self.scroll_offset = min(self.scroll_offset + height, self._max_scroll())
+        return message
+        
+    def clear(self):
+        """Apaga o histórico, mantendo as fontes já carregadas"""
+        self.messages = ChatTranscript(self.HISTORY_SIZE)
+        self._rendered.clear()
+        self._surface_bytes = 0
+        self.scroll_offset = 0
+        self.input_text = ""
+        self.is_active = False
+        
+    def update_message(self, message, text):
+        """Troca o texto de uma mensagem já exibida (ex.: resposta em streaming)"""
+        index = self.messages.index_of(message)
+        if index < 0:
+            return
+        message.text = text
+        message.lines = self._wrap(text)
+        height = len(message.lines) * self.LINE_HEIGHT + self.MESSAGE_SPACING
+        self.messages.resize(index, height)
+        self._render(message)
+        
+    def handle_event(self, event):
+        """Rola o histórico com a roda do mouse"""
+        if event.type == pygame.MOUSEWHEEL and self.rect.collidepoint(pygame.mouse.get_pos()):
+            offset = self.scroll_offset + event.y * self.SCROLL_STEP
+            self.scroll_offset = max(0, min(offset, self._max_scroll()))
+            
+    def _max_scroll(self):
+        content = self.messages.content_bottom - self.messages.content_top
+        return max(0, content - self.messages_rect.height)
+        
+    def _wrap(self, text):
+        """Quebra o texto em linhas que cabem na área de mensagens"""
+        font = self._get_fonts()["message"]
+        max_width = self.messages_rect.width
+        lines = []
+        for paragraph in text.split("\n"):
+            current_line = []
+            for word in paragraph.split(" "):
+                test_line = " ".join(current_line + [word])
+                if font.size(test_line)[0] <= max_width:
+                    current_line.append(word)
+                else:
+                    if current_line:
+                        lines.append(" ".join(current_line))
+                    current_line = [word]
+            lines.append(" ".join(current_line))
+        return lines
+        
+    def _render(self, message):
+        """Renderiza a mensagem numa superfície e aplica o orçamento de memória"""
+        font = self._get_fonts()["message"]
+        color = Colors.CYAN if message.is_ai else Colors.WHITE
+        rendered = [font.render(line, True, color) for line in message.lines]
+        width = max([line.get_width() for line in rendered] + [1])
+        surface = pygame.Surface((width, message.height), pygame.SRCALPHA)
+        for i, line in enumerate(rendered):
+            surface.blit(line, (0, i * self.LINE_HEIGHT))
+            
+        if message.surface is not None:
+            self._surface_bytes -= _surface_bytes(message.surface)
+        else:
+            self._rendered.append(message)
+        message.surface = surface
+        self._surface_bytes += _surface_bytes(surface)
+        
+        # Mensagens antigas perdem a superfície (o texto quebrado continua)
+        while self._surface_bytes > self.SURFACE_BUDGET and len(self._rendered) > 1:
+            old = self._rendered.popleft()
+            if old.surface is not None:
+                self._surface_bytes -= _surface_bytes(old.surface)
+                old.surface = None
             
     def draw(self, screen, font, assistant_img=None):
         """Desenha a caixa de chat"""
+        fonts = self._get_fonts()
+        
         # Fundo semi-transparente
         chat_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
         pygame.draw.rect(chat_surface, (40, 40, 50, 230), 
@@ -263,100 +473,370 @@ class ChatBox:
         # Borda
         pygame.draw.rect(screen, Colors.GOLD, self.rect, 2, border_radius=10)
         
-        # Mensagens - usar fonte do sistema que suporte acentos
-        small_font = pygame.font.SysFont("arial", 14)
-        max_width = self.rect.width - 80  # Espaço para o ícone do assistente
-        y_offset = 8
-        for msg in self.messages[-3:]:  # Mostrar últimas 3
-            color = Colors.CYAN if msg["is_ai"] else Colors.WHITE
-            
-            # Quebrar texto em múltiplas linhas se necessário
-            words = msg["text"].split(" ")
-            lines = []
-            current_line = []
-            for word in words:
-                test_line = " ".join(current_line + [word])
-                if small_font.size(test_line)[0] <= max_width:
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        lines.append(" ".join(current_line))
-                    current_line = [word]
-            if current_line:
-                lines.append(" ".join(current_line))
-            
-            # Renderizar cada linha (máximo 2 linhas por mensagem)
-            for line in lines[:2]:
-                text = small_font.render(line, True, color)
-                screen.blit(text, (self.rect.x + 10, self.rect.y + y_offset))
-                y_offset += 18
-            y_offset += 4  # Espaço extra entre mensagens
+        # Mensagens: só as que cruzam a janela visível são desenhadas
+        view = self.messages_rect
+        transcript = self.messages
+        view_bottom = transcript.content_bottom - self.scroll_offset
+        view_top = view_bottom - view.height
+        
+        previous_clip = screen.get_clip()
+        screen.set_clip(view)
+        index = transcript.first_visible(view_top)
+        while index < len(transcript):
+            top = transcript.top(index)
+            if top >= view_bottom:
+                break
+            message = transcript[index]
+            if message.surface is None:
+                self._render(message)
+            screen.blit(message.surface, (view.x, view.y + top - view_top))
+            index += 1
+        screen.set_clip(previous_clip)
+        
+        # Indicador de rolagem quando há mensagens mais novas abaixo
+        if self.scroll_offset:
+            arrow_x = view.right - 8
+            pygame.draw.polygon(screen, Colors.GOLD, [(arrow_x - 6, view.bottom - 8),
+                                                      (arrow_x + 6, view.bottom - 8),
+                                                      (arrow_x, view.bottom - 2)])
             
         # Campo de input
         pygame.draw.rect(screen, (60, 60, 70), self.input_rect, border_radius=5)
         pygame.draw.rect(screen, Colors.WHITE if self.is_active else (100, 100, 100), 
                         self.input_rect, 1, border_radius=5)
         
-        # Texto placeholder ou input - usar fonte do sistema
-        input_font = pygame.font.SysFont("arial", 14)
-        if self.input_text:
-            input_surface = input_font.render(self.input_text[-40:], True, Colors.WHITE)
-        else:
-            input_surface = input_font.render("Digite sua dúvida aqui...", True, (150, 150, 150))
+        # Texto placeholder ou input (renderizado só quando muda)
+        cached_text, input_surface = self._input_cache
+        if cached_text != self.input_text or input_surface is None:
+            if self.input_text:
+                input_surface = fonts["message"].render(self.input_text[-40:], True, Colors.WHITE)
+            else:
+                input_surface = fonts["message"].render("Digite sua dúvida aqui...", True, (150, 150, 150))
+            self._input_cache = (self.input_text, input_surface)
         screen.blit(input_surface, (self.input_rect.x + 5, self.input_rect.y + 8))
         
         # Ícone do assistente
         if assistant_img:
-            # Redimensionar assistente para caber melhor
-            assist_scaled = pygame.transform.scale(assistant_img, (60, 60))
+            # Redimensionar assistente para caber melhor (uma vez por imagem)
+            source, assist_scaled = self._assistant_cache
+            if source is not assistant_img:
+                assist_scaled = pygame.transform.scale(assistant_img, (60, 60))
+                self._assistant_cache = (assistant_img, assist_scaled)
             screen.blit(assist_scaled, (self.rect.right - 58, self.rect.bottom - 95))
             
-        # Label "Ajuda CinthIA!" - usar fonte do sistema
-        label_font = pygame.font.SysFont("arial", 12, bold=True)
-        label = label_font.render("CinthIA", True, Colors.GOLD)
+        # Label "Ajuda CinthIA!"
+        label = fonts["label"].render("CinthIA", True, Colors.GOLD)
         screen.blit(label, (self.rect.right - 52, self.rect.bottom - 30))
 
 
+def _surface_bytes(surface):
+    """Memória aproximada ocupada pelos pixels de uma superfície"""
+    return surface.get_pitch() * surface.get_height()
+
+
 class CodeEditor:
-    """Editor de código simplificado para os desafios"""
+    """Editor de código dos desafios (editável, com desfazer/refazer)"""
     
-    def __init__(self, x, y, width, height):
+    LINE_HEIGHT = 22
+    PADDING_X = 10
+    PADDING_Y = 10
+    INDENT = "    "
+    SCROLL_LINES = 3      # Linhas roladas por passo da roda do mouse
+    SCROLL_SMOOTHING = 14  # Velocidade da rolagem suave (maior = mais rápida)
+    
+    def __init__(self, x, y, width, height, language="csharp"):
         self.rect = pygame.Rect(x, y, width, height)
-        self.code_lines = []
+        self.buffer = TextBuffer()
         self.current_line = 0
+        self.current_column = 0
         self.cursor_visible = True
         self.cursor_timer = 0
-        
-    def set_code(self, code_text):
+        self.is_active = False
+        # Rolagem em pixels (scroll_y persegue target_scroll_y suavemente)
+        self.scroll_y = 0.0
+        self.target_scroll_y = 0.0
+        self.language = language
+        self.highlighter = SyntaxHighlighter(language)
+        self.code_font = None
+        # Última faixa de linhas alterada (TextChange), útil para depuração
+        self.last_change = None
+        # Linhas visíveis já renderizadas: índice -> (superfície, linha, spans)
+        self._slots = {}
+        self._pool = None
+        self._gutter_digits = 0
+        self.gutter_width = 0
+        
+    def set_code(self, code_text, language=None):
         """Define o código a ser exibido"""
-        self.code_lines = code_text.split("\n")
+        if language and language != self.language:
+            self.language = language
+            self.highlighter = SyntaxHighlighter(language)
+        self.buffer.set_text(code_text)
+        self.highlighter.set_lines(self.buffer.get_lines(0, self.buffer.line_count))
+        self.current_line = 0
+        self.current_column = 0
+        self.scroll_y = 0.0
+        self.target_scroll_y = 0.0
+        
+    def get_code(self):
+        """Retorna o código atual do editor"""
+        return self.buffer.get_text()
+        
+    def handle_event(self, event):
+        """Processa cliques e teclas quando o editor está ativo"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.is_active = self.rect.collidepoint(event.pos)
+            if self.is_active:
+                self._move_cursor_to_point(event.pos)
+            return
+            
+        if event.type == pygame.MOUSEWHEEL:
+            if self.rect.collidepoint(pygame.mouse.get_pos()):
+                self._scroll_to(self.target_scroll_y - event.y * self.SCROLL_LINES * self.LINE_HEIGHT)
+            return
+            
+        if not self.is_active or event.type != pygame.KEYDOWN:
+            return
+            
+        ctrl = event.mod & pygame.KMOD_CTRL
+        key = event.key
+        
+        if ctrl and key == pygame.K_z:
+            if event.mod & pygame.KMOD_SHIFT:
+                self._apply_history(self.buffer.redo())
+            else:
+                self._apply_history(self.buffer.undo())
+        elif ctrl and key == pygame.K_y:
+            self._apply_history(self.buffer.redo())
+        elif ctrl and key == pygame.K_v:
+            self._paste()
+        elif key == pygame.K_BACKSPACE:
+            offset = self._cursor_offset()
+            if offset > 0:
+                self._edit(offset - 1, 1, "")
+        elif key == pygame.K_DELETE:
+            self._edit(self._cursor_offset(), 1, "")
+        elif key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            # Mantém a indentação da linha atual
+            line = self._line_text(self.current_line)
+            indent = line[:len(line) - len(line.lstrip(" \t"))]
+            self._edit(self._cursor_offset(), 0, "\n" + indent)
+        elif key == pygame.K_TAB:
+            self._edit(self._cursor_offset(), 0, self.INDENT)
+        elif key == pygame.K_LEFT:
+            self._set_cursor_offset(max(0, self._cursor_offset() - 1))
+        elif key == pygame.K_RIGHT:
+            self._set_cursor_offset(min(len(self.buffer), self._cursor_offset() + 1))
+        elif key == pygame.K_UP:
+            self._move_cursor_line(-1)
+        elif key == pygame.K_DOWN:
+            self._move_cursor_line(1)
+        elif key == pygame.K_PAGEUP:
+            self._move_cursor_line(-self._visible_line_count())
+        elif key == pygame.K_PAGEDOWN:
+            self._move_cursor_line(self._visible_line_count())
+        elif key == pygame.K_HOME:
+            self.current_column = 0
+        elif key == pygame.K_END:
+            self.current_column = len(self._line_text(self.current_line))
+        elif event.unicode and event.unicode.isprintable() and not ctrl:
+            self._edit(self._cursor_offset(), 0, event.unicode)
+            
+        self.cursor_visible = True
+        self.cursor_timer = 0
+        self._scroll_to_cursor()
+        
+    def update(self, dt):
+        """Atualiza o cursor piscante e a rolagem suave"""
+        self.cursor_timer += dt
+        if self.cursor_timer >= 0.5:
+            self.cursor_timer = 0
+            self.cursor_visible = not self.cursor_visible
+            
+        distance = self.target_scroll_y - self.scroll_y
+        if abs(distance) < 0.5:
+            self.scroll_y = self.target_scroll_y
+        else:
+            self.scroll_y += distance * min(1.0, dt * self.SCROLL_SMOOTHING)
+            
+    def _edit(self, offset, length, text):
+        """Aplica uma edição no buffer e atualiza só as linhas afetadas"""
+        change = self.buffer.replace(offset, length, text, pygame.time.get_ticks() / 1000.0)
+        if change is None:
+            return
+        self._apply_change(change)
+        self._set_cursor_offset(offset + len(text))
+        
+    def _apply_history(self, result):
+        """Aplica o resultado de undo()/redo() do buffer"""
+        change, cursor = result
+        if change is None:
+            return
+        self._apply_change(change)
+        self._set_cursor_offset(cursor)
+        
+    def _apply_change(self, change):
+        """Repassa ao realce apenas as linhas que mudaram"""
+        # Som de digitação só quando o texto muda (setas, Shift e atalhos não tocam)
+        audio.play("typing", "typing", volume=0.5)
+        new_lines = self.buffer.get_lines(change.first, change.new_count)
+        self.highlighter.splice(change.first, change.old_count, new_lines)
+        self.last_change = change
+        
+    def _paste(self):
+        """Cola o texto da área de transferência"""
+        try:
+            text = pygame.scrap.get_text()
+        except (pygame.error, AttributeError):
+            return
+        if text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\t", self.INDENT)
+            self._edit(self._cursor_offset(), 0, text)
+            
+    def _line_text(self, line):
+        """Texto da linha (vem do cache do realce, sem consultar o buffer)"""
+        return self.highlighter.lines[line].text
+        
+    def _cursor_offset(self):
+        return self.buffer.offset_of(self.current_line, self.current_column)
+        
+    def _set_cursor_offset(self, offset):
+        self.current_line, self.current_column = self.buffer.position_of(offset)
+        
+    def _move_cursor_line(self, delta):
+        self.current_line = max(0, min(self.buffer.line_count - 1, self.current_line + delta))
+        self.current_column = min(self.current_column, len(self._line_text(self.current_line)))
+        
+    def _move_cursor_to_point(self, pos):
+        """Posiciona o cursor no caractere mais próximo do clique"""
+        line = int(pos[1] - self.rect.y - self.PADDING_Y + self.scroll_y) // self.LINE_HEIGHT
+        self.current_line = max(0, min(self.buffer.line_count - 1, line))
+        text = self._line_text(self.current_line)
+        
+        x = pos[0] - self.rect.x - self.gutter_width - self.PADDING_X
+        column = 0
+        if self.code_font is not None:
+            while column < len(text) and self.code_font.size(text[:column + 1])[0] <= x:
+                column += 1
+        self.current_column = column
+        
+    def _visible_line_count(self):
+        return max(1, (self.rect.height - self.PADDING_Y * 2) // self.LINE_HEIGHT)
+        
+    def _max_scroll(self):
+        content = self.buffer.line_count * self.LINE_HEIGHT
+        return max(0, content - (self.rect.height - self.PADDING_Y * 2))
+        
+    def _scroll_to(self, target):
+        self.target_scroll_y = float(max(0, min(self._max_scroll(), target)))
+        
+    def _scroll_to_cursor(self):
+        """Ajusta a rolagem para manter a linha do cursor visível"""
+        view_height = self.rect.height - self.PADDING_Y * 2
+        top = self.current_line * self.LINE_HEIGHT
+        if top < self.target_scroll_y:
+            self._scroll_to(top)
+        elif top + self.LINE_HEIGHT > self.target_scroll_y + view_height:
+            self._scroll_to(top + self.LINE_HEIGHT - view_height)
+        else:
+            # Conteúdo pode ter encolhido (linhas apagadas)
+            self._scroll_to(self.target_scroll_y)
+            
+    def _update_layout(self):
+        """Recalcula a largura da calha (números de linha) e o pool de linhas"""
+        digits = max(2, len(str(self.buffer.line_count)))
+        if digits != self._gutter_digits or self._pool is None:
+            self._gutter_digits = digits
+            self.gutter_width = self.code_font.size("9" * digits)[0] + self.PADDING_X
+            size = (self.rect.width - 4, self.LINE_HEIGHT)
+            if self._pool is None:
+                self._pool = LineSurfacePool(size)
+            # Calha mudou: as linhas visíveis são redesenhadas, mas as superfícies voltam ao pool
+            for surface, _line, _spans in self._slots.values():
+                self._pool.release(surface)
+            self._slots.clear()
+            self._pool.resize(size)
+            
+    def _line_surface(self, index):
+        """Superfície da linha visível; só renderiza se a linha mudou"""
+        line = self.highlighter.line(index)
+        slot = self._slots.get(index)
+        if slot is not None:
+            surface, cached_line, cached_spans = slot
+            if cached_line is line and cached_spans is line.spans:
+                return surface
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface = self._pool.acquire()
+            
+        # Número da linha na calha + código colorido
+        number = self.code_font.render(str(index + 1), True, (110, 110, 110))
+        surface.blit(number, (self.gutter_width - number.get_width() - self.PADDING_X // 2, 0))
+        self.highlighter.render_into(surface, self.gutter_width + self.PADDING_X, line, self.code_font)
+        self._slots[index] = (surface, line, line.spans)
+        return surface
         
     def draw(self, screen, font):
-        """Desenha o editor de código"""
+        """Desenha apenas as linhas que aparecem na área visível"""
         # Fundo escuro do editor
         pygame.draw.rect(screen, Colors.CODE_BG, self.rect, border_radius=8)
-        pygame.draw.rect(screen, (60, 60, 60), self.rect, 2, border_radius=8)
-        
-        # Fonte monospace para código
-        code_font = pygame.font.SysFont("monospace", 18)
-        y_offset = 10
-        
-        for i, line in enumerate(self.code_lines):
-            # Colorir syntax básico
-            color = Colors.TEXT_LIGHT
-            if line.strip().startswith("//") or line.strip().startswith("#"):
-                color = Colors.CODE_GREEN
-            elif "class " in line or "void " in line or "private " in line or "public " in line or "def " in line:
-                color = Colors.CODE_BLUE
-            elif "using " in line or "import " in line or "from " in line:
-                color = Colors.CODE_PURPLE
-                
-            text = code_font.render(line, True, color)
-            screen.blit(text, (self.rect.x + 15, self.rect.y + y_offset))
-            y_offset += 22
+        
+        # Fonte monospace para código (criada uma única vez)
+        if self.code_font is None:
+            self.code_font = pygame.font.SysFont("monospace", 18)
+        self._update_layout()
+        
+        # Janela de linhas visíveis (inclui linhas parcialmente cortadas)
+        view = pygame.Rect(self.rect.x, self.rect.y + self.PADDING_Y,
+                           self.rect.width, self.rect.height - self.PADDING_Y * 2)
+        scroll = int(self.scroll_y)
+        first = scroll // self.LINE_HEIGHT
+        last = min(self.buffer.line_count, (scroll + view.height) // self.LINE_HEIGHT + 1)
+        
+        # Linhas que saíram da tela devolvem a superfície ao pool
+        for index in [i for i in self._slots if i < first or i >= last]:
+            self._pool.release(self._slots.pop(index)[0])
             
-            if y_offset > self.rect.height - 20:
-                break
+        # Calha com números de linha
+        gutter = pygame.Rect(self.rect.x, self.rect.y, self.gutter_width, self.rect.height)
+        pygame.draw.rect(screen, (37, 37, 38), gutter, border_top_left_radius=8, border_bottom_left_radius=8)
+        pygame.draw.line(screen, (60, 60, 60), gutter.topright, gutter.bottomright)
+        
+        previous_clip = screen.get_clip()
+        screen.set_clip(view.clip(previous_clip) if previous_clip else view)
+        
+        # Destaque da linha do cursor
+        if self.is_active and first <= self.current_line < last:
+            highlight_y = view.y + self.current_line * self.LINE_HEIGHT - scroll
+            pygame.draw.rect(screen, (42, 45, 46),
+                           (gutter.right + 1, highlight_y, self.rect.width - self.gutter_width - 3, self.LINE_HEIGHT))
+            
+        for index in range(first, last):
+            y = view.y + index * self.LINE_HEIGHT - scroll
+            screen.blit(self._line_surface(index), (self.rect.x, y))
+            
+        # Cursor
+        if self.is_active and self.cursor_visible and first <= self.current_line < last:
+            line_text = self._line_text(self.current_line)
+            cursor_x = (self.rect.x + self.gutter_width + self.PADDING_X +
+                        self.code_font.size(line_text[:self.current_column])[0])
+            cursor_y = view.y + self.current_line * self.LINE_HEIGHT - scroll
+            pygame.draw.line(screen, Colors.TEXT_LIGHT, (cursor_x, cursor_y),
+                           (cursor_x, cursor_y + self.LINE_HEIGHT - 4), 2)
+            
+        screen.set_clip(previous_clip)
+        
+        # Barra de rolagem
+        max_scroll = self._max_scroll()
+        if max_scroll > 0:
+            track = view.height
+            thumb_height = max(20, track * view.height // (view.height + max_scroll))
+            thumb_y = view.y + (track - thumb_height) * self.scroll_y / max_scroll
+            pygame.draw.rect(screen, (90, 90, 90),
+                           (self.rect.right - 8, thumb_y, 4, thumb_height), border_radius=2)
+            
+        border_color = Colors.GOLD if self.is_active else (60, 60, 60)
+        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=8)
 
 
 class VillageArea:
@@ -370,16 +850,18 @@ class VillageArea:
         self.icon = icon
         self.rect = pygame.Rect(x - 80, y - 80, 160, 160)
         self.is_hovered = False
-        self.pulse = 0  # Para animações
+        self.pulse_clock = AnimatedValue()
+        self.pulse = 0  # Para animações (valor interpolado do desenho)
         
     def update(self, mouse_pos, dt=0.016):
         """Atualiza a área"""
         self.is_hovered = self.rect.collidepoint(mouse_pos)
-        if self.is_hovered:
-            self.pulse += dt * 4
+        # Avança sempre (parada, com zero) para a interpolação não oscilar
+        self.pulse_clock.advance(dt * 4 if self.is_hovered else 0.0)
         
-    def draw(self, screen, font):
+    def draw(self, screen, font, alpha=1.0):
         """Desenha a área com placa de seta apontando para a locação"""
+        self.pulse = self.pulse_clock.at(alpha)
         from src.utils import assets
         import math
         
@@ -389,9 +871,9 @@ class VillageArea:
         
         # Carregar a placa de seta apropriada (invertido: esquerda usa seta esquerda, direita usa seta direita)
         if is_left_side:
-            sign_img = assets.get_image("sign_arrow_left")
+            sign_img = assets.get_image("sign_arrow_left", (180, 120))
         else:
-            sign_img = assets.get_image("sign_arrow_right")
+            sign_img = assets.get_image("sign_arrow_right", (180, 120))
         
         # Calcular posição da placa (afastada da locação, em direção ao centro)
         # Offset de 45° em direção ao centro
@@ -402,10 +884,9 @@ class VillageArea:
         sign_y = self.y + offset_y
         
         if sign_img:
-            # Escalar a placa para tamanho apropriado
-            sign_scaled = pygame.transform.scale(sign_img, (180, 120))
-            sign_rect = sign_scaled.get_rect(center=(sign_x, sign_y))
-            screen.blit(sign_scaled, sign_rect)
+            # Placa já pré-escalada (180x120)
+            sign_rect = sign_img.get_rect(center=(sign_x, sign_y))
+            screen.blit(sign_img, sign_rect)
             
             # Texto na placa - posição ajustada para dentro da seta
             small_font = pygame.font.SysFont("arial", 14, bold=True)
@@ -478,3 +959,54 @@ class VillageArea:
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             return self.rect.collidepoint(event.pos)
         return False
+
+
+class PerformanceOverlay:
+    """Overlay de desempenho (FPS, tempos de quadro e métricas dos subsistemas)"""
+    
+    def __init__(self, x=10, y=10):
+        self.x = x
+        self.y = y
+        self.visible = False
+        self._font = None
+        self._timer = 0
+        self._lines = []
+        
+    def toggle(self):
+        self.visible = not self.visible
+        self._timer = 0
+        
+    def update(self, dt):
+        """Atualiza o texto 4 vezes por segundo (evita renderizar todo quadro)"""
+        if not self.visible:
+            return
+        self._timer -= dt
+        if self._timer > 0:
+            return
+        self._timer = 0.25
+        
+        if self._font is None:
+            self._font = pygame.font.SysFont("monospace", 14)
+        fps = 1000.0 / metrics.frame_ms_avg if metrics.frame_ms_avg else 0
+        texts = [
+            f"FPS {fps:5.1f}  quadro {metrics.frame_ms_avg:5.1f}ms  pior {metrics.frame_ms_max:5.1f}ms"
+        ]
+        for name in sorted(metrics.values):
+            value = metrics.values[name]
+            if isinstance(value, float):
+                texts.append(f"{name}: {value:.2f}")
+            else:
+                texts.append(f"{name}: {value}")
+        metrics.reset_peaks()
+        self._lines = [self._font.render(text, True, Colors.GREEN) for text in texts]
+        
+    def draw(self, screen):
+        if not self.visible or not self._lines:
+            return
+        width = max(line.get_width() for line in self._lines) + 16
+        height = len(self._lines) * 16 + 12
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 180))
+        screen.blit(background, (self.x, self.y))
+        for i, line in enumerate(self._lines):
+            screen.blit(line, (self.x + 8, self.y + 6 + i * 16))
@@ -0,0 +1,130 @@
+# Realce de sintaxe incremental e renderização de linhas de código
+
+import pygame
+from src.config import SYNTAX_COLORS, Colors
+from src.utils.lexer import get_lexer
+
+
+class _Line:
+    """Entrada do cache: texto, estados do analisador e tokens"""
+
+    __slots__ = ("text", "in_state", "out_state", "spans")
+
+    def __init__(self, text):
+        self.text = text
+        self.in_state = None
+        self.out_state = None
+        self.spans = None      # None = precisa ser tokenizada
+
+
+class SyntaxHighlighter:
+    """Mantém os tokens de cada linha de código
+
+    Uma linha só é re-tokenizada quando o texto dela ou o estado de entrada
+    (vindo da linha anterior) muda. A lista de spans de uma linha só é
+    trocada quando os tokens mudam, então quem guarda uma superfície
+    renderizada pode compará-la por identidade (`line.spans is spans`).
+    """
+
+    def __init__(self, language):
+        self.language = language
+        self.lexer = get_lexer(language)
+        self.lines = []
+        # Linhas [0, _valid_upto) têm estado de entrada garantidamente correto
+        self._valid_upto = 0
+        # Contadores para medir o trabalho feito (depuração / overlay)
+        self.tokenized_lines = 0
+        self.rendered_lines = 0
+
+    def set_lines(self, lines):
+        """Substitui todo o conteúdo"""
+        self.lines = [_Line(text) for text in lines]
+        self._valid_upto = 0
+
+    def splice(self, first, old_count, new_lines):
+        """Troca as linhas [first, first + old_count) por new_lines
+
+        Só as linhas novas precisam ser tokenizadas; as seguintes mantêm o
+        cache e só são refeitas se o estado de entrada delas mudar.
+        """
+        self.lines[first:first + old_count] = [_Line(text) for text in new_lines]
+        self._valid_upto = min(self._valid_upto, first)
+
+    def line(self, index):
+        """Retorna a entrada da linha com os tokens atualizados"""
+        self._ensure(index)
+        return self.lines[index]
+
+    def tokens(self, index):
+        """Retorna os spans (início, fim, tipo) da linha, tokenizando se preciso"""
+        return self.line(index).spans
+
+    def render_into(self, surface, x, line, font):
+        """Desenha os spans coloridos de uma linha numa superfície"""
+        text = line.text
+        for start, end, kind in line.spans:
+            if x >= surface.get_width():
+                break
+            color = SYNTAX_COLORS.get(kind, Colors.TEXT_LIGHT)
+            piece = font.render(text[start:end], True, color)
+            surface.blit(piece, (x, 0))
+            x += piece.get_width()
+        self.rendered_lines += 1
+
+    def _ensure(self, index):
+        """Propaga o estado do analisador até a linha indicada"""
+        if index < self._valid_upto:
+            return
+
+        lexer = self.lexer
+        if self._valid_upto:
+            state = self.lines[self._valid_upto - 1].out_state
+        else:
+            state = lexer.initial_state
+
+        for i in range(self._valid_upto, index + 1):
+            line = self.lines[i]
+            if line.spans is None or line.in_state != state:
+                spans, out_state = lexer.tokenize_line(line.text, state)
+                self.tokenized_lines += 1
+                if spans != line.spans:
+                    line.spans = spans
+                line.in_state = state
+                line.out_state = out_state
+            state = line.out_state
+
+        self._valid_upto = index + 1
+
+
+class LineSurfacePool:
+    """Superfícies de linha do mesmo tamanho, reaproveitadas entre linhas
+
+    Quando uma linha sai da área visível a superfície dela volta para o pool
+    e é reutilizada pela próxima linha que entrar, então a quantidade de
+    superfícies criadas depende só da altura do editor.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._free = []
+        self.created = 0
+
+    def acquire(self):
+        """Retorna uma superfície transparente"""
+        if self._free:
+            surface = self._free.pop()
+            surface.fill((0, 0, 0, 0))
+            return surface
+        self.created += 1
+        return pygame.Surface(self.size, pygame.SRCALPHA)
+
+    def release(self, surface):
+        """Devolve uma superfície ao pool"""
+        if surface.get_size() == self.size:
+            self._free.append(surface)
+
+    def resize(self, size):
+        """Troca o tamanho das superfícies (descarta as livres)"""
+        if size != self.size:
+            self.size = size
+            self._free.clear()
@@ -1,2 +1,12 @@
 # Utils package
 from .asset_manager import assets, AssetManager
+from .perf import metrics, PerfMetrics, StartupProfile
+from .timing import FixedTimestep, AnimatedValue
+from .content import content, ContentLibrary
+from .jobs import jobs, JobScheduler, Job, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_IDLE
+from .asset_loader import AssetStreamer, LoadJob
+from .hot_reload import AssetWatcher
+from .audio import audio, AudioEngine
+from .save import SaveStore
+from .profiles import ProfileStore
+from .analytics import analytics, AnalyticsPipeline
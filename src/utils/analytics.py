@@ -0,0 +1,170 @@
+# Eventos de aprendizagem (cenas visitadas, tentativas, dicas, perguntas)
+#
+# emit() roda no loop do jogo e só acrescenta uma tupla a um deque: append e
+# popleft do deque são atômicos no CPython, então produtor e gravador não
+# disputam nenhum lock. A fila tem limite (ANALYTICS_QUEUE): passando de
+# ANALYTICS_SAMPLE_AT da capacidade, só 1 a cada ANALYTICS_SAMPLE_EVERY
+# eventos entra; cheia, o evento é descartado. Os dois casos são contados.
+#
+# Um thread acorda a cada ANALYTICS_FLUSH_INTERVAL segundos (ou antes, quando
+# a fila enche), serializa o lote em NDJSON e grava num arquivo .ndjson.gz. O
+# arquivo troca ao passar de ANALYTICS_FILE_BYTES e só os ANALYTICS_MAX_FILES
+# mais recentes são mantidos.
+
+import gzip
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from src.config import (ANALYTICS, ANALYTICS_DIR, ANALYTICS_QUEUE, ANALYTICS_SAMPLE_AT,
+                        ANALYTICS_SAMPLE_EVERY, ANALYTICS_FLUSH_INTERVAL,
+                        ANALYTICS_FILE_BYTES, ANALYTICS_MAX_FILES)
+from .perf import metrics
+from .save import default_save_dir
+
+
+class AnalyticsPipeline:
+    """Fila limitada de eventos gravada em lotes por um thread"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.enabled = ANALYTICS
+        self.capacity = ANALYTICS_QUEUE
+        self.sample_at = int(ANALYTICS_QUEUE * ANALYTICS_SAMPLE_AT)
+        self.session = uuid.uuid4().hex[:12]
+        self.context = {}          # campos fixos da sessão (ex.: aluno)
+        self.emitted = 0
+        self.sampled = 0           # ignorados pela amostragem com a fila quase cheia
+        self.dropped = 0           # descartados com a fila cheia
+        self.written = 0
+        self._events = deque()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+        self._skip = 0
+        self._files = 0
+
+    def start(self, directory=None, **context):
+        """Começa a gravar (chamado uma vez na inicialização do jogo)"""
+        if not self.enabled or self._thread is not None:
+            return
+        self.directory = Path(directory or ANALYTICS_DIR or default_save_dir().parent / "analytics")
+        self.context = context
+        self._stop = False
+        self._thread = threading.Thread(target=self._writer, name="analytics-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, kind, **fields):
+        """Registra um evento (só enfileira; microssegundos no thread principal)"""
+        if not self.enabled:
+            return
+        size = len(self._events)
+        if size >= self.sample_at:
+            if size >= self.capacity:
+                self.dropped += 1
+                self._wake.set()
+                return
+            self._skip += 1
+            if self._skip % ANALYTICS_SAMPLE_EVERY:
+                self.sampled += 1
+                return
+            self._wake.set()
+        self._events.append((time.time(), kind, fields))
+        self.emitted += 1
+
+    def close(self, timeout=2.0):
+        """Grava o que está na fila e fecha o arquivo (ao sair do jogo)"""
+        if self._thread is None:
+            return
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def describe(self):
+        return (f"[Analytics] {self.emitted} eventos, {self.written} gravados, "
+                f"{self.sampled} fora da amostra, {self.dropped} descartados")
+
+    # ------------------------------------------------------------------
+    # Gravador (thread de fundo)
+    # ------------------------------------------------------------------
+    def _writer(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"[Analytics] Eventos não serão gravados ({self.directory}): {e}")
+            self.enabled = False
+            return
+
+        output = None
+        try:
+            while True:
+                self._wake.wait(ANALYTICS_FLUSH_INTERVAL)
+                self._wake.clear()
+                stop = self._stop
+                lines = self._drain()
+                if lines:
+                    if output is None:
+                        output, path = self._open()
+                    output.write(lines)
+                    # Sync flush: o que já foi gravado é legível mesmo se o jogo cair
+                    output.flush()
+                    if path.stat().st_size >= ANALYTICS_FILE_BYTES:
+                        output.close()
+                        output = None
+                if stop:
+                    return
+        except OSError as e:
+            print(f"[Analytics] Erro ao gravar eventos: {e}")
+            self.enabled = False
+        finally:
+            if output is not None:
+                output.close()
+
+    def _drain(self):
+        """Tira todos os eventos da fila e serializa num bloco NDJSON"""
+        start = time.perf_counter()
+        parts = []
+        events = self._events
+        while events:
+            timestamp, kind, fields = events.popleft()
+            record = {"t": round(timestamp, 3), "tipo": kind, "sessao": self.session}
+            record.update(self.context)
+            record.update(fields)
+            parts.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        if not parts:
+            return b""
+        self.written += len(parts)
+        metrics.record("analytics.lote", len(parts))
+        metrics.record("analytics.serializar_ms", (time.perf_counter() - start) * 1000.0)
+        return ("\n".join(parts) + "\n").encode("utf-8")
+
+    def _open(self):
+        """Novo arquivo de eventos, apagando os mais antigos além do limite"""
+        existing = sorted(self.directory.glob("eventos-*.ndjson.gz"))
+        for old in existing[:max(0, len(existing) - ANALYTICS_MAX_FILES + 1)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        self._files += 1
+        path = self.directory / f"eventos-{time.strftime('%Y%m%d-%H%M%S')}-{self.session}-{self._files:03d}.ndjson.gz"
+        return gzip.open(path, "wb", compresslevel=6), path
+
+
+# Singleton global
+analytics = AnalyticsPipeline()
@@ -0,0 +1,128 @@
+# Carregamento de assets em segundo plano
+#
+# Os threads do agendador (jobs) leem os arquivos e decodificam os PNGs (ou
+# mapeiam a entrada do cache de pixels). A conversão para o formato da tela
+# (convert_alpha) precisa do thread principal, então cada resultado volta
+# como continuação de alta prioridade, executada na folga entre os quadros.
+# Assim o loop continua desenhando a tela de carregamento sem nenhum quadro
+# estourar o orçamento.
+
+import time
+
+import pygame
+from .asset_manager import read_resource
+from .asset_pack import PackedFile
+from .jobs import jobs, PRIORITY_HIGH, PRIORITY_IDLE
+from .perf import metrics
+
+
+class LoadJob:
+    """Conjunto de assets sendo carregados (normalmente os pacotes de uma cena)"""
+
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self.cancelled = False
+        self.started = time.perf_counter()
+
+    @property
+    def done(self):
+        return self.completed >= self.total
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+
+
+class AssetStreamer:
+    """Carrega pacotes de assets em threads e instala no thread principal"""
+
+    def __init__(self, asset_manager):
+        self.assets = asset_manager
+        self._in_flight = {}       # (tipo, nome, tamanho) -> jobs esperando esse asset
+        self._jobs = []
+
+    def load_bundles(self, bundles):
+        """Começa a carregar o que falta dos pacotes; retorna o LoadJob"""
+        requests = []
+        for bundle in bundles:
+            requests += self.assets.pending_loads(bundle)
+        requests = list(dict.fromkeys(requests))
+
+        job = LoadJob(len(requests))
+        if job.done:
+            return job
+        self._jobs.append(job)
+
+        # O formato da tela é descoberto aqui, antes de os threads usarem o cache
+        self.assets.pixel_cache.display_format()
+        for kind, name, size, resource in requests:
+            key = (kind, name, size)
+            if key in self._in_flight:
+                self._in_flight[key].append(job)
+                continue
+            self._in_flight[key] = [job]
+            jobs.submit(self._decode, kind, name, size, resource,
+                        then=self._install, priority=PRIORITY_HIGH)
+        return job
+
+    def cancel(self, job):
+        """Desiste de esperar um job (o que já foi decodificado ainda é registrado)"""
+        job.cancelled = True
+        if job in self._jobs:
+            self._jobs.remove(job)
+
+    @property
+    def busy(self):
+        return bool(self._in_flight)
+
+    def _install(self, result):
+        """Continuação no thread principal: converte e registra um asset"""
+        kind, name, size, asset, pending = result
+        if pending is not None:
+            # Decodificada no thread, falta converter para o formato da tela
+            asset = asset.convert_alpha()
+            entry = self.assets.pixel_cache.prepare(_cache_key(name, size), pending, asset)
+            if entry is not None:
+                jobs.submit(self.assets.pixel_cache.write, *entry, priority=PRIORITY_IDLE,
+                            then=lambda shared: self._use_shared(kind, name, size, asset, shared))
+        if asset is not None:
+            self.assets.install(kind, name, size, asset)
+            print(f"[AssetStreamer] Carregado: {_cache_key(name, size)}")
+
+        for job in self._in_flight.pop((kind, name, size), ()):
+            job.completed += 1
+            if job.done and job in self._jobs:
+                self._jobs.remove(job)
+                metrics.record("assets.carga_total_ms", (time.perf_counter() - job.started) * 1000.0)
+
+    def _use_shared(self, kind, name, size, private, shared):
+        """Troca a cópia privada pela publicada em memória compartilhada"""
+        if shared is None:
+            return
+        current = self.assets.images.get(name) if size is None else self.assets.scaled.get((name, size))
+        if current is private:
+            self.assets.install(kind, name, size, shared)
+
+    def _decode(self, kind, name, size, resource):
+        """Executado num thread de fundo"""
+        asset = None
+        pending = None
+        try:
+            source = read_resource(resource)
+            asset = self.assets.pixel_cache.load(_cache_key(name, size), source)
+            if asset is None:
+                asset = pygame.image.load(PackedFile(source, resource), resource)
+                pending = source
+        except Exception as e:
+            # Qualquer erro (não só OSError/pygame.error): a continuação precisa
+            # rodar para tirar o asset de _in_flight e concluir o LoadJob
+            print(f"[AssetStreamer] Erro ao carregar {resource}: {e}")
+            asset = None
+            pending = None
+        return kind, name, size, asset, pending
+
+
+def _cache_key(name, size):
+    """Mesmo nome usado pelo AssetManager no cache de pixels"""
+    return name if size is None else f"{name}@{size[0]}x{size[1]}"
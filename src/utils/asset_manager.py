@@ -1,9 +1,17 @@
 # Gerenciador de assets do jogo
 
+import json
 import pygame
 import os
 import sys
+import time
 from pathlib import Path
+from src.config import ASSET_PACK, PIXEL_CACHE, SHARED_ASSETS, ASSET_UNLOAD_GRACE
+from .asset_pack import AssetPack, PackedFile
+from .pixel_cache import PixelCache
+from .shared_pixels import SharedPixels
+from .image_variants import VARIANTS_DIR, resize, variant_file
+from .perf import metrics
 
 
 def get_resource_path(relative_path):
@@ -15,6 +23,89 @@ def get_resource_path(relative_path):
     return Path(__file__).parent.parent.parent / relative_path
 
 
+_asset_pack = None
+_asset_pack_checked = False
+
+
+def _find_asset_pack():
+    """Localiza o assets.pack: variável de ambiente ou, no executável, ao lado dele ou embutido"""
+    if ASSET_PACK:
+        return Path(ASSET_PACK)
+    if getattr(sys, "frozen", False):
+        for candidate in (Path(sys.executable).parent / "assets.pack", get_resource_path("assets.pack")):
+            if candidate.exists():
+                return candidate
+    return None
+
+
+def get_asset_pack():
+    """Retorna o pacote único de assets aberto (None = arquivos soltos em assets/)"""
+    global _asset_pack, _asset_pack_checked
+    if not _asset_pack_checked:
+        _asset_pack_checked = True
+        path = _find_asset_pack()
+        if path is not None:
+            try:
+                _asset_pack = AssetPack(path)
+                print(f"[AssetManager] Usando pacote de assets: {path}")
+            except (OSError, ValueError) as e:
+                print(f"[AssetManager] Erro ao abrir pacote de assets {path}: {e}")
+    return _asset_pack
+
+
+def list_resources(prefix):
+    """Caminhos relativos (ex.: "assets/images/ui/button.png") dos arquivos sob prefix"""
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.names(prefix.rstrip("/") + "/")
+
+    root = get_resource_path(prefix)
+    if not root.exists():
+        return []
+    resources = []
+    for folder, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(names):
+            if not name.startswith("."):
+                relative = Path(folder, name).relative_to(root).as_posix()
+                resources.append(f"{prefix.rstrip('/')}/{relative}")
+    return resources
+
+
+def resource_exists(relative_path):
+    pack = get_asset_pack()
+    if pack is not None:
+        return relative_path in pack
+    return get_resource_path(relative_path).exists()
+
+
+def open_resource(relative_path):
+    """Abre um recurso em modo binário, do pacote ou do disco"""
+    pack = get_asset_pack()
+    if pack is not None:
+        if relative_path not in pack:
+            raise FileNotFoundError(relative_path)
+        return pack.open(relative_path)
+    return open(get_resource_path(relative_path), "rb")
+
+
+def read_resource(relative_path):
+    """Conteúdo do recurso: memoryview sobre o pacote ou bytes lidos do disco"""
+    buffer = resource_buffer(relative_path)
+    if buffer is not None:
+        return buffer
+    with open(get_resource_path(relative_path), "rb") as f:
+        return f.read()
+
+
+def resource_buffer(relative_path):
+    """Bytes do recurso direto do pacote mapeado (None sem pacote ou se não existir)"""
+    pack = get_asset_pack()
+    if pack is not None and relative_path in pack:
+        return pack.buffer(relative_path)
+    return None
+
+
 class AssetManager:
     """Gerencia todos os assets do jogo (imagens, sons, fontes)"""
     
@@ -32,23 +123,54 @@ class AssetManager:
             
         self._initialized = True
         self.images = {}
-        self.sounds = {}
+        self.image_files = {}     # nome -> caminho do PNG original (carregado sob demanda)
+        self.variants = {}        # nome -> {"source", "variants", "original"} (variants/index.json)
+        self.scaled = {}          # (nome, (largura, altura)) -> superfície no tamanho pedido
+        self.sound_files = {}     # nome -> caminho do efeito (decodificado pelo audio.py)
+        self.music_files = {}     # nome -> caminho da música (tocada em streaming, ver audio.py)
         self.fonts = {}
         self.base_path = get_resource_path("assets")
         
+        # Pacotes por cena (assets/data/bundles.json) e contagem de referências
+        self.bundles = {}
+        self.bundle_refs = {}     # pacote -> cenas que o adquiriram
+        self.refcounts = {}       # asset -> pacotes adquiridos que o contêm
+        self.idle_since = {}      # asset sem referências -> último uso
+        self.unload_grace = ASSET_UNLOAD_GRACE
+        self._memory_dirty = True
+        self.pixel_cache = PixelCache(shared=SharedPixels() if SHARED_ASSETS else None)
+        self.pixel_cache.enabled = PIXEL_CACHE
+        
+        # Funções (nome) chamadas depois que um asset é recarregado (hot reload),
+        # para quem guarda superfícies derivadas (quadros recortados, ícones)
+        self.reload_listeners = []
+        
     def load_all_assets(self):
-        """Carrega todos os assets do jogo"""
+        """Registra os assets do jogo e carrega os essenciais (pacote "core")
+        
+        As demais imagens são carregadas quando uma cena adquire o pacote que
+        as contém (acquire_bundle) ou no primeiro get_image. Os efeitos só são
+        decodificados pelo AudioEngine, no cache limitado em bytes dele.
+        """
+        self._load_bundles()
         self._load_images()
         self._load_sounds()
         self._load_fonts()
+        self.acquire_bundle("core")
         self._create_placeholder_assets()
         
+    def _load_bundles(self):
+        """Lê a definição dos pacotes de assets de cada cena"""
+        if resource_exists("assets/data/bundles.json"):
+            with open_resource("assets/data/bundles.json") as f:
+                self.bundles = json.load(f)["bundles"]
+        
     def _load_images(self):
-        """Carrega imagens das subpastas de assets/images/"""
-        images_path = self.base_path / "images"
+        """Registra as imagens das subpastas de assets/images/"""
+        image_files = list_resources("assets/images")
         
-        if not images_path.exists():
-            print(f"[AssetManager] Pasta de imagens não encontrada: {images_path}")
+        if not image_files:
+            print(f"[AssetManager] Pasta de imagens não encontrada: {self.base_path / 'images'}")
             return
             
         # Estrutura esperada:
@@ -62,24 +184,49 @@ class AssetManager:
         
         image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
         
-        for folder in images_path.iterdir():
-            if folder.is_dir():
-                for image_file in folder.iterdir():
-                    if image_file.suffix.lower() in image_extensions:
-                        name = image_file.stem  # Nome sem extensão
-                        try:
-                            img = pygame.image.load(str(image_file)).convert_alpha()
-                            self.images[name] = img
-                            print(f"[AssetManager] Imagem carregada: {name}")
-                        except pygame.error as e:
-                            print(f"[AssetManager] Erro ao carregar {image_file}: {e}")
+        self._load_variant_index()
+        
+        for image_file in image_files:
+            path = Path(image_file)
+            # Só arquivos dentro de uma subpasta (assets/images/<pasta>/<arquivo>)
+            if len(path.parts) == 4 and path.suffix.lower() in image_extensions:
+                name = path.stem  # Nome sem extensão
+                self.image_files[name] = image_file
                             
+    def _load_variant_index(self):
+        """Lê o índice das variantes geradas no build (se existir)"""
+        if not resource_exists(f"{VARIANTS_DIR}/index.json"):
+            return
+        with open_resource(f"{VARIANTS_DIR}/index.json") as f:
+            self.variants = json.load(f)["images"]
+            
+    def _load_original(self, name):
+        """Decodifica o PNG original de uma imagem registrada"""
+        image_file = self.image_files[name]
+        try:
+            self.images[name] = self._load_image(name, image_file)
+            print(f"[AssetManager] Imagem carregada: {name}")
+        except (OSError, pygame.error) as e:
+            print(f"[AssetManager] Erro ao carregar {image_file}: {e}")
+        self._memory_dirty = True
+        return self.images.get(name)
+        
+    def _load_image(self, name, image_file):
+        """Decodifica a imagem ou a lê já decodificada do cache de pixels"""
+        source = read_resource(image_file)
+        img = self.pixel_cache.load(name, source)
+        if img is None:
+            img = pygame.image.load(PackedFile(source, image_file), image_file).convert_alpha()
+            # Publicada em memória compartilhada: usa o segmento no lugar da cópia privada
+            img = self.pixel_cache.store(name, source, img) or img
+        return img
+        
     def _load_sounds(self):
-        """Carrega sons e músicas de assets/sounds/"""
-        sounds_path = self.base_path / "sounds"
+        """Registra sons e músicas de assets/sounds/"""
+        sound_files = list_resources("assets/sounds")
         
-        if not sounds_path.exists():
-            print(f"[AssetManager] Pasta de sons não encontrada: {sounds_path}")
+        if not sound_files:
+            print(f"[AssetManager] Pasta de sons não encontrada: {self.base_path / 'sounds'}")
             return
             
         # Estrutura esperada:
@@ -90,23 +237,20 @@ class AssetManager:
         
         sound_extensions = {'.wav', '.ogg', '.mp3'}
         
-        for folder in sounds_path.iterdir():
-            if folder.is_dir():
-                for sound_file in folder.iterdir():
-                    if sound_file.suffix.lower() in sound_extensions:
-                        name = sound_file.stem
-                        try:
-                            sound = pygame.mixer.Sound(str(sound_file))
-                            self.sounds[name] = sound
-                            print(f"[AssetManager] Som carregado: {name}")
-                        except pygame.error as e:
-                            print(f"[AssetManager] Erro ao carregar {sound_file}: {e}")
-        
+        for sound_file in sound_files:
+            path = Path(sound_file)
+            if len(path.parts) == 4 and path.suffix.lower() in sound_extensions:
+                # Músicas nunca são decodificadas inteiras na memória
+                if path.parts[2] == "music":
+                    self.music_files[path.stem] = sound_file
+                else:
+                    self.sound_files[path.stem] = sound_file
+                
     def _create_placeholder_assets(self):
         """Cria assets placeholder apenas para os que não foram carregados"""
         
         # Só cria placeholder se não existe o asset real
-        if "csharp_icon" not in self.images:
+        if not self.has_image("csharp_icon"):
             module_colors = {
                 "csharp": (100, 200, 100),
                 "python": (180, 100, 200),
@@ -115,25 +259,25 @@ class AssetManager:
             }
             
             for module, color in module_colors.items():
-                if f"{module}_icon" not in self.images:
+                if not self.has_image(f"{module}_icon"):
                     surface = pygame.Surface((100, 100), pygame.SRCALPHA)
                     pygame.draw.circle(surface, color, (50, 50), 45)
                     pygame.draw.circle(surface, (255, 255, 255), (50, 50), 35, 3)
                     self.images[f"{module}_icon"] = surface
             
         # Placeholder para coração
-        if "heart_full" not in self.images:
+        if not self.has_image("heart_full"):
             heart = pygame.Surface((30, 30), pygame.SRCALPHA)
             self._draw_heart(heart, (220, 20, 60))
             self.images["heart_full"] = heart
         
-        if "heart_empty" not in self.images:
+        if not self.has_image("heart_empty"):
             heart_empty = pygame.Surface((30, 30), pygame.SRCALPHA)
             self._draw_heart(heart_empty, (80, 80, 80))
             self.images["heart_empty"] = heart_empty
         
         # Placeholder para personagem
-        if "player" not in self.images:
+        if not self.has_image("player"):
             player = pygame.Surface((64, 64), pygame.SRCALPHA)
             # Corpo
             pygame.draw.rect(player, (255, 140, 0), (20, 25, 24, 30))  # Jaqueta laranja
@@ -145,7 +289,7 @@ class AssetManager:
             self.images["player"] = player
         
         # Placeholder para portal
-        if "portal" not in self.images:
+        if not self.has_image("portal"):
             portal = pygame.Surface((120, 150), pygame.SRCALPHA)
             for i in range(5):
                 alpha = 255 - i * 40
@@ -154,7 +298,7 @@ class AssetManager:
             self.images["portal"] = portal
         
         # Placeholder para NPC assistente (CinthIA)
-        if "assistant" not in self.images:
+        if not self.has_image("assistant"):
             assistant = pygame.Surface((80, 80), pygame.SRCALPHA)
             pygame.draw.circle(assistant, (255, 200, 180), (40, 30), 20)  # Rosto
             pygame.draw.ellipse(assistant, (139, 69, 19), (20, 10, 40, 25))  # Cabelo
@@ -162,7 +306,7 @@ class AssetManager:
             self.images["assistant"] = assistant
         
         # Fundo do vilarejo (hexagonal com madeira)
-        if "village_bg" not in self.images:
+        if not self.has_image("village_bg"):
             village_bg = pygame.Surface((1280, 720))
             village_bg.fill((200, 200, 220))  # Fundo claro
             # Desenhar hexágono de madeira
@@ -172,7 +316,7 @@ class AssetManager:
             self.images["village_bg"] = village_bg
         
         # Fundo espacial para menu
-        if "space_bg" not in self.images:
+        if not self.has_image("space_bg"):
             space_bg = pygame.Surface((1280, 720))
             space_bg.fill((15, 10, 30))
             # Adicionar estrelas
@@ -210,33 +354,35 @@ class AssetManager:
         
     def _load_fonts(self):
         """Carrega as fontes do jogo"""
-        fonts_path = self.base_path / "fonts"
-        
         # Tenta carregar pixel.otf, pixel.ttf, ou usa None (fonte padrão)
-        pixel_font_path = fonts_path / "pixel.otf"
-        if not pixel_font_path.exists():
-            pixel_font_path = fonts_path / "pixel.ttf"
+        pixel_font_path = "assets/fonts/pixel.otf"
+        if not resource_exists(pixel_font_path):
+            pixel_font_path = "assets/fonts/pixel.ttf"
             
-        font_source = str(pixel_font_path) if pixel_font_path.exists() else None
+        font_source = pixel_font_path if resource_exists(pixel_font_path) else None
         
         if font_source:
-            print(f"[AssetManager] Carregando fonte personalizada: {pixel_font_path.name}")
+            print(f"[AssetManager] Carregando fonte personalizada: {Path(pixel_font_path).name}")
         else:
             print("[AssetManager] Usando fonte padrão do sistema")
 
+        # Cada tamanho lê a fonte por um arquivo próprio (a fonte é lida sob demanda)
+        def source(path):
+            return open_resource(path) if path else None
+
         try:
-            self.fonts["tiny"] = pygame.font.Font(font_source, 16)
-            self.fonts["small"] = pygame.font.Font(font_source, 20)
-            self.fonts["medium"] = pygame.font.Font(font_source, 28)
-            self.fonts["large"] = pygame.font.Font(font_source, 36)
-            self.fonts["title"] = pygame.font.Font(font_source, 52)
-            self.fonts["huge"] = pygame.font.Font(font_source, 72)
+            self.fonts["tiny"] = pygame.font.Font(source(font_source), 16)
+            self.fonts["small"] = pygame.font.Font(source(font_source), 20)
+            self.fonts["medium"] = pygame.font.Font(source(font_source), 28)
+            self.fonts["large"] = pygame.font.Font(source(font_source), 36)
+            self.fonts["title"] = pygame.font.Font(source(font_source), 52)
+            self.fonts["huge"] = pygame.font.Font(source(font_source), 72)
             
             # Para código, idealmente usamos uma fonte monospace diferente, mas por enquanto usaremos a mesma ou padrão
             # Se tiver uma fonte específica para código (ex: code.ttf), tente carregar aqui
-            code_font_path = fonts_path / "code.ttf"
-            code_font_source = str(code_font_path) if code_font_path.exists() else None
-            self.fonts["code"] = pygame.font.Font(code_font_source, 22)
+            code_font_path = "assets/fonts/code.ttf"
+            code_font_source = code_font_path if resource_exists(code_font_path) else None
+            self.fonts["code"] = pygame.font.Font(source(code_font_source), 22)
             
         except Exception as e:
             print(f"[AssetManager] Erro ao carregar fontes: {e}")
@@ -249,17 +395,252 @@ class AssetManager:
             self.fonts["huge"] = pygame.font.Font(None, 72)
             self.fonts["code"] = pygame.font.Font(None, 22)
         
-    def get_image(self, name):
-        """Retorna uma imagem pelo nome"""
-        return self.images.get(name)
+    def has_image(self, name):
+        """Se a imagem existe (carregada ou disponível para carregar)"""
+        return name in self.images or name in self.image_files
+        
+    def get_image(self, name, size=None):
+        """Retorna uma imagem pelo nome
+        
+        Com `size`, retorna a imagem nesse tamanho a partir da variante
+        pré-escalada mais próxima (declarada em assets/data/image_sizes.json).
+        O resultado fica em cache, então desenhar a cada quadro não escala nada.
+        """
+        if name in self.idle_since:
+            self.idle_since[name] = time.monotonic()
+            
+        if size is None:
+            img = self.images.get(name)
+            if img is None and name in self.image_files:
+                img = self._load_original(name)
+                self._track_unreferenced(name)
+            return img
+            
+        size = (int(size[0]), int(size[1]))
+        img = self.scaled.get((name, size))
+        if img is None:
+            img = self._scaled_image(name, size)
+            if img is not None:
+                self.scaled[(name, size)] = img
+                self._memory_dirty = True
+                self._track_unreferenced(name)
+        return img
+        
+    def _scaled_image(self, name, size):
+        """Ajusta a partir da menor versão (variante ou original) que cobre o tamanho"""
+        info = self.variants.get(name)
+        source = tuple(info["source"]) if info else None
+        options = [tuple(variant) for variant in info["variants"]] + [source] if info else []
+        covering = [option for option in options if option[0] >= size[0] and option[1] >= size[1]]
+        best = min(covering, key=lambda option: option[0] * option[1]) if covering else source
+        
+        if best is None or best == source:
+            # Sem variantes (build não gerado) ou nenhuma menor que o original
+            original = self.get_image(name)
+            return resize(original, size) if original is not None else None
+        variant = self.scaled.get((name, best)) or self._load_variant(name, best)
+        return resize(variant, size) if variant is not None else None
+        
+    def _load_variant(self, name, size):
+        """Decodifica (ou lê do cache de pixels) uma variante gerada no build"""
+        key = f"{name}@{size[0]}x{size[1]}"
+        try:
+            img = self._load_image(key, variant_file(name, size))
+        except (OSError, pygame.error) as e:
+            print(f"[AssetManager] Erro ao carregar variante {key}: {e}")
+            return None
+        self.scaled[(name, size)] = img
+        return img
         
     def get_font(self, size="medium"):
         """Retorna uma fonte pelo tamanho"""
         return self.fonts.get(size, self.fonts["medium"])
         
-    def get_sound(self, name):
-        """Retorna um som pelo nome"""
-        return self.sounds.get(name)
+    # ------------------------------------------------------------------
+    # Pacotes por cena com contagem de referências
+    # ------------------------------------------------------------------
+    def acquire_bundle(self, bundle, load=True):
+        """Segura os assets de um pacote e os carrega (se preciso)
+        
+        Com load=False só as referências são contadas; quem chama carrega o
+        que falta (pending_loads) em segundo plano, como o AssetStreamer.
+        """
+        self.bundle_refs[bundle] = self.bundle_refs.get(bundle, 0) + 1
+        for name in self.bundles.get(bundle, ()):
+            self.refcounts[name] = self.refcounts.get(name, 0) + 1
+            self.idle_since.pop(name, None)
+            if load:
+                self._ensure_loaded(name)
+            
+    def release_bundle(self, bundle):
+        """Solta os assets de um pacote; os sem referências saem após a carência"""
+        if not self.bundle_refs.get(bundle):
+            return
+        self.bundle_refs[bundle] -= 1
+        now = time.monotonic()
+        for name in self.bundles.get(bundle, ()):
+            self.refcounts[name] -= 1
+            if self.refcounts[name] <= 0:
+                del self.refcounts[name]
+                self.idle_since[name] = now
+                
+    def pending_loads(self, bundle):
+        """O que falta carregar do pacote: lista de (tipo, nome, tamanho, arquivo)
+        
+        O tamanho é None para o original e (largura, altura) para variantes.
+        """
+        requests = []
+        for name in self.bundles.get(bundle, ()):
+            if name in self.image_files:
+                info = self.variants.get(name)
+                if info and not info["original"] and info.get("sizes"):
+                    for size in info["sizes"]:
+                        size = tuple(size)
+                        if (name, size) in self.scaled:
+                            continue
+                        if list(size) in info["variants"]:
+                            requests.append(("image", name, size, variant_file(name, size)))
+                        elif name not in self.images:
+                            requests.append(("image", name, None, self.image_files[name]))
+                elif name not in self.images:
+                    requests.append(("image", name, None, self.image_files[name]))
+        return list(dict.fromkeys(requests))
+        
+    def install(self, kind, name, size, asset):
+        """Registra um asset carregado fora do AssetManager (AssetStreamer)"""
+        if size is None:
+            self.images[name] = asset
+        else:
+            self.scaled[(name, size)] = asset
+        self._memory_dirty = True
+        self._track_unreferenced(name)
+        
+    def bundle_assets(self, bundle):
+        """Nomes dos assets de um pacote"""
+        return list(self.bundles.get(bundle, ()))
+        
+    def _ensure_loaded(self, name):
+        """Carrega um asset do pacote nos tamanhos em que ele é desenhado"""
+        if name in self.image_files:
+            info = self.variants.get(name)
+            if info and not info["original"] and info.get("sizes"):
+                for size in info["sizes"]:
+                    self.get_image(name, size)
+            else:
+                self.get_image(name)
+            
+    def _track_unreferenced(self, name):
+        """Asset carregado fora de um pacote: sai da memória se ficar sem uso"""
+        if name not in self.refcounts:
+            self.idle_since.setdefault(name, time.monotonic())
+            
+    def collect(self, now=None):
+        """Descarrega os assets sem referências e sem uso há mais que a carência
+        
+        Chamado uma vez por quadro pelo Game; retorna os nomes descarregados.
+        """
+        if now is None:
+            now = time.monotonic()
+        unloaded = [name for name, since in self.idle_since.items()
+                    if now - since >= self.unload_grace]
+        for name in unloaded:
+            del self.idle_since[name]
+            self.unload(name)
+        if unloaded or self._memory_dirty:
+            self._memory_dirty = False
+            resident = self.resident_bytes() / (1024 * 1024)
+            metrics.record("assets.residentes_mb", resident)
+            metrics.values["assets.pico_mb"] = max(metrics.get("assets.pico_mb", 0.0), resident)
+        return unloaded
+        
+    def unload(self, name):
+        """Remove um asset da memória (ele continua registrado e pode voltar)"""
+        self.images.pop(name, None)
+        for key in [key for key in self.scaled if key[0] == name]:
+            del self.scaled[key]
+        self._memory_dirty = True
+        print(f"[AssetManager] Asset descarregado: {name}")
+        
+    def reload(self, relative_path):
+        """Recarrega um arquivo alterado no disco (hot reload); retorna o nome
+        
+        Roda no thread principal entre quadros: cada dicionário troca a
+        superfície antiga pela nova numa única atribuição, e as versões
+        escaladas residentes são refeitas a partir da nova imagem.
+        """
+        path = Path(relative_path)
+        if len(path.parts) != 4:
+            return None
+        name = path.stem
+        
+        try:
+            if path.parts[1] == "images":
+                self.image_files[name] = relative_path
+                # As variantes geradas no build são da versão antiga
+                self.variants.pop(name, None)
+                sizes = [size for key, size in self.scaled if key == name]
+                if name in self.images or sizes:
+                    img = self._load_image(name, relative_path)
+                    self.images[name] = img
+                    for size in sizes:
+                        self.scaled[(name, size)] = resize(img, size)
+            elif path.parts[1] == "sounds":
+                if path.parts[2] == "music":
+                    # Vale na próxima vez que a música começar
+                    self.music_files[name] = relative_path
+                    return name
+                # O AudioEngine (reload_listeners) decodifica de novo no próximo play
+                self.sound_files[name] = relative_path
+            else:
+                return None
+        except (OSError, pygame.error) as e:
+            print(f"[AssetManager] Erro ao recarregar {relative_path}: {e}")
+            return None
+            
+        self._memory_dirty = True
+        for listener in self.reload_listeners:
+            listener(name)
+        return name
+        
+    # ------------------------------------------------------------------
+    # Depuração
+    # ------------------------------------------------------------------
+    def resident(self):
+        """Assets em memória: lista de (tipo, nome, bytes, referências)"""
+        entries = []
+        for name, img in self.images.items():
+            entries.append(("imagem", name, _surface_bytes(img), self.refcounts.get(name, 0)))
+        for (name, size), img in self.scaled.items():
+            if img is not self.images.get(name):
+                entries.append(("imagem", f"{name}@{size[0]}x{size[1]}", _surface_bytes(img),
+                                self.refcounts.get(name, 0)))
+        return entries
+        
+    def resident_bytes(self):
+        return sum(entry[2] for entry in self.resident())
+        
+    def describe(self):
+        """Listagem legível dos assets residentes e dos pacotes adquiridos"""
+        lines = ["[AssetManager] Pacotes: " + ", ".join(
+            f"{bundle}({count})" for bundle, count in self.bundle_refs.items() if count)]
+        for kind, name, size, refs in sorted(self.resident(), key=lambda entry: -entry[2]):
+            idle = " (sem uso)" if name.split("@")[0] in self.idle_since else ""
+            lines.append(f"  {kind:<6} {name:<28} {size / 1024:9.1f} KB  refs {refs}{idle}")
+        lines.append(f"  total {self.resident_bytes() / (1024 * 1024):.1f} MB")
+        return "\n".join(lines)
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _mixer_bytes_per_second():
+    """Bytes por segundo de áudio decodificado no formato do mixer"""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    frequency, size, channels = init
+    return frequency * abs(size) // 8 * channels
 
 
 # Singleton global
@@ -0,0 +1,155 @@
+# Arquivo único com todos os assets, lido com mmap
+#
+# O executável do PyInstaller leva um único assets.pack no lugar de centenas
+# de arquivos soltos. Em tempo de execução o pacote é mapeado em memória e
+# cada entrada é lida direto dos bytes mapeados (imagens, fontes e sons são
+# decodificados a partir de um objeto arquivo sobre o mapeamento), sem
+# extrair nada para o disco.
+#
+# Gerar o pacote (etapa de build):
+#     python -m src.utils.asset_pack
+#
+# Formato (little endian):
+#   cabeçalho  _HEADER
+#   dados      conteúdo de cada arquivo, alinhado em ALIGNMENT bytes
+#   índice     JSON {caminho relativo: [offset, tamanho]}
+
+import fnmatch
+import io
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"CFPK"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIII")   # magic, versão, flags, entradas, offset e tamanho do índice
+
+# Alinhamento das entradas (permite ler buffers de pixels direto do mapeamento)
+ALIGNMENT = 64
+
+# Arquivos que não vão para o pacote (variantes não usadas e arquivos de apoio)
+EXCLUDE_PATTERNS = ("*_.png", ".*", "*.md")
+
+
+class PackedFile(io.RawIOBase):
+    """Objeto arquivo somente leitura sobre uma entrada do pacote (sem cópia)"""
+
+    def __init__(self, view, name):
+        super().__init__()
+        self._view = view
+        self._position = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), len(self._view) - self._position)
+        if count <= 0:
+            return 0
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+class AssetPack:
+    """Leitor do pacote mapeado em memória"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _flags, count, index_off, index_len = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Pacote de assets inválido: {path}")
+        self.entries = json.loads(self._data[index_off:index_off + index_len].decode("utf-8"))
+        if len(self.entries) != count:
+            raise ValueError(f"Índice do pacote de assets corrompido: {path}")
+        self._view = memoryview(self._data)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self, prefix=""):
+        """Caminhos das entradas que começam com o prefixo, em ordem"""
+        return sorted(name for name in self.entries if name.startswith(prefix))
+
+    def size(self, name):
+        return self.entries[name][1]
+
+    def buffer(self, name):
+        """memoryview com os bytes da entrada (aponta para o mapeamento)"""
+        offset, size = self.entries[name]
+        return self._view[offset:offset + size]
+
+    def open(self, name):
+        """Abre a entrada como arquivo binário"""
+        return PackedFile(self.buffer(name), name)
+
+
+def collect_files(root, exclude=EXCLUDE_PATTERNS):
+    """Arquivos sob root que entram no pacote: lista de (caminho relativo, caminho)"""
+    files = []
+    for folder, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(names):
+            if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+                continue
+            path = os.path.join(folder, name)
+            relative = os.path.relpath(path, os.path.dirname(root)).replace(os.sep, "/")
+            files.append((relative, path))
+    return files
+
+
+def build_pack(root, output, exclude=EXCLUDE_PATTERNS):
+    """Grava o pacote com os arquivos de root (ex.: assets/) e retorna (entradas, bytes)"""
+    files = collect_files(str(root), exclude)
+    entries = {}
+    with open(output, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        for relative, path in files:
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            with open(path, "rb") as source:
+                data = source.read()
+            entries[relative] = [f.tell(), len(data)]
+            f.write(data)
+
+        index = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+        index_off = f.tell()
+        f.write(index)
+        total = f.tell()
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(entries), index_off, len(index)))
+    return len(entries), total
+
+
+def main():
+    import argparse
+    from .asset_manager import get_resource_path
+
+    parser = argparse.ArgumentParser(description="Gera o pacote único de assets")
+    parser.add_argument("--output", default=str(get_resource_path("assets.pack")))
+    args = parser.parse_args()
+
+    count, total = build_pack(get_resource_path("assets"), args.output)
+    print(f"[AssetPack] {count} arquivos, {total / 1024 / 1024:.1f} MB -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
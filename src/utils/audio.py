@@ -0,0 +1,195 @@
+# Áudio do jogo: música em streaming, efeitos sob demanda e canais fixos
+#
+# Músicas (assets/sounds/music/) nunca viram pygame.mixer.Sound: tocam por
+# pygame.mixer.music, que decodifica aos poucos. Trocar de cena faz a música
+# atual sumir (fade out) e a da nova cena entrar (fade in). O mixer só tem um
+# stream de música, então a transição é sequencial e não sobreposta.
+#
+# Efeitos (sfx/, voice/) são decodificados no primeiro play() e guardados num
+# cache LRU limitado em bytes de PCM (SFX_CACHE_BYTES), então nem o tempo de
+# inicialização nem a memória crescem com a quantidade de sons.
+#
+# Todos os canais do mixer são reservados na inicialização e divididos por
+# categoria (AUDIO_CHANNELS). Um som só usa os canais da sua categoria e só
+# interrompe um som de prioridade menor ou igual: cliques e digitação rápidos
+# nunca roubam o canal de uma fala, e nada é criado durante o jogo.
+
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pygame
+from src.config import AUDIO_CHANNELS, SFX_CACHE_BYTES, MUSIC_FADE_MS, MUSIC_VOLUME
+from .asset_manager import assets, open_resource, _mixer_bytes_per_second
+from .perf import metrics
+
+
+class AudioEngine:
+    """Música por cena, efeitos com cache em bytes e canais por prioridade"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.enabled = False
+        self.pools = {}            # categoria -> [Channel]
+        self._priorities = {}      # id do Channel -> prioridade do som tocando
+        self._cache = OrderedDict()  # nome -> (Sound, bytes)
+        self.cache_bytes = 0
+        self.cache_budget = SFX_CACHE_BYTES
+        self.dropped = 0           # sons ignorados por falta de canal
+
+        # Música: atual, próxima (esperando o fade out) e o arquivo aberto
+        self.music_volume = MUSIC_VOLUME
+        self.music = None
+        self._next_music = None
+        self._fade_left = 0.0
+        self._fade_total = 0.0
+        self._music_file = None
+
+        # Efeito alterado no disco (hot reload) é decodificado de novo no próximo play
+        assets.reload_listeners.append(self.forget)
+
+    def init(self):
+        """Reserva e divide os canais do mixer (chamado depois de pygame.mixer.init)"""
+        if not pygame.mixer.get_init():
+            print("[Audio] Mixer indisponível; sem som")
+            return False
+        total = sum(AUDIO_CHANNELS.values())
+        pygame.mixer.set_num_channels(total)
+        # Todos reservados: Sound.play() sem canal nunca pega um canal do pool
+        pygame.mixer.set_reserved(total)
+        index = 0
+        for category, count in AUDIO_CHANNELS.items():
+            self.pools[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        self.enabled = True
+        return True
+
+    # ------------------------------------------------------------------
+    # Efeitos
+    # ------------------------------------------------------------------
+    def play(self, name, category="sfx", priority=0, volume=1.0):
+        """Toca um efeito num canal da categoria; retorna o Channel (ou None)"""
+        if not self.enabled or name not in assets.sound_files:
+            return None
+        sound = self._sound(name)
+        if sound is None:
+            return None
+        channel = self._channel(category, priority)
+        if channel is None:
+            self.dropped += 1
+            return None
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._priorities[id(channel)] = priority
+        return channel
+
+    def _channel(self, category, priority):
+        """Canal livre da categoria, ou o de menor prioridade que pode ser interrompido"""
+        pool = self.pools.get(category) or self.pools.get("sfx", ())
+        victim = None
+        for channel in pool:
+            if not channel.get_busy():
+                return channel
+            current = self._priorities.get(id(channel), 0)
+            if current <= priority and (victim is None or current < self._priorities.get(id(victim), 0)):
+                victim = channel
+        return victim
+
+    def _sound(self, name):
+        """Som decodificado, do cache LRU ou lido agora"""
+        cached = self._cache.get(name)
+        if cached is not None:
+            self._cache.move_to_end(name)
+            return cached[0]
+
+        start = time.perf_counter()
+        try:
+            with open_resource(assets.sound_files[name]) as f:
+                sound = pygame.mixer.Sound(file=f)
+        except (OSError, pygame.error) as e:
+            print(f"[Audio] Erro ao carregar {name}: {e}")
+            return None
+        size = int(sound.get_length() * _mixer_bytes_per_second())
+        self._cache[name] = (sound, size)
+        self.cache_bytes += size
+        # Descarta os menos usados, mas nunca o que acabou de entrar
+        while self.cache_bytes > self.cache_budget and len(self._cache) > 1:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self.cache_bytes -= evicted
+        metrics.record("audio.decodificar_ms", (time.perf_counter() - start) * 1000.0)
+        metrics.record("audio.cache_mb", self.cache_bytes / (1024 * 1024))
+        return sound
+
+    def forget(self, name):
+        """Tira um efeito do cache (ex.: arquivo recarregado)"""
+        entry = self._cache.pop(name, None)
+        if entry is not None:
+            self.cache_bytes -= entry[1]
+
+    # ------------------------------------------------------------------
+    # Música
+    # ------------------------------------------------------------------
+    def play_music(self, name, fade_ms=MUSIC_FADE_MS):
+        """Troca a música com fade (None ou nome desconhecido: só silencia)"""
+        if not self.enabled:
+            return
+        if name not in assets.music_files:
+            name = None
+        if name == self.music and self._next_music is None:
+            return
+        self._next_music = name
+        if self.music is None or not pygame.mixer.music.get_busy():
+            self._start_next(fade_ms)
+        elif self._fade_left <= 0:
+            self._fade_total = self._fade_left = fade_ms / 1000.0
+
+    def update(self, dt):
+        """Avança o fade out da música atual (chamado uma vez por quadro)"""
+        if self._fade_left <= 0:
+            return
+        self._fade_left -= dt
+        if self._fade_left > 0:
+            pygame.mixer.music.set_volume(self.music_volume * self._fade_left / self._fade_total)
+        else:
+            self._start_next(int(self._fade_total * 1000))
+
+    def _start_next(self, fade_ms):
+        self._fade_left = 0.0
+        pygame.mixer.music.stop()
+        if self._music_file is not None:
+            self._music_file.close()
+            self._music_file = None
+        self.music = self._next_music
+        self._next_music = None
+        if self.music is None:
+            return
+        path = assets.music_files[self.music]
+        try:
+            # O arquivo fica aberto enquanto a música toca (o mixer lê aos poucos)
+            self._music_file = open_resource(path)
+            pygame.mixer.music.load(self._music_file, Path(path).suffix[1:])
+            pygame.mixer.music.set_volume(self.music_volume)
+            pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)
+        except (OSError, pygame.error) as e:
+            print(f"[Audio] Erro ao tocar {path}: {e}")
+            self.music = None
+
+    def describe(self):
+        return (f"[Audio] música {self.music or '-'}, efeitos {len(self._cache)} "
+                f"({self.cache_bytes / 1024:.0f} KB de {self.cache_budget / 1024:.0f} KB), "
+                f"ignorados {self.dropped}")
+
+
+# Singleton global
+audio = AudioEngine()
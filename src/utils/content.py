@@ -0,0 +1,130 @@
+# Pacotes de conteúdo (módulos, lições e desafios) carregados sob demanda
+#
+# Estrutura em assets/content/:
+#   index.json                    módulos (metadados) e áreas do vilarejo
+#   <módulo>/index.json           lições -> ids dos desafios e título de cada um
+#   <módulo>/challenges/<id>.json corpo do desafio: dica, objetivo, código e testes
+#
+# Na inicialização só o índice raiz é lido. O índice de um módulo é lido na
+# primeira vez que o módulo é aberto e o corpo de um desafio só quando ele é
+# jogado (com um cache LRU pequeno), então adicionar desafios não aumenta o
+# tempo de inicialização nem a memória usada.
+
+import json
+from collections import OrderedDict
+
+from .asset_manager import open_resource
+
+
+class ContentLibrary:
+    """Acesso aos pacotes de conteúdo do jogo"""
+
+    _instance = None
+
+    # Quantidade de corpos de desafio mantidos em memória
+    CHALLENGE_CACHE_SIZE = 32
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.base_path = "assets/content"
+        self._root = None
+        self._module_indexes = {}
+        self._challenges = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Índice raiz
+    # ------------------------------------------------------------------
+    def modules(self):
+        """Módulos na ordem do índice: {id: {name, description, color, icon, ...}}"""
+        return self._load_root()["modules"]
+
+    def module(self, module_id):
+        return self.modules().get(module_id)
+
+    def areas(self):
+        """Áreas do vilarejo: {id: {name, description, position}}"""
+        return self._load_root()["areas"]
+
+    def _load_root(self):
+        if self._root is None:
+            data = self._read_json("index.json")
+            for module in data["modules"].values():
+                module["color"] = tuple(module["color"])
+            for area in data["areas"].values():
+                area["position"] = tuple(area["position"])
+            self._root = data
+        return self._root
+
+    # ------------------------------------------------------------------
+    # Índice de cada módulo
+    # ------------------------------------------------------------------
+    def lessons(self, module_id):
+        """Lições do módulo: lista de {title, challenges}"""
+        return self._module_index(module_id)["lessons"]
+
+    def challenge_ids(self, module_id):
+        """Ids dos desafios do módulo, na ordem das lições"""
+        return [challenge_id
+                for lesson in self.lessons(module_id)
+                for challenge_id in lesson["challenges"]]
+
+    def first_challenge(self, module_id):
+        """Id do primeiro desafio do módulo (None se não houver)"""
+        for lesson in self.lessons(module_id):
+            if lesson["challenges"]:
+                return lesson["challenges"][0]
+        return None
+
+    def challenge_title(self, challenge_id):
+        module_id = challenge_id.split("/", 1)[0]
+        entry = self._module_index(module_id)["challenges"].get(challenge_id)
+        return entry["title"] if entry else None
+
+    def _module_index(self, module_id):
+        index = self._module_indexes.get(module_id)
+        if index is None:
+            module = self.module(module_id)
+            if module is None:
+                raise KeyError(f"Módulo desconhecido: {module_id}")
+            index = self._read_json(module["index"])
+            self._module_indexes[module_id] = index
+        return index
+
+    # ------------------------------------------------------------------
+    # Corpo dos desafios
+    # ------------------------------------------------------------------
+    def challenge(self, challenge_id):
+        """Desafio completo: {id, title, hint, objective, code, tests}"""
+        cached = self._challenges.get(challenge_id)
+        if cached is not None:
+            self._challenges.move_to_end(challenge_id)
+            return cached
+
+        module_id = challenge_id.split("/", 1)[0]
+        entry = self._module_index(module_id)["challenges"].get(challenge_id)
+        if entry is None:
+            raise KeyError(f"Desafio desconhecido: {challenge_id}")
+        challenge = self._read_json(f"{module_id}/{entry['file']}")
+
+        self._challenges[challenge_id] = challenge
+        while len(self._challenges) > self.CHALLENGE_CACHE_SIZE:
+            self._challenges.popitem(last=False)
+        return challenge
+
+    def _read_json(self, relative_path):
+        """Lê um JSON do pacote de conteúdo (assets.pack ou arquivo solto)"""
+        with open_resource(f"{self.base_path}/{relative_path}") as f:
+            return json.load(f)
+
+
+# Singleton global
+content = ContentLibrary()
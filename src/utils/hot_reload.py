@@ -0,0 +1,106 @@
+# Recarga de assets alterados sem reiniciar o jogo (modo de desenvolvimento)
+#
+# Com CODEFRONTIER_HOT_RELOAD=1, um thread consulta o mtime dos arquivos de
+# assets/images e assets/sounds a cada HOT_RELOAD_INTERVAL segundos. Um arquivo
+# alterado só é considerado pronto quando o tamanho e o mtime param de mudar
+# entre duas consultas (editores gravam em etapas). Só então o conteúdo é
+# lido e comparado pelo hash: salvar sem mudar nada não recarrega.
+#
+# A recarga em si (assets.reload) roda no thread principal, em update(), entre
+# um quadro e outro. Só funciona com arquivos soltos, não com o assets.pack.
+
+import hashlib
+import os
+import queue
+import threading
+import time
+
+from src.config import HOT_RELOAD_INTERVAL
+from .asset_manager import get_asset_pack, get_resource_path
+from .perf import metrics
+
+
+class AssetWatcher:
+    """Observa as pastas de assets e recarrega os arquivos cujo conteúdo mudou"""
+
+    FOLDERS = ("assets/images", "assets/sounds")
+
+    def __init__(self, asset_manager, interval=HOT_RELOAD_INTERVAL):
+        self.assets = asset_manager
+        self.interval = interval
+        self.root = get_resource_path("")
+        self.reloaded = 0
+        self._files = {}       # caminho relativo -> (mtime_ns, tamanho, hash)
+        self._unsettled = {}   # caminho relativo -> (mtime_ns, tamanho) da última consulta
+        self._changes = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if get_asset_pack() is not None:
+            print("[AssetWatcher] Usando assets.pack; hot reload desativado")
+            return False
+        self._thread = threading.Thread(target=self._run, name="asset-watcher", daemon=True)
+        self._thread.start()
+        print(f"[AssetWatcher] Observando {', '.join(self.FOLDERS)}")
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def update(self):
+        """Aplica as mudanças detectadas (chamado uma vez por quadro)"""
+        while True:
+            try:
+                relative_path = self._changes.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            name = self.assets.reload(relative_path)
+            if name is not None:
+                elapsed = (time.perf_counter() - start) * 1000.0
+                self.reloaded += 1
+                metrics.record("assets.hot_reload_ms", elapsed)
+                print(f"[AssetWatcher] Recarregado: {relative_path} ({elapsed:.1f} ms)")
+
+    def _run(self):
+        self._scan(initial=True)
+        while not self._stop.wait(self.interval):
+            self._scan()
+
+    def _scan(self, initial=False):
+        """Uma consulta: compara mtime e tamanho e enfileira o que mudou de fato"""
+        for folder in self.FOLDERS:
+            for directory, _, names in os.walk(self.root / folder):
+                for file_name in names:
+                    path = os.path.join(directory, file_name)
+                    relative_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    known = self._files.get(relative_path)
+                    if known is not None and known[:2] == signature:
+                        self._unsettled.pop(relative_path, None)
+                        continue
+                    if not initial and self._unsettled.get(relative_path) != signature:
+                        # Ainda sendo gravado: espera uma consulta sem mudanças
+                        self._unsettled[relative_path] = signature
+                        continue
+                    self._unsettled.pop(relative_path, None)
+                    digest = _file_digest(path)
+                    if digest is None:
+                        continue
+                    changed = known is None or known[2] != digest
+                    self._files[relative_path] = signature + (digest,)
+                    if changed and not initial:
+                        self._changes.put(relative_path)
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return None
@@ -0,0 +1,130 @@
+# Variantes de imagens pré-escaladas, geradas no build
+#
+# assets/data/image_sizes.json declara em que tamanhos o código desenha cada
+# imagem (assets.get_image(nome, (largura, altura))). Este gerador cria em
+# assets/variants/ uma imagem por tamanho declarado e, para as entradas com
+# "mips", a cadeia de reduções pela metade, além de variants/index.json com o
+# tamanho original e as variantes de cada imagem:
+#     python -m src.utils.image_variants
+#
+# Reduções usam smoothscale (filtro de área); ampliações usam scale (vizinho
+# mais próximo), que mantém os pixels nítidos da arte.
+#
+# "original": false indica que o jogo nunca desenha a imagem no tamanho
+# original, então com as variantes geradas o PNG original nem é decodificado.
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import pygame
+
+MANIFEST = "assets/data/image_sizes.json"
+VARIANTS_DIR = "assets/variants"
+
+# Menor lado de um nível da cadeia de mips
+MIN_MIP_SIZE = 16
+
+
+def variant_file(name, size):
+    """Caminho relativo da variante de uma imagem"""
+    return f"{VARIANTS_DIR}/{name}@{size[0]}x{size[1]}.png"
+
+
+def resize(surface, size):
+    """Redimensiona com filtro de área ao reduzir e vizinho mais próximo ao ampliar"""
+    size = (int(size[0]), int(size[1]))
+    if surface.get_size() == size:
+        return surface
+    if size[0] <= surface.get_width() and size[1] <= surface.get_height():
+        if surface.get_bitsize() < 24:
+            surface = surface.convert(32, pygame.SRCALPHA)
+        return pygame.transform.smoothscale(surface, size)
+    return pygame.transform.scale(surface, size)
+
+
+def mip_chain(size, smallest):
+    """Tamanhos da cadeia de mips: metades sucessivas até o menor tamanho pedido"""
+    width, height = size
+    levels = []
+    while True:
+        width, height = width // 2, height // 2
+        if min(width, height) < MIN_MIP_SIZE or (width < smallest[0] and height < smallest[1]):
+            return levels
+        levels.append((width, height))
+
+
+def scan_requested_sizes(source_dir):
+    """Tamanhos pedidos no código: chamadas get_image("nome", (l, a)) literais"""
+    pattern = re.compile(r'get_image\(\s*"(\w+)"\s*,\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)\s*\)')
+    requested = set()
+    for folder, _, names in os.walk(source_dir):
+        for file_name in names:
+            if file_name.endswith(".py"):
+                with open(os.path.join(folder, file_name), encoding="utf-8") as f:
+                    for name, width, height in pattern.findall(f.read()):
+                        requested.add((name, int(width), int(height)))
+    return requested
+
+
+def build_variants(root):
+    """Gera as variantes e o índice; retorna a quantidade de arquivos gravados"""
+    root = Path(root)
+    with open(root / MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)["images"]
+
+    sources = {path.stem: path for path in (root / "assets/images").glob("*/*")}
+    output = root / VARIANTS_DIR
+    output.mkdir(parents=True, exist_ok=True)
+    for old in output.glob("*.png"):
+        old.unlink()
+
+    index = {}
+    written = 0
+    for name, entry in manifest.items():
+        if name not in sources:
+            print(f"[ImageVariants] Imagem do manifesto não encontrada: {name}")
+            continue
+        source = pygame.image.load(str(sources[name]))
+        declared = [tuple(size) for size in entry["sizes"]]
+        sizes = list(declared)
+        if entry.get("mips"):
+            smallest = min(sizes, key=lambda size: size[0] * size[1])
+            sizes += mip_chain(source.get_size(), smallest)
+
+        variants = []
+        for size in dict.fromkeys(sizes):
+            if size == source.get_size():
+                continue
+            pygame.image.save(resize(source, size), str(root / variant_file(name, size)))
+            variants.append(list(size))
+            written += 1
+        index[name] = {"source": list(source.get_size()), "variants": variants,
+                       "sizes": [list(size) for size in declared],
+                       "original": entry.get("original", True)}
+
+    with open(output / "index.json", "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "images": index}, f, indent=2)
+
+    declared = {(name, *size) for name, entry in manifest.items() for size in entry["sizes"]}
+    for name, width, height in sorted(scan_requested_sizes(root / "src") - declared):
+        print(f"[ImageVariants] Tamanho usado no código e ausente do manifesto: "
+              f"{name} {width}x{height}")
+    return written
+
+
+def main():
+    from .asset_manager import get_resource_path
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    written = build_variants(get_resource_path(""))
+    print(f"[ImageVariants] {written} variantes -> {get_resource_path(VARIANTS_DIR)}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# Agendador de trabalho em segundo plano integrado ao loop principal
+#
+# Trabalho pesado roda em threads (submit), e o que precisa do thread
+# principal (converter superfícies, mexer no estado das cenas) volta como
+# continuação numa fila de prioridade. O Game chama run() depois de
+# apresentar o quadro, com o tempo que sobra até o próximo quadro, então as
+# continuações usam só a folga e não atrasam o desenho.
+#
+# Um job pode ter um dono (normalmente uma cena): cancel_owner() cancela
+# tudo dele, como acontece quando a cena é desativada.
+
+import heapq
+import itertools
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import JOB_WORKERS
+from .perf import metrics
+
+# Prioridades das continuações (menor roda primeiro)
+PRIORITY_HIGH = 0      # resposta a uma ação do jogador, assets da próxima cena
+PRIORITY_NORMAL = 10
+PRIORITY_IDLE = 20     # pré-aquecimento e outras otimizações
+
+
+class Job:
+    """Um trabalho agendado: função no thread de fundo e/ou continuação"""
+
+    def __init__(self, work, args, then, priority, owner):
+        self.work = work
+        self.args = args
+        self.then = then
+        self.priority = priority
+        self.owner = owner
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class JobScheduler:
+    """Threads de trabalho + continuações no thread principal com orçamento"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._executor = None
+        self._incoming = queue.Queue()   # continuações vindas de qualquer thread
+        self._ready = []                 # heap (prioridade, ordem, job)
+        self._order = itertools.count()
+        self._owned = {}                 # dono -> jobs (concluídos são podados aos poucos)
+
+    def _workers(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="jobs")
+        return self._executor
+
+    def submit(self, work, *args, then=None, priority=PRIORITY_NORMAL, owner=None):
+        """Roda work(*args) num thread; then(resultado) roda depois no thread principal"""
+        job = self._track(Job(work, args, then, priority, owner))
+        self._workers().submit(self._run_work, job)
+        return job
+
+    def call_soon(self, callback, *args, priority=PRIORITY_NORMAL, owner=None):
+        """Agenda callback(*args) no thread principal (pode ser chamado de qualquer thread)"""
+        job = self._track(Job(None, args, callback, priority, owner))
+        self._incoming.put(job)
+        return job
+
+    def cancel_owner(self, owner):
+        """Cancela os jobs pendentes de um dono (ex.: cena que saiu)"""
+        for job in self._owned.pop(owner, ()):
+            job.cancel()
+
+    @property
+    def pending(self):
+        return len(self._ready) + self._incoming.qsize()
+
+    def run(self, budget_ms):
+        """Executa continuações até gastar budget_ms; retorna quantas
+
+        Sem folga (budget_ms <= 0 ou prazo vencido), só uma continuação de
+        PRIORITY_HIGH roda por quadro, para o carregamento não parar; as
+        demais esperam um quadro com folga.
+        """
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        while True:
+            try:
+                job = self._incoming.get_nowait()
+            except queue.Empty:
+                break
+            heapq.heappush(self._ready, (job.priority, next(self._order), job))
+
+        executed = 0
+        while self._ready:
+            if time.perf_counter() >= deadline and (executed or self._ready[0][0] > PRIORITY_HIGH):
+                break
+            _, _, job = heapq.heappop(self._ready)
+            if job.cancelled:
+                continue
+            try:
+                if job.work is None:
+                    job.result = job.then(*job.args)
+                else:
+                    job.then(job.result)
+            except Exception as e:
+                job.error = e
+                print(f"[Jobs] Erro em {_describe(job.then)}: {e}")
+            job.done = True
+            executed += 1
+
+        metrics.record("jobs.pendentes", len(self._ready))
+        if executed:
+            metrics.record("jobs.quadro_ms", (time.perf_counter() - start) * 1000.0)
+        return executed
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run_work(self, job):
+        """Executado num thread de trabalho"""
+        if job.cancelled:
+            return
+        try:
+            job.result = job.work(*job.args)
+        except Exception as e:
+            job.error = e
+            job.done = True
+            print(f"[Jobs] Erro em {_describe(job.work)}: {e}")
+            return
+        if job.then is not None:
+            self._incoming.put(job)
+        else:
+            job.done = True
+
+    def _track(self, job):
+        if job.owner is not None:
+            owned = self._owned.setdefault(job.owner, [])
+            # Aproveita para esquecer os que já terminaram
+            owned[:] = [other for other in owned if not other.done and not other.cancelled]
+            owned.append(job)
+        return job
+
+
+def _describe(function):
+    return getattr(function, "__qualname__", repr(function))
+
+
+# Singleton global
+jobs = JobScheduler()
@@ -0,0 +1,330 @@
+# Analisadores léxicos incrementais (linha a linha) para as linguagens dos módulos
+#
+# Cada linha é tokenizada a partir do estado com que a linha anterior terminou
+# (ex.: dentro de um comentário de bloco ou de uma string de várias linhas).
+# Assim quem chama pode guardar os tokens por linha e só re-tokenizar uma linha
+# quando o texto dela ou o estado de entrada mudar.
+
+import re
+
+# Estados do analisador entre linhas
+STATE_NORMAL = ""
+STATE_BLOCK_COMMENT = "block_comment"
+STATE_TEMPLATE = "template"          # Template string do JavaScript (`...`)
+STATE_VERBATIM = "verbatim"          # String verbatim do C# (@"...")
+STATE_HTML = "html"                  # PHP: texto fora das tags <?php ... ?>
+STATE_TRIPLE_DOUBLE = 'triple:"""'   # Python: string com aspas triplas
+STATE_TRIPLE_SINGLE = "triple:'''"
+
+# Tipos de token produzidos
+TOKEN_KINDS = (
+    "text", "keyword", "control", "type", "function",
+    "string", "comment", "number", "variable", "decorator", "tag"
+)
+
+_NUMBER = r"\b(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)[fFdDmMlLuU]?\b"
+_IDENT = r"[A-Za-z_]\w*"
+
+_TEMPLATE_BODY = re.compile(r"(?:[^`\\]|\\.)*")
+_VERBATIM_BODY = re.compile(r'(?:[^"]|"")*')
+_PHP_OPEN = re.compile(r"<\?(?:php\b|=)?")
+
+
+class Lexer:
+    """Analisador léxico por linha configurável por linguagem"""
+
+    def __init__(self, name, keywords=(), control=(), types=(),
+                 line_comments=("//",), block_comment=True,
+                 string_prefix="", triple_quotes=False, template_strings=False,
+                 verbatim_strings=False, variables=False, decorators=False,
+                 php_tags=False, capitalized_types=True):
+        self.name = name
+        self.keywords = frozenset(keywords)
+        self.control = frozenset(control)
+        self.types = frozenset(types)
+        self.capitalized_types = capitalized_types
+        self.php_tags = php_tags
+        self.initial_state = STATE_HTML if php_tags else STATE_NORMAL
+
+        # Monta a expressão regular principal; a ordem dos grupos define a prioridade
+        parts = [r"(?P<ws>\s+)"]
+        if line_comments:
+            comment = "|".join(re.escape(prefix) for prefix in line_comments)
+            parts.append(r"(?P<line_comment>(?:%s).*)" % comment)
+        if block_comment:
+            parts.append(r"(?P<block_open>/\*)")
+        if triple_quotes:
+            parts.append(r"(?P<triple>[rRbBuUfF]{0,2}(?:\"\"\"|'''))")
+        if verbatim_strings:
+            parts.append(r'(?P<verbatim>\$?@"|@\$")')
+        if template_strings:
+            parts.append(r"(?P<template>`)")
+        parts.append(
+            r"(?P<string>%s(?:\"(?:[^\"\\]|\\.)*\"?|'(?:[^'\\]|\\.)*'?))" % string_prefix
+        )
+        if php_tags:
+            parts.append(r"(?P<php_close>\?>)")
+        parts.append(r"(?P<number>%s)" % _NUMBER)
+        if variables:
+            parts.append(r"(?P<variable>\$%s)" % _IDENT)
+        if decorators:
+            parts.append(r"(?P<decorator>@%s(?:\.%s)*)" % (_IDENT, _IDENT))
+        parts.append(r"(?P<ident>%s)" % _IDENT)
+        parts.append(r"(?P<other>.)")
+        self._pattern = re.compile("|".join(parts))
+
+    def tokenize_line(self, line, state=STATE_NORMAL):
+        """Tokeniza uma linha a partir do estado de entrada
+
+        Returns:
+            (spans, out_state): spans é uma lista de tuplas (início, fim, tipo)
+            que cobre a linha inteira; out_state é o estado para a próxima linha.
+        """
+        spans = []
+        pos = 0
+        length = len(line)
+
+        if state:
+            pos, state = self._continue(line, 0, state, spans)
+
+        pattern = self._pattern
+        while pos < length and not state:
+            match = pattern.match(line, pos)
+            group = match.lastgroup
+            end = match.end()
+
+            if group == "ws":
+                _emit(spans, pos, end, "text", blank=True)
+            elif group == "line_comment":
+                _emit(spans, pos, end, "comment")
+            elif group == "block_open":
+                _emit(spans, pos, end, "comment")
+                end, state = self._continue(line, end, STATE_BLOCK_COMMENT, spans)
+            elif group == "triple":
+                _emit(spans, pos, end, "string")
+                quote = line[end - 3:end]
+                triple_state = STATE_TRIPLE_DOUBLE if quote == '"""' else STATE_TRIPLE_SINGLE
+                end, state = self._continue(line, end, triple_state, spans)
+            elif group == "verbatim":
+                _emit(spans, pos, end, "string")
+                end, state = self._continue(line, end, STATE_VERBATIM, spans)
+            elif group == "template":
+                _emit(spans, pos, end, "string")
+                end, state = self._continue(line, end, STATE_TEMPLATE, spans)
+            elif group == "string":
+                _emit(spans, pos, end, "string")
+            elif group == "php_close":
+                _emit(spans, pos, end, "tag")
+                end, state = self._continue(line, end, STATE_HTML, spans)
+            elif group == "number":
+                _emit(spans, pos, end, "number")
+            elif group == "variable":
+                _emit(spans, pos, end, "variable")
+            elif group == "decorator":
+                _emit(spans, pos, end, "decorator")
+            elif group == "ident":
+                _emit(spans, pos, end, self._classify(match.group(), line, end))
+            else:
+                _emit(spans, pos, end, "text")
+            pos = end
+
+        return spans, state
+
+    def _continue(self, line, pos, state, spans):
+        """Consome o trecho da linha que pertence a uma construção multilinha aberta"""
+        length = len(line)
+
+        if state == STATE_BLOCK_COMMENT:
+            close = line.find("*/", pos)
+            if close < 0:
+                _emit(spans, pos, length, "comment")
+                return length, state
+            _emit(spans, pos, close + 2, "comment")
+            return close + 2, STATE_NORMAL
+
+        if state in (STATE_TRIPLE_DOUBLE, STATE_TRIPLE_SINGLE):
+            quote = state[-3:]
+            close = line.find(quote, pos)
+            if close < 0:
+                _emit(spans, pos, length, "string")
+                return length, state
+            _emit(spans, pos, close + 3, "string")
+            return close + 3, STATE_NORMAL
+
+        if state == STATE_TEMPLATE:
+            end = _TEMPLATE_BODY.match(line, pos).end()
+            if end >= length:
+                _emit(spans, pos, length, "string")
+                return length, state
+            _emit(spans, pos, end + 1, "string")
+            return end + 1, STATE_NORMAL
+
+        if state == STATE_VERBATIM:
+            end = _VERBATIM_BODY.match(line, pos).end()
+            if end >= length:
+                _emit(spans, pos, length, "string")
+                return length, state
+            _emit(spans, pos, end + 1, "string")
+            return end + 1, STATE_NORMAL
+
+        if state == STATE_HTML:
+            match = _PHP_OPEN.search(line, pos)
+            if match is None:
+                _emit(spans, pos, length, "text")
+                return length, state
+            _emit(spans, pos, match.start(), "text")
+            _emit(spans, match.start(), match.end(), "tag")
+            return match.end(), STATE_NORMAL
+
+        # Estado desconhecido: recomeça do estado normal
+        return pos, STATE_NORMAL
+
+    def _classify(self, word, line, end):
+        """Classifica um identificador (palavra-chave, tipo, função ou texto)"""
+        if word in self.control:
+            return "control"
+        if word in self.keywords:
+            return "keyword"
+        if word in self.types:
+            return "type"
+
+        # Chamadas e declarações de função: identificador seguido de "("
+        rest = line[end:end + 8].lstrip()
+        if rest.startswith("("):
+            return "function"
+        if self.capitalized_types and word[0].isupper():
+            return "type"
+        return "text"
+
+
+def _emit(spans, start, end, kind, blank=False):
+    """Adiciona um span, unindo com o anterior quando possível
+
+    Espaços em branco são absorvidos pelo span anterior (a cor não aparece),
+    o que reduz a quantidade de pedaços renderizados por linha.
+    """
+    if start >= end:
+        return
+    if spans:
+        last_start, last_end, last_kind = spans[-1]
+        if last_end == start and (blank or last_kind == kind):
+            spans[-1] = (last_start, end, last_kind)
+            return
+    spans.append((start, end, kind))
+
+
+_CSHARP = Lexer(
+    "csharp",
+    keywords=(
+        "abstract", "as", "base", "bool", "byte", "char", "checked", "class",
+        "const", "decimal", "delegate", "double", "enum", "event", "explicit",
+        "extern", "false", "fixed", "float", "implicit", "in", "int",
+        "interface", "internal", "is", "lock", "long", "new", "null", "object",
+        "operator", "out", "override", "params", "private", "protected",
+        "public", "readonly", "ref", "sbyte", "sealed", "short", "sizeof",
+        "static", "string", "struct", "this", "true", "typeof", "uint",
+        "ulong", "unchecked", "unsafe", "ushort", "var", "virtual", "void",
+        "volatile", "async", "await", "get", "set",
+    ),
+    control=(
+        "using", "namespace", "if", "else", "for", "foreach", "while", "do",
+        "switch", "case", "default", "break", "continue", "return", "try",
+        "catch", "finally", "throw", "goto", "yield",
+    ),
+    line_comments=("//",),
+    string_prefix=r"\$?",
+    verbatim_strings=True,
+)
+
+_PYTHON = Lexer(
+    "python",
+    keywords=(
+        "False", "None", "True", "and", "as", "assert", "async", "await",
+        "class", "def", "del", "global", "in", "is", "lambda", "nonlocal",
+        "not", "or", "self",
+    ),
+    control=(
+        "import", "from", "if", "elif", "else", "for", "while", "try",
+        "except", "finally", "raise", "return", "with", "yield", "break",
+        "continue", "pass", "match", "case",
+    ),
+    types=(
+        "print", "range", "len", "list", "dict", "set", "str", "int", "float",
+        "bool", "tuple", "enumerate", "zip", "open", "super", "isinstance",
+        "min", "max", "sum", "sorted", "input", "object", "Exception",
+    ),
+    line_comments=("#",),
+    block_comment=False,
+    string_prefix="[rRbBuUfF]{0,2}",
+    triple_quotes=True,
+    decorators=True,
+    capitalized_types=False,
+)
+
+_PHP = Lexer(
+    "php",
+    keywords=(
+        "abstract", "and", "array", "as", "class", "clone", "const", "declare",
+        "echo", "empty", "extends", "final", "fn", "function", "global",
+        "implements", "instanceof", "interface", "isset", "list", "new",
+        "null", "or", "print", "private", "protected", "public", "readonly",
+        "static", "trait", "unset", "var", "xor", "true", "false", "self",
+        "parent",
+    ),
+    control=(
+        "namespace", "use", "include", "include_once", "require",
+        "require_once", "if", "else", "elseif", "endif", "for", "endfor",
+        "foreach", "endforeach", "while", "endwhile", "do", "switch", "case",
+        "default", "match", "break", "continue", "return", "try", "catch",
+        "finally", "throw", "yield",
+    ),
+    line_comments=("//", "#"),
+    variables=True,
+    php_tags=True,
+)
+
+_JAVASCRIPT = Lexer(
+    "javascript",
+    keywords=(
+        "async", "await", "class", "const", "debugger", "delete", "extends",
+        "false", "function", "get", "in", "instanceof", "let", "new", "null",
+        "of", "set", "static", "super", "this", "true", "typeof", "undefined",
+        "var", "void",
+    ),
+    control=(
+        "import", "export", "from", "if", "else", "for", "while", "do",
+        "switch", "case", "default", "break", "continue", "return", "try",
+        "catch", "finally", "throw", "with", "yield",
+    ),
+    line_comments=("//",),
+    template_strings=True,
+)
+
+_PLAIN = Lexer("plain", line_comments=(), block_comment=False, capitalized_types=False)
+
+LEXERS = {
+    "csharp": _CSHARP,
+    "python": _PYTHON,
+    "php": _PHP,
+    "javascript": _JAVASCRIPT,
+}
+
+
+def get_lexer(language):
+    """Retorna o analisador léxico da linguagem (texto simples se desconhecida)"""
+    return LEXERS.get(language, _PLAIN)
+
+
+def tokenize(text, language):
+    """Tokeniza um texto completo, linha a linha
+
+    Returns:
+        Lista com a lista de spans de cada linha.
+    """
+    lexer = get_lexer(language)
+    state = lexer.initial_state
+    result = []
+    for line in text.split("\n"):
+        spans, state = lexer.tokenize_line(line, state)
+        result.append(spans)
+    return result
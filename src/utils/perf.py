@@ -0,0 +1,96 @@
+# Métricas de desempenho exibidas no overlay (F3)
+
+import time
+
+
+class PerfMetrics:
+    """Coleta tempos de quadro e métricas nomeadas de vários subsistemas"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.values = {}          # nome -> último valor
+        self.averages = {}        # nome -> média móvel exponencial
+        self.frame_ms = 0.0
+        self.frame_ms_avg = 0.0
+        self.frame_ms_max = 0.0   # Pior quadro desde o último reset_peaks()
+
+    def frame(self, dt):
+        """Registra a duração do quadro (dt em segundos)"""
+        ms = dt * 1000.0
+        self.frame_ms = ms
+        self.frame_ms_avg = ms if not self.frame_ms_avg else self.frame_ms_avg * 0.9 + ms * 0.1
+        self.frame_ms_max = max(self.frame_ms_max, ms)
+
+    def record(self, name, value):
+        """Registra o valor mais recente de uma métrica"""
+        self.values[name] = value
+        previous = self.averages.get(name)
+        self.averages[name] = value if previous is None else previous * 0.8 + value * 0.2
+
+    def increment(self, name, amount=1):
+        """Soma a um contador"""
+        self.values[name] = self.values.get(name, 0) + amount
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+    def reset_peaks(self):
+        self.frame_ms_max = 0.0
+
+    def timer(self, name):
+        """Context manager que registra a duração do bloco em ms"""
+        return _Timer(self, name)
+
+
+class StartupProfile:
+    """Tempo de cada fase da inicialização (python main.py --profile-startup)"""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases = []          # (fase, ms)
+
+    def mark(self, phase):
+        """Fecha a fase atual: tempo desde a marca anterior"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000.0))
+        self.last = now
+
+    @property
+    def total_ms(self):
+        return (self.last - self.start) * 1000.0
+
+    def report(self):
+        lines = [f"[Startup] {phase:<16} {ms:8.1f} ms" for phase, ms in self.phases]
+        lines.append(f"[Startup] {'total':<16} {self.total_ms:8.1f} ms")
+        return "\n".join(lines)
+
+
+class _Timer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+# Singleton global
+metrics = PerfMetrics()
@@ -0,0 +1,179 @@
+# Cache em disco de imagens já decodificadas
+#
+# Na primeira execução cada PNG é decodificado normalmente e os pixels já no
+# formato da tela (o mesmo de convert_alpha()) são gravados num arquivo .px.
+# Nas execuções seguintes o arquivo é mapeado em memória e vira uma Surface
+# com pygame.image.frombuffer, sem passar pelo zlib nem por convert_alpha().
+#
+# A chave é o hash do PNG de origem mais o formato de pixel, então trocar a
+# imagem (ou rodar numa tela com outro formato) gera uma entrada nova e a
+# antiga é apagada.
+#
+# Formato do .px (little endian): _HEADER, pixels a partir de DATA_OFFSET.
+#
+# Com `shared` (SharedPixels, ver shared_pixels.py) as entradas também são
+# publicadas em memória compartilhada para as outras instâncias do jogo.
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+import pygame
+from src.config import PIXEL_CACHE_DIR
+
+MAGIC = b"CFPX"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII8s")   # magic, versão, flags, largura, altura, formato
+DATA_OFFSET = 64
+
+# Máscaras (R, G, B, A) de superfícies de 32 bits -> ordem dos bytes na memória
+_FORMATS = {
+    (0xFF0000, 0xFF00, 0xFF, 0xFF000000): "BGRA",
+    (0xFF, 0xFF00, 0xFF0000, 0xFF000000): "RGBA",
+    (0xFF00, 0xFF0000, 0xFF000000, 0xFF): "ARGB",
+}
+
+
+def default_cache_dir():
+    """Pasta de cache do usuário (LOCALAPPDATA no Windows, ~/.cache nos outros)"""
+    if PIXEL_CACHE_DIR:
+        return Path(PIXEL_CACHE_DIR)
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "CodeFrontier" / "cache" / "pixels"
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "codefrontier" / "pixels"
+
+
+def parse_header(data, fmt):
+    """(largura, altura) de uma entrada no formato pedido, ou None se não servir"""
+    if len(data) < DATA_OFFSET:
+        return None
+    magic, version, _flags, width, height, stored = _HEADER.unpack_from(data, 0)
+    if (magic != MAGIC or version != VERSION or len(data) < DATA_OFFSET + width * height * 4 or
+            stored.rstrip(b"\0").decode("ascii", "replace") != fmt):
+        return None
+    return width, height
+
+
+def pack_header(width, height, fmt):
+    return _HEADER.pack(MAGIC, VERSION, 0, width, height, fmt.encode("ascii"))
+
+
+def pixel_format(surface):
+    """Formato de bytes ("BGRA", ...) de uma superfície com alfa, ou None"""
+    if surface.get_bitsize() != 32 or sys.byteorder != "little":
+        return None
+    return _FORMATS.get(surface.get_masks())
+
+
+class PixelCache:
+    """Guarda e carrega superfícies decodificadas, indexadas pelo PNG de origem"""
+
+    def __init__(self, directory=None, shared=None):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.enabled = True
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._format = None
+
+    def display_format(self):
+        """Formato de pixel que convert_alpha() produz na tela atual"""
+        if self._format is None:
+            self._format = pixel_format(pygame.Surface((1, 1)).convert_alpha()) or ""
+        return self._format
+
+    def load(self, name, source):
+        """Retorna a Surface do cache para os bytes do PNG (None se não houver)"""
+        fmt = self.display_format() if self.enabled or self.shared is not None else ""
+        if not fmt:
+            return None
+
+        path = self._entry_path(name, source, fmt)
+        if self.shared is not None:
+            surface = self.shared.load(path.stem, fmt)
+            if surface is not None:
+                self.hits += 1
+                return surface
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        size = parse_header(data, fmt)
+        if size is None:
+            data.close()
+            self.misses += 1
+            return None
+        self.hits += 1
+        end = DATA_OFFSET + size[0] * size[1] * 4
+        if self.shared is not None:
+            # Primeira instância a ler esta entrada: as próximas mapeiam o segmento
+            surface = self.shared.publish(path.stem, fmt, data[:DATA_OFFSET], memoryview(data)[DATA_OFFSET:end])
+            if surface is not None:
+                data.close()
+                return surface
+
+        # A Surface mantém o mapeamento vivo enquanto existir
+        return pygame.image.frombuffer(memoryview(data)[DATA_OFFSET:end], size, fmt)
+
+    def store(self, name, source, surface):
+        """Grava os pixels de uma superfície convertida e apaga versões antigas
+
+        Returns:
+            A Surface sobre a memória compartilhada, quando publicada, para
+            usar no lugar da cópia privada (None caso contrário).
+        """
+        entry = self.prepare(name, source, surface)
+        if entry is not None:
+            return self.write(*entry)
+        return None
+
+    def prepare(self, name, source, surface):
+        """Copia os pixels para gravar depois: (nome, caminho, formato, cabeçalho, pixels)
+
+        Só a cópia precisa acontecer no thread principal; write() pode rodar
+        num thread de fundo.
+        """
+        fmt = pixel_format(surface) if self.enabled or self.shared is not None else None
+        if not fmt:
+            return None
+        width, height = surface.get_size()
+        header = pack_header(width, height, fmt)
+        return (name, self._entry_path(name, source, fmt), fmt, header,
+                pygame.image.tobytes(surface, fmt))
+
+    def write(self, name, path, fmt, header, pixels):
+        """Grava uma entrada preparada (troca atômica) e apaga versões antigas"""
+        shared = self.shared.publish(path.stem, fmt, header, pixels) if self.shared is not None else None
+        if not self.enabled:
+            return shared
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(".tmp")
+            with open(temp, "wb") as f:
+                f.write(header)
+                f.write(b"\0" * (DATA_OFFSET - _HEADER.size))
+                f.write(pixels)
+            os.replace(temp, path)
+            for old in self.directory.glob(f"{name}-*-{fmt}.px"):
+                # Ignora outras imagens cujo nome começa igual ("a" x "a-b")
+                if old != path and old.name.count("-") == path.name.count("-"):
+                    old.unlink()
+        except OSError as e:
+            print(f"[PixelCache] Não foi possível gravar {path}: {e}")
+            self.enabled = False
+        return shared
+
+    def _entry_path(self, name, source, fmt):
+        digest = hashlib.blake2b(source, digest_size=10).hexdigest()
+        return self.directory / f"{name}-{digest}-{fmt}.px"
@@ -0,0 +1,208 @@
+# Perfis de alunos em SQLite para as máquinas compartilhadas do laboratório
+#
+# Um banco por máquina (profiles.db, em modo WAL) guarda os alunos, todas as
+# tentativas de desafio e um resumo por aluno e desafio (tentativas, se passou,
+# melhor tempo). O resumo é atualizado na mesma transação que insere a
+# tentativa, então o painel do aluno lê só as linhas de `results` pela chave
+# primária, e não cresce com o histórico de tentativas.
+#
+# As gravações vão para uma fila e um thread com conexão própria grava o que
+# estiver acumulado numa única transação. Com WAL, o thread principal continua
+# lendo o painel enquanto o gravador escreve.
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from src.config import PROFILE_DB
+from .perf import metrics
+from .save import default_save_dir
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    module_id TEXT NOT NULL,
+    challenge_id TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    duration_ms REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_student ON attempts (student_id, created_at);
+CREATE TABLE IF NOT EXISTS results (
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    challenge_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    best_ms REAL,
+    first_passed_at REAL,
+    PRIMARY KEY (student_id, challenge_id)
+) WITHOUT ROWID;
+"""
+
+# Consultas fixas: o sqlite3 guarda as compiladas no cache da conexão
+INSERT_ATTEMPT = """
+INSERT INTO attempts (student_id, module_id, challenge_id, passed, duration_ms, created_at)
+VALUES (:student_id, :module_id, :challenge_id, :passed, :duration_ms, :created_at)
+"""
+
+# min() do SQLite com NULL dá NULL: o coalesce fica com o tempo que existir
+UPSERT_RESULT = """
+INSERT INTO results (student_id, challenge_id, module_id, attempts, passed, best_ms, first_passed_at)
+VALUES (:student_id, :challenge_id, :module_id, 1, :passed,
+        CASE WHEN :passed THEN :duration_ms END, CASE WHEN :passed THEN :created_at END)
+ON CONFLICT (student_id, challenge_id) DO UPDATE SET
+    attempts = attempts + 1,
+    passed = max(passed, excluded.passed),
+    best_ms = coalesce(min(best_ms, excluded.best_ms), best_ms, excluded.best_ms),
+    first_passed_at = coalesce(first_passed_at, excluded.first_passed_at)
+"""
+
+SELECT_STUDENT = "SELECT id FROM students WHERE name = ?"
+INSERT_STUDENT = "INSERT OR IGNORE INTO students (name, created_at) VALUES (?, ?)"
+SELECT_RESULTS = """
+SELECT challenge_id, module_id, attempts, passed, best_ms FROM results
+WHERE student_id = ? ORDER BY challenge_id
+"""
+SELECT_RECENT = """
+SELECT challenge_id, passed, duration_ms, created_at FROM attempts
+WHERE student_id = ? ORDER BY created_at DESC LIMIT ?
+"""
+
+
+def default_profile_db():
+    return Path(PROFILE_DB) if PROFILE_DB else default_save_dir().parent / "profiles.db"
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # Em WAL, NORMAL só arrisca a última transação numa queda de energia
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    return connection
+
+
+class ProfileStore:
+    """Alunos, tentativas e resumo por desafio num banco SQLite local"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_profile_db()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.enabled = True
+
+        # Conexão de leitura (thread principal)
+        self._db = _connect(self.path)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self._db:
+                self._db.executescript(SCHEMA)
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="profile-writer", daemon=True)
+        self._thread.start()
+
+    def student(self, name):
+        """Id do aluno, criando o cadastro na primeira vez"""
+        name = name.strip()
+        with self._db:
+            self._db.execute(INSERT_STUDENT, (name, time.time()))
+        return self._db.execute(SELECT_STUDENT, (name,)).fetchone()[0]
+
+    def record_attempt(self, student_id, module_id, challenge_id, passed, duration_ms):
+        """Enfileira uma tentativa (gravada em segundo plano)"""
+        if not self.enabled:
+            return
+        self._queue.put({
+            "student_id": student_id,
+            "module_id": module_id,
+            "challenge_id": challenge_id,
+            "passed": int(bool(passed)),
+            "duration_ms": float(duration_ms),
+            "created_at": time.time(),
+        })
+
+    def flush(self):
+        """Espera o gravador terminar as tentativas enfileiradas"""
+        self._queue.join()
+
+    def dashboard(self, student_id, recent=10):
+        """Módulos concluídos, resultado por desafio e últimas tentativas do aluno"""
+        start = time.perf_counter()
+        challenges = {}
+        completed = []
+        attempts = 0
+        for challenge_id, module_id, count, passed, best_ms in self._db.execute(SELECT_RESULTS, (student_id,)):
+            challenges[challenge_id] = {"module": module_id, "attempts": count,
+                                        "passed": bool(passed), "best_ms": best_ms}
+            attempts += count
+            if passed and module_id not in completed:
+                completed.append(module_id)
+        dashboard = {
+            "completed_modules": completed,
+            "challenges": challenges,
+            "attempts": attempts,
+            "recent": [
+                {"challenge": challenge_id, "passed": bool(passed),
+                 "duration_ms": duration_ms, "at": created_at}
+                for challenge_id, passed, duration_ms, created_at
+                in self._db.execute(SELECT_RECENT, (student_id, recent))
+            ],
+        }
+        metrics.record("perfis.painel_ms", (time.perf_counter() - start) * 1000.0)
+        return dashboard
+
+    def close(self, timeout=2.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        self._db.close()
+
+    def _writer(self):
+        """Thread gravador: uma transação por lote de tentativas enfileiradas"""
+        try:
+            db = _connect(self.path)
+        except sqlite3.Error as e:
+            # Sem conexão o gravador ainda esvazia a fila, senão flush() esperaria para sempre
+            print(f"[Profiles] Tentativas não serão gravadas ({self.path}): {e}")
+            self.enabled = False
+            while True:
+                item = self._queue.get()
+                self._queue.task_done()
+                if item is None:
+                    return
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                attempts = [attempt for attempt in batch if attempt is not None]
+                try:
+                    if attempts:
+                        with db:
+                            db.executemany(INSERT_ATTEMPT, attempts)
+                            db.executemany(UPSERT_RESULT, attempts)
+                        metrics.record("perfis.lote", len(attempts))
+                except sqlite3.Error as e:
+                    print(f"[Profiles] Erro ao gravar {len(attempts)} tentativas: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if batch[-1] is None:
+                    return
+        finally:
+            db.close()
@@ -0,0 +1,243 @@
+# Progresso do jogador salvo em disco sem travar o loop
+#
+# Cada mudança (set/add/append) é aplicada na hora em `data` e enfileirada
+# para um thread gravador, que a acrescenta a journal.log (uma linha por
+# evento, com CRC). Quando o journal passa de SAVE_COMPACT_EVENTS eventos, o
+# gravador escreve o estado inteiro num snapshot (arquivo temporário + fsync +
+# os.replace) e recomeça o journal vazio.
+#
+# Ao abrir: lê o snapshot e reaplica só os eventos do journal com número
+# maior que o dele, então o tempo de carga não cresce com o histórico. Uma
+# queda no meio da gravação deixa no máximo a última linha do journal
+# incompleta (descartada pelo CRC) ou um .tmp que nunca substituiu o snapshot.
+
+import json
+import os
+import queue
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+from src.config import SAVE_DIR, SAVE_COMPACT_EVENTS
+from .perf import metrics
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+VERSION = 1
+
+
+def default_save_dir():
+    """Pasta de dados do usuário (LOCALAPPDATA no Windows, ~/.local/share nos outros)"""
+    if SAVE_DIR:
+        return Path(SAVE_DIR)
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "CodeFrontier" / "save"
+    return Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "codefrontier" / "save"
+
+
+def apply_event(data, op, key, value):
+    """Aplica um evento ao estado (mesma regra na memória e na recuperação)"""
+    if op == "set":
+        data[key] = value
+    elif op == "add":
+        data[key] = data.get(key, 0) + value
+    elif op == "append":
+        items = data.setdefault(key, [])
+        if value not in items:
+            items.append(value)
+    else:
+        raise ValueError(f"Operação desconhecida: {op}")
+
+
+def encode_event(seq, op, key, value):
+    body = json.dumps({"seq": seq, "op": op, "key": key, "value": value},
+                      separators=(",", ":"), ensure_ascii=False)
+    return f"{zlib.crc32(body.encode('utf-8')):08x}\t{body}\n".encode("utf-8")
+
+
+def decode_event(line):
+    """Evento de uma linha do journal (None se incompleta ou corrompida)"""
+    try:
+        text = line.decode("utf-8")
+        crc, body = text.rstrip("\n").split("\t", 1)
+        if not text.endswith("\n") or int(crc, 16) != zlib.crc32(body.encode("utf-8")):
+            return None
+        return json.loads(body)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+class SaveStore:
+    """Estado salvo do jogador com journal, snapshot e gravação em segundo plano"""
+
+    def __init__(self, defaults, directory=None, compact_events=SAVE_COMPACT_EVENTS):
+        self.directory = Path(directory) if directory else default_save_dir()
+        self.compact_events = compact_events
+        self.data = json.loads(json.dumps(defaults))
+        self.enabled = True
+        self.seq = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._journal_events = self._load()
+        except OSError as e:
+            print(f"[Save] Progresso não será salvo ({self.directory}): {e}")
+            self.enabled = False
+            return
+
+        # O gravador mantém a própria cópia do estado para os snapshots
+        self._thread = threading.Thread(
+            target=self._writer, args=(json.loads(json.dumps(self.data)), self.seq),
+            name="save-writer", daemon=True
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Mudanças (thread principal)
+    # ------------------------------------------------------------------
+    def set(self, key, value):
+        self._record("set", key, value)
+
+    def add(self, key, amount):
+        self._record("add", key, amount)
+
+    def append(self, key, value):
+        """Acrescenta a uma lista, sem repetir"""
+        self._record("append", key, value)
+
+    def _record(self, op, key, value):
+        apply_event(self.data, op, key, value)
+        self.seq += 1
+        if self.enabled:
+            self._queue.put((self.seq, op, key, value))
+
+    def close(self, timeout=2.0):
+        """Espera o gravador terminar o que está na fila (ao sair do jogo)"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Carga e recuperação
+    # ------------------------------------------------------------------
+    def _load(self):
+        """Snapshot + eventos mais novos do journal; retorna quantos eventos válidos restam"""
+        snapshot_path = self.directory / SNAPSHOT_FILE
+        if snapshot_path.exists():
+            try:
+                with open(snapshot_path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                data, seq = dict(snapshot["data"]), int(snapshot["seq"])
+            except (ValueError, KeyError, TypeError) as e:
+                # Snapshot corrompido: fica com os padrões e o journal (que tem CRC).
+                # O arquivo é guardado de lado para não falhar de novo na próxima carga.
+                print(f"[Save] Snapshot inválido ({e}); usando os padrões e o journal")
+                os.replace(snapshot_path, snapshot_path.with_suffix(".json.corrompido"))
+            else:
+                self.data.update(data)
+                self.seq = seq
+
+        journal_path = self.directory / JOURNAL_FILE
+        if not journal_path.exists():
+            return 0
+
+        valid_bytes = 0
+        replayed = 0
+        with open(journal_path, "rb") as f:
+            for line in f:
+                event = decode_event(line)
+                if event is None:
+                    break
+                valid_bytes += len(line)
+                if event["seq"] > self.seq:
+                    apply_event(self.data, event["op"], event["key"], event["value"])
+                    self.seq = event["seq"]
+                    replayed += 1
+
+        if valid_bytes < journal_path.stat().st_size:
+            # Gravação interrompida: descarta a cauda para as próximas linhas
+            print(f"[Save] Journal com final incompleto; recuperados {replayed} eventos")
+            with open(journal_path, "r+b") as f:
+                f.truncate(valid_bytes)
+        metrics.record("save.eventos_journal", replayed)
+        return replayed
+
+    # ------------------------------------------------------------------
+    # Gravador (thread de fundo)
+    # ------------------------------------------------------------------
+    def _writer(self, state, last_seq):
+        journal_events = self._journal_events
+        journal = open(self.directory / JOURNAL_FILE, "ab")
+        try:
+            while True:
+                item = self._queue.get()
+                # Junta tudo que já está na fila numa única gravação
+                batch = [item]
+                while item is not None:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                stop = batch[-1] is None
+                events = [event for event in batch if event is not None]
+
+                if events:
+                    journal.write(b"".join(encode_event(*event) for event in events))
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    for seq, op, key, value in events:
+                        apply_event(state, op, key, value)
+                    journal_events += len(events)
+                    last_seq = events[-1][0]
+
+                if journal_events >= self.compact_events or (stop and journal_events):
+                    journal.close()
+                    self._compact(state, last_seq)
+                    journal = open(self.directory / JOURNAL_FILE, "ab")
+                    journal_events = 0
+                if stop:
+                    return
+        except OSError as e:
+            print(f"[Save] Erro ao gravar o progresso: {e}")
+            self.enabled = False
+        finally:
+            journal.close()
+
+    def _compact(self, state, last_seq):
+        """Grava o estado completo no snapshot e esvazia o journal"""
+        snapshot = {"version": VERSION, "seq": last_seq, "data": state}
+        _atomic_write(self.directory / SNAPSHOT_FILE,
+                      json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        # Se cair aqui, o journal antigo só tem eventos <= seq e é ignorado na carga
+        _atomic_write(self.directory / JOURNAL_FILE, b"")
+        metrics.increment("save.compactacoes")
+
+
+def _atomic_write(path, data):
+    """Grava num .tmp, força para o disco e troca de uma vez"""
+    temp = path.with_suffix(path.suffix + ".tmp")
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory):
+    """Força a troca de nome para o disco (sem isso ela pode se perder numa queda de energia)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return   # Windows não abre pastas; lá o os.replace já é durável
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,314 @@
+# Imagens decodificadas em memória compartilhada entre instâncias do jogo
+#
+#     CODEFRONTIER_SHARED_ASSETS=1 python main.py
+#     python -m src.utils.shared_pixels            # segmentos publicados
+#     python -m src.utils.shared_pixels --clear
+#
+# Em laboratórios com vários jogos abertos na mesma máquina (sessões de thin
+# client), cada instância decodificaria todos os PNGs na sua própria memória.
+# Neste modo a primeira instância publica os pixels já convertidos para o
+# formato da tela num segmento de multiprocessing.shared_memory, e as
+# seguintes mapeiam o segmento e criam a Surface com pygame.image.frombuffer:
+# sem decodificar e sem cópia privada dos pixels.
+#
+# O segmento tem o mesmo formato de uma entrada .px do cache de pixels, e o
+# nome dele sai da chave da entrada (nome, hash do PNG, formato da tela). Assim
+# achar uma imagem não precisa de tabela central nem de trava entre processos.
+# O cabeçalho é escrito por último: um segmento ainda sendo preenchido por
+# outra instância é ignorado e a imagem é decodificada normalmente. O
+# manifesto (MANIFEST, na pasta do cache de pixels) lista os segmentos
+# publicados na máquina, para listar e apagar; a linha entra antes dos pixels,
+# com o pid de quem publica. Um segmento sem cabeçalho cujo processo já morreu
+# ficou pela metade e é apagado por quem o encontrar (e pelo --clear). Ao
+# publicar uma imagem com hash novo (PNG alterado), os segmentos dos hashes
+# antigos da mesma imagem saem da memória e do manifesto.
+#
+# Os segmentos só são compartilhados entre processos do mesmo usuário. No
+# Linux e no macOS eles ficam até o --clear ou até reiniciar a máquina, e o
+# próximo jogo aberto já os encontra. No Windows somem quando a última
+# instância fecha.
+
+import argparse
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+try:
+    import fcntl
+except ImportError:  # Windows: os segmentos somem com a última instância
+    fcntl = None
+
+import pygame
+from .pixel_cache import DATA_OFFSET, default_cache_dir, parse_header
+
+MANIFEST = "shared-pixels.manifest"
+_MANIFEST_LOCK = "shared-pixels.lock"
+
+
+def segment_name(entry):
+    """Nome do segmento de uma entrada (curto: o macOS limita a 31 caracteres)"""
+    user = os.getuid() if hasattr(os, "getuid") else 0
+    return "cfpx_" + hashlib.blake2b(f"{user}:{entry}".encode("utf-8"), digest_size=10).hexdigest()
+
+
+class _Segment(shared_memory.SharedMemory):
+    """Segmento que não fecha o mapeamento ao ser coletado
+
+    As Surfaces criadas com frombuffer apontam para ele até o fim do
+    processo; o close() do SharedMemory falharia com BufferError.
+    """
+
+    def __del__(self):
+        pass
+
+
+def _open_segment(name, create=False, size=0):
+    """Abre (ou cria) um segmento que não é apagado quando este processo sai"""
+    try:
+        segment = _Segment(name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13: o resource_tracker apagaria o segmento na saída, mesmo
+        # com outras instâncias usando. Quem apaga é o --clear.
+        segment = _Segment(name, create=create, size=size)
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _unlink(name):
+    """Apaga um segmento (instâncias abertas continuam com o mapeamento)"""
+    try:
+        # Aberto com o rastreamento padrão, que unlink() desfaz
+        segment = shared_memory.SharedMemory(name)
+        segment.close()
+        segment.unlink()
+    except OSError:
+        pass
+
+
+def _process_alive(pid):
+    if os.name != "posix" or pid <= 0:
+        return True     # no Windows o segmento some junto com o processo
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _image_key(entry):
+    """(imagem, formato) de uma entrada `{imagem}-{hash}-{formato}`"""
+    image, _digest, fmt = entry.rsplit("-", 2) if entry.count("-") >= 2 else (entry, "", "")
+    return image, fmt
+
+
+@contextmanager
+def _manifest_lock(directory):
+    """Trava entre processos para reescrever o manifesto sem perder linhas"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, _MANIFEST_LOCK), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_manifest(directory):
+    """Linhas do manifesto: [(segmento, entrada, bytes, pid)]"""
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            lines = [line.rstrip("\n").split("\t") for line in f]
+    except OSError:
+        return []
+    records = []
+    for parts in lines:
+        if len(parts) in (3, 4):
+            try:
+                records.append((parts[0], parts[1], int(parts[2]), int(parts[3]) if len(parts) == 4 else 0))
+            except ValueError:
+                continue
+    return records
+
+
+class SharedPixels:
+    """Publica e mapeia entradas do cache de pixels em memória compartilhada"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        self.enabled = True
+        self.hits = 0
+        self.published = 0
+        self.mapped_bytes = 0
+        self._segments = {}    # nome -> SharedMemory (mantido aberto: as Surfaces apontam para ele)
+        self._lock = threading.Lock()   # load() também roda nas threads do JobScheduler
+
+    def load(self, entry, fmt):
+        """Surface sobre o segmento publicado por outra instância (None se não houver)"""
+        if not self.enabled:
+            return None
+        name = segment_name(entry)
+        with self._lock:
+            segment = self._segments.get(name)
+        if segment is None:
+            try:
+                segment = _open_segment(name)
+            except (FileNotFoundError, ValueError):
+                return None
+            except OSError as e:
+                print(f"[SharedPixels] Memória compartilhada indisponível: {e}")
+                self.enabled = False
+                return None
+        size = parse_header(segment.buf, fmt)
+        if size is None:
+            # Outra instância ainda está preenchendo (ou formato diferente)
+            with self._lock:
+                known = name in self._segments
+            if not known:
+                segment.close()
+                self._reap(name)
+            return None
+        with self._lock:
+            if name in self._segments:
+                segment = self._segments[name]
+            else:
+                self._segments[name] = segment
+                self.mapped_bytes += segment.size
+            self.hits += 1
+        return pygame.image.frombuffer(segment.buf[DATA_OFFSET:DATA_OFFSET + size[0] * size[1] * 4],
+                                       size, fmt)
+
+    def publish(self, entry, fmt, header, pixels):
+        """Copia uma entrada para um segmento novo; retorna a Surface sobre ele
+
+        Retorna None se outra instância já publicou (ou está publicando) a
+        entrada ou se a memória compartilhada não estiver disponível.
+        """
+        if not self.enabled:
+            return None
+        name = segment_name(entry)
+        with self._lock:
+            if name in self._segments:
+                return None
+        try:
+            segment = _open_segment(name, create=True, size=DATA_OFFSET + len(pixels))
+        except FileExistsError:
+            return None
+        except OSError as e:
+            print(f"[SharedPixels] Não foi possível publicar {entry}: {e}")
+            self.enabled = False
+            return None
+
+        # Manifesto antes dos pixels: se o processo morrer no meio, o --clear ainda acha o segmento
+        self._record(name, entry, segment.size)
+        # Pixels primeiro, cabeçalho por último: quem abrir antes vê um segmento vazio
+        segment.buf[DATA_OFFSET:DATA_OFFSET + len(pixels)] = pixels
+        segment.buf[:len(header)] = header
+        with self._lock:
+            self._segments[name] = segment
+            self.mapped_bytes += segment.size
+            self.published += 1
+
+        return pygame.image.frombuffer(segment.buf[DATA_OFFSET:DATA_OFFSET + len(pixels)],
+                                       parse_header(segment.buf, fmt), fmt)
+
+    def _record(self, name, entry, size):
+        """Acrescenta o segmento ao manifesto e tira dele os hashes antigos da mesma imagem"""
+        key = _image_key(entry)
+        try:
+            with _manifest_lock(self.directory):
+                records = _read_manifest(self.directory)
+                stale = [record for record in records
+                         if _image_key(record[1]) == key and record[1] != entry]
+                line = f"{name}\t{entry}\t{size}\t{os.getpid()}\n"
+                if not stale:
+                    with open(os.path.join(self.directory, MANIFEST), "a", encoding="utf-8") as f:
+                        f.write(line)
+                    return
+                for old in {record[0] for record in stale}:
+                    _unlink(old)
+                kept = [record for record in records if record not in stale]
+                _write_manifest(self.directory, kept)
+                with open(os.path.join(self.directory, MANIFEST), "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            pass
+
+    def _reap(self, name):
+        """Apaga o segmento se quem o criou morreu antes de escrever o cabeçalho"""
+        try:
+            with _manifest_lock(self.directory):
+                records = _read_manifest(self.directory)
+                owners = [pid for segment, _entry, _size, pid in records if segment == name]
+                if not owners or any(_process_alive(pid) for pid in owners):
+                    return
+                _unlink(name)
+                _write_manifest(self.directory, [record for record in records if record[0] != name])
+        except OSError:
+            return
+        print(f"[SharedPixels] Segmento incompleto apagado: {name}")
+
+
+def _write_manifest(directory, records):
+    path = os.path.join(directory, MANIFEST)
+    temp = path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        for name, entry, size, pid in records:
+            f.write(f"{name}\t{entry}\t{size}\t{pid}\n")
+    os.replace(temp, path)
+
+
+def manifest_entries(directory=None):
+    """Segmentos do manifesto que ainda existem: [(segmento, entrada, bytes)]
+
+    Inclui os que nunca receberam o cabeçalho (processo morto no meio).
+    """
+    entries = {}
+    for name, entry, size, _pid in _read_manifest(directory or default_cache_dir()):
+        if name in entries:
+            continue
+        try:
+            segment = _open_segment(name)
+        except (OSError, ValueError):
+            continue
+        segment.close()
+        entries[name] = (name, entry, size)
+    return list(entries.values())
+
+
+def clear(directory=None):
+    """Apaga os segmentos do manifesto, completos ou não (instâncias abertas continuam com o mapeamento)"""
+    directory = directory or default_cache_dir()
+    with _manifest_lock(directory):
+        entries = manifest_entries(directory)
+        for name, _entry, _size in entries:
+            _unlink(name)
+        try:
+            os.remove(os.path.join(directory, MANIFEST))
+        except OSError:
+            pass
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Imagens em memória compartilhada")
+    parser.add_argument("--clear", action="store_true", help="apaga os segmentos publicados")
+    args = parser.parse_args()
+
+    entries = clear() if args.clear else manifest_entries()
+    total = sum(size for _name, _entry, size in entries) / (1024 * 1024)
+    action = "apagados" if args.clear else "publicados"
+    for name, entry, size in ([] if args.clear else entries):
+        print(f"{name}  {size / 1024:8.0f} KB  {entry}")
+    print(f"[SharedPixels] {len(entries)} segmentos {action} ({total:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# Buffer de texto editável baseado em piece table
+#
+# As peças (trechos de texto imutáveis) ficam numa árvore balanceada (treap)
+# indexada implicitamente pelo tamanho em caracteres. Cada nó guarda o total
+# de caracteres e de quebras de linha da sua subárvore, então inserir, apagar
+# e converter entre offset e linha custam O(log n), sem reconstruir o texto.
+
+import random
+from bisect import bisect_left
+
+# Tamanho máximo de uma peça criada a partir de um texto grande
+CHUNK_SIZE = 2048
+
+# Intervalo máximo (em segundos) para agrupar digitação num único desfazer
+UNDO_GROUP_SECONDS = 1.0
+
+
+class _Piece:
+    """Nó da árvore: uma peça de texto e os totais da subárvore"""
+
+    __slots__ = ("text", "start", "length", "newlines",
+                 "priority", "left", "right", "size", "lf")
+
+    def __init__(self, text, start, length, newlines):
+        self.text = text            # String de origem (nunca é modificada)
+        self.start = start
+        self.length = length
+        self.newlines = newlines    # Posições relativas dos "\n" na peça
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.size = length
+        self.lf = len(newlines)
+
+    def update(self):
+        """Recalcula os totais da subárvore"""
+        size = self.length
+        lf = len(self.newlines)
+        if self.left is not None:
+            size += self.left.size
+            lf += self.left.lf
+        if self.right is not None:
+            size += self.right.size
+            lf += self.right.lf
+        self.size = size
+        self.lf = lf
+
+
+def _make_piece(text, start, length):
+    newlines = []
+    position = text.find("\n", start, start + length)
+    while position >= 0:
+        newlines.append(position - start)
+        position = text.find("\n", position + 1, start + length)
+    return _Piece(text, start, length, newlines)
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _split(node, offset):
+    """Divide a árvore em (primeiros `offset` caracteres, resto)"""
+    if node is None:
+        return None, None
+
+    left_size = node.left.size if node.left is not None else 0
+    if offset <= left_size:
+        left, node.left = _split(node.left, offset)
+        node.update()
+        return left, node
+
+    local = offset - left_size
+    if local >= node.length:
+        node.right, right = _split(node.right, local - node.length)
+        node.update()
+        return node, right
+
+    # O corte cai no meio da peça: separa em duas
+    cut = bisect_left(node.newlines, local)
+    tail = _Piece(node.text, node.start + local, node.length - local,
+                  [pos - local for pos in node.newlines[cut:]])
+    # Mesma prioridade do nó cortado: continua >= a da subárvore direita (heap do treap)
+    tail.priority = node.priority
+    tail.right = node.right
+    tail.update()
+    node.length = local
+    node.newlines = node.newlines[:cut]
+    node.right = None
+    node.update()
+    return node, tail
+
+
+class TextChange:
+    """Intervalo de linhas afetado por uma edição
+
+    As linhas [first, first + old_count) do texto anterior viraram as linhas
+    [first, first + new_count) do texto atual.
+    """
+
+    __slots__ = ("first", "old_count", "new_count")
+
+    def __init__(self, first, old_count, new_count):
+        self.first = first
+        self.old_count = old_count
+        self.new_count = new_count
+
+
+class _Edit:
+    """Registro compacto de uma edição para desfazer/refazer"""
+
+    __slots__ = ("offset", "deleted", "inserted", "time")
+
+    def __init__(self, offset, deleted, inserted, time):
+        self.offset = offset
+        self.deleted = deleted
+        self.inserted = inserted
+        self.time = time
+
+
+class TextBuffer:
+    """Texto editável com índice de linhas, desfazer e refazer"""
+
+    def __init__(self, text=""):
+        self._root = None
+        self.undo_stack = []
+        self.redo_stack = []
+        self.set_text(text)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._root.size if self._root is not None else 0
+
+    @property
+    def line_count(self):
+        """Quantidade de linhas (um texto vazio tem uma linha)"""
+        return (self._root.lf if self._root is not None else 0) + 1
+
+    def get_text(self, start=0, end=None):
+        """Retorna o texto entre dois offsets"""
+        if end is None:
+            end = len(self)
+        parts = []
+        self._collect(self._root, start, end, 0, parts)
+        return "".join(parts)
+
+    def line_start(self, line):
+        """Offset do primeiro caractere da linha"""
+        if line <= 0:
+            return 0
+        if line >= self.line_count:
+            return len(self)
+
+        # Procura a line-ésima quebra de linha descendo pela árvore
+        node = self._root
+        base = 0
+        remaining = line
+        while node is not None:
+            left_lf = node.left.lf if node.left is not None else 0
+            left_size = node.left.size if node.left is not None else 0
+            if remaining <= left_lf:
+                node = node.left
+                continue
+            remaining -= left_lf
+            if remaining <= len(node.newlines):
+                return base + left_size + node.newlines[remaining - 1] + 1
+            remaining -= len(node.newlines)
+            base += left_size + node.length
+            node = node.right
+        return len(self)
+
+    def line_end(self, line):
+        """Offset logo após o último caractere da linha (sem o "\\n")"""
+        if line + 1 >= self.line_count:
+            return len(self)
+        return self.line_start(line + 1) - 1
+
+    def line_length(self, line):
+        return self.line_end(line) - self.line_start(line)
+
+    def get_line(self, line):
+        """Texto de uma linha, sem a quebra de linha"""
+        return self.get_text(self.line_start(line), self.line_end(line))
+
+    def get_lines(self, first, count):
+        """Texto de `count` linhas consecutivas a partir de `first`"""
+        if count <= 0:
+            return []
+        last = min(first + count, self.line_count) - 1
+        return self.get_text(self.line_start(first), self.line_end(last)).split("\n")
+
+    def line_of(self, offset):
+        """Linha que contém o offset"""
+        node = self._root
+        line = 0
+        while node is not None:
+            left_size = node.left.size if node.left is not None else 0
+            if offset < left_size:
+                node = node.left
+                continue
+            line += node.left.lf if node.left is not None else 0
+            local = offset - left_size
+            if local < node.length:
+                return line + bisect_left(node.newlines, local)
+            line += len(node.newlines)
+            offset = local - node.length
+            node = node.right
+        return line
+
+    def offset_of(self, line, column):
+        """Converte (linha, coluna) em offset, limitando a coluna ao fim da linha"""
+        line = max(0, min(line, self.line_count - 1))
+        start = self.line_start(line)
+        return start + max(0, min(column, self.line_end(line) - start))
+
+    def position_of(self, offset):
+        """Converte um offset em (linha, coluna)"""
+        line = self.line_of(offset)
+        return line, offset - self.line_start(line)
+
+    # ------------------------------------------------------------------
+    # Edição
+    # ------------------------------------------------------------------
+    def set_text(self, text):
+        """Substitui todo o conteúdo e limpa o histórico"""
+        self._root = self._build(text)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def insert(self, offset, text, time=None):
+        """Insere texto no offset e retorna a TextChange correspondente"""
+        return self.replace(offset, 0, text, time)
+
+    def delete(self, offset, length, time=None):
+        """Apaga `length` caracteres a partir do offset"""
+        return self.replace(offset, length, "", time)
+
+    def replace(self, offset, length, text, time=None):
+        """Troca `length` caracteres a partir do offset por `text`"""
+        offset = max(0, min(offset, len(self)))
+        length = max(0, min(length, len(self) - offset))
+        if not length and not text:
+            return None
+
+        deleted = self.get_text(offset, offset + length) if length else ""
+        change = self._apply(offset, deleted, text)
+        self._record(_Edit(offset, deleted, text, time))
+        self.redo_stack.clear()
+        return change
+
+    def undo(self):
+        """Desfaz a última edição; retorna (TextChange, offset do cursor)"""
+        if not self.undo_stack:
+            return None, None
+        edit = self.undo_stack.pop()
+        change = self._apply(edit.offset, edit.inserted, edit.deleted)
+        self.redo_stack.append(edit)
+        return change, edit.offset + len(edit.deleted)
+
+    def redo(self):
+        """Refaz a última edição desfeita; retorna (TextChange, offset do cursor)"""
+        if not self.redo_stack:
+            return None, None
+        edit = self.redo_stack.pop()
+        change = self._apply(edit.offset, edit.deleted, edit.inserted)
+        self.undo_stack.append(edit)
+        return change, edit.offset + len(edit.inserted)
+
+    def _apply(self, offset, deleted, inserted):
+        """Aplica a troca na árvore e calcula as linhas afetadas"""
+        first = self.line_of(offset)
+        old_count = deleted.count("\n") + 1
+        new_count = inserted.count("\n") + 1
+
+        left, rest = _split(self._root, offset)
+        _, right = _split(rest, len(deleted))
+        self._root = _merge(_merge(left, self._build(inserted)), right)
+        return TextChange(first, old_count, new_count)
+
+    def _record(self, edit):
+        """Empilha a edição, agrupando digitação e apagamentos contínuos"""
+        if self.undo_stack and edit.time is not None:
+            last = self.undo_stack[-1]
+            recent = last.time is not None and edit.time - last.time <= UNDO_GROUP_SECONDS
+            if recent and "\n" not in edit.inserted and "\n" not in last.inserted:
+                # Digitação: inserções seguidas no fim da anterior
+                if (not edit.deleted and not last.deleted and
+                        edit.offset == last.offset + len(last.inserted)):
+                    last.inserted += edit.inserted
+                    last.time = edit.time
+                    return
+                # Backspace: apagamentos seguidos logo antes do anterior
+                if (not edit.inserted and not last.inserted and
+                        "\n" not in edit.deleted and
+                        edit.offset + len(edit.deleted) == last.offset):
+                    last.offset = edit.offset
+                    last.deleted = edit.deleted + last.deleted
+                    last.time = edit.time
+                    return
+        self.undo_stack.append(edit)
+
+    # ------------------------------------------------------------------
+    # Auxiliares da árvore
+    # ------------------------------------------------------------------
+    def _build(self, text):
+        """Cria uma subárvore com as peças de um texto novo"""
+        root = None
+        for start in range(0, len(text), CHUNK_SIZE):
+            length = min(CHUNK_SIZE, len(text) - start)
+            root = _merge(root, _make_piece(text, start, length))
+        return root
+
+    def _collect(self, node, start, end, base, parts):
+        """Junta em `parts` os trechos das peças entre start e end"""
+        while node is not None and start < end:
+            left_size = node.left.size if node.left is not None else 0
+            node_start = base + left_size
+            if start < node_start:
+                self._collect(node.left, start, end, base, parts)
+            node_end = node_start + node.length
+            if start < node_end and end > node_start:
+                lo = max(start, node_start) - node_start
+                hi = min(end, node_end) - node_start
+                parts.append(node.text[node.start + lo:node.start + hi])
+            if end <= node_end:
+                return
+            base = node_end
+            node = node.right
@@ -0,0 +1,69 @@
+# Passo fixo da simulação e interpolação no desenho
+#
+# O Game acumula o tempo real de cada quadro e chama update() das cenas em
+# passos de exatamente 1/SIMULATION_HZ segundo, então a lógica e as animações
+# avançam igual em qualquer taxa de quadros (30 Hz numa máquina fraca, 144 Hz
+# num monitor rápido). O que sobra no acumulador vira `alpha`, a fração entre
+# os dois últimos estados simulados, que draw() usa para interpolar.
+#
+# Se um quadro demorar demais (ex.: janela arrastada), no máximo
+# MAX_UPDATE_STEPS passos são simulados e o resto do atraso é descartado, em
+# vez de cada quadro ficar cada vez mais lento tentando alcançar o relógio.
+
+from .perf import metrics
+
+
+class FixedTimestep:
+    """Acumulador de tempo que decide quantos passos simular por quadro"""
+
+    def __init__(self, hz, max_steps, enabled=True):
+        self.step = 1.0 / hz
+        self.max_steps = max_steps
+        self.enabled = enabled
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.dt = self.step      # duração de cada passo deste quadro
+
+    def advance(self, frame_dt):
+        """Soma o tempo do quadro; retorna quantos passos de `dt` simular"""
+        if not self.enabled:
+            # Modo variável: um update com o tempo do quadro, sem interpolação
+            self.dt = frame_dt
+            self.alpha = 1.0
+            return 1
+
+        self.dt = self.step
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            metrics.record("sim.descartado_ms", (steps - self.max_steps) * self.step * 1000.0)
+            steps = self.max_steps
+            self.accumulator = self.step * steps
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        metrics.record("sim.passos", steps)
+        return steps
+
+
+class AnimatedValue:
+    """Valor avançado nos passos da simulação e interpolado no desenho
+
+    Não dá a volta em 2π: fases multiplicadas por fatores não inteiros
+    (sin(fase * 0.8)) continuariam saltando na volta.
+    """
+
+    def __init__(self, value=0.0):
+        self.value = value
+        self.previous = value
+
+    def advance(self, delta):
+        self.previous = self.value
+        self.value += delta
+
+    def reset(self, value=0.0):
+        self.value = value
+        self.previous = value
+
+    def at(self, alpha):
+        """Valor entre o penúltimo e o último passo"""
+        return self.previous + (self.value - self.previous) * alpha